@@ -1,11 +1,10 @@
+import os
 import time
 import random
 import re
-import os
 from datetime import datetime
 from multiprocessing import Process, Queue, current_process
 
-import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -15,10 +14,19 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import WebDriverException, StaleElementReferenceException
 from webdriver_manager.chrome import ChromeDriverManager
 
+import consolidate
+import shards
+from blocklist import is_blocked
+from selector_registry import get_registry
+from seen_index import SeenIndex, KEYS_FIELD, card_keys, keys_for, without_keys
+from shards import ShardWriter
+from spill_buffer import SpillBuffer, replay_orphans, spill_dir_for
+
 # =====================================================
 # CONFIG
 # =====================================================
 OUTPUT_FILE = "Trademark_Sellers_All.xlsx"
+LEAD_DB = True       # also record every lead in leads.db (lead_db.py) for delta_export
 SAVE_EVERY = 20
 NUM_BROWSERS = 3
 
@@ -85,31 +93,40 @@ def scroll_feed(driver):
         last_height = height
 
 # =====================================================
-# SAVE PROGRESS (GLOBAL SAFE)
+# SAVE PROGRESS (PER-WORKER SHARD)
 # =====================================================
+# each process appends to its own shard; the main process compacts them
+# into OUTPUT_FILE, so workers never read-modify-write the same xlsx
+shard = None
+
 def save_progress(data):
+    global shard
     if not data:
         return
 
-    df_new = pd.DataFrame(data)
+    if shard is None:
+        shard = ShardWriter(OUTPUT_FILE)
+    rows = [without_keys(r) for r in data]
+    shard.write(rows)
+    if LEAD_DB:
+        consolidate.save_rows(rows, "Google Maps")
+    print(f"💾 [{current_process().name}] +{len(data)} records to shard")
+    # only now, with the rows on disk, do their keys count as seen
+    get_seen_index().add_saved(data)
 
-    if os.path.exists(OUTPUT_FILE):
-        df_old = pd.read_excel(OUTPUT_FILE)
-        df = pd.concat([df_old, df_new], ignore_index=True)
-    else:
-        df = df_new
 
-    df["Phone"] = df["Phone"].fillna("").str.strip()
-    df["Brand_Name"] = df["Brand_Name"].fillna("").str.strip()
-
-    df["dedupe_key"] = df["Phone"]
-    df.loc[df["dedupe_key"] == "", "dedupe_key"] = df["Brand_Name"]
-
-    df.drop_duplicates(subset=["dedupe_key"], inplace=True)
-    df.drop(columns=["dedupe_key"], inplace=True)
+# =====================================================
+# SHARED SEEN-INDEX (ALL WORKERS, ALL RUNS)
+# =====================================================
+# one per process: replay_orphans in the parent opens one before the
+# workers fork, and a forked sqlite connection must not be reused
+seen_index = {}
 
-    df.to_excel(OUTPUT_FILE, index=False)
-    print(f"💾 Saved total: {len(df)} unique records")
+def get_seen_index():
+    pid = os.getpid()
+    if pid not in seen_index:
+        seen_index[pid] = SeenIndex()
+    return seen_index[pid]
 
 
 # =====================================================
@@ -122,36 +139,38 @@ def scrape_query(driver, query, buffer):
     )
 
     seen = set()
+    index = get_seen_index()
+    selectors = get_registry()
 
     while True:
         listings = driver.find_elements(By.XPATH, '//div[@role="article"]')
         for item in listings:
             try:
+                # known from another worker or an earlier run: no click at all
+                if index.seen_any(card_keys(item)):
+                    continue
+
                 driver.execute_script("arguments[0].scrollIntoView(true);", item)
                 time.sleep(0.5)
                 item.click()
 
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "DUwDvf"))
-                )
+                WebDriverWait(driver, 10).until(lambda d: selectors.present(d, "name"))
 
-                name = driver.find_element(By.CLASS_NAME, "DUwDvf").text
+                name = selectors.find(driver, "name")
                 if name in seen:
                     continue
                 seen.add(name)
 
-                def safe(x):
-                    try:
-                        return driver.find_element(By.XPATH, x).text
-                    except:
-                        return ""
+                phone = re.sub(r"[^\d+]", "", selectors.find(driver, "phone"))
+                if phone and is_blocked(phone):
+                    continue
+                website = selectors.find(driver, "website")
 
-                phone = re.sub(r"[^\d+]", "", safe("//button[contains(@aria-label,'Phone')]"))
-                website = ""
-                try:
-                    website = driver.find_element(By.XPATH, "//a[contains(@aria-label,'Website')]").get_attribute("href")
-                except:
-                    pass
+                keys = keys_for(url=driver.current_url, phone=phone)
+                if index.seen_any(keys):
+                    continue
+                # the keys reach the index only once the row is flushed
+                index.hold(keys)
 
                 buffer.append({
                     "Brand_Name": name,
@@ -159,13 +178,10 @@ def scrape_query(driver, query, buffer):
                     "Website": website,
                     "Query": query,
                     "Source": "Google Maps",
-                    "Scraped_At": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    "Scraped_At": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    KEYS_FIELD: keys
                 })
 
-                if len(buffer) % SAVE_EVERY == 0:
-                    save_progress(buffer)
-                    buffer.clear()
-
                 time.sleep(random.uniform(WAIT_MIN, WAIT_MAX))
 
             except StaleElementReferenceException:
@@ -182,7 +198,8 @@ def scrape_query(driver, query, buffer):
 # WORKER (AUTO RESTART)
 # =====================================================
 def worker(queries):
-    buffer = []
+    # flushes every SAVE_EVERY rows, so memory stays flat however long the run
+    buffer = SpillBuffer(save_progress, SAVE_EVERY, spill_dir_for(OUTPUT_FILE))
     while True:
         try:
             driver = setup_driver()
@@ -195,8 +212,8 @@ def worker(queries):
             print(f"[{current_process().name}] 🔁 Chrome crashed, restarting...")
             time.sleep(5)
 
-    if buffer:
-        save_progress(buffer)
+    buffer.flush()
+    print(f"[{current_process().name}] " + get_seen_index().summary())
 
 # =====================================================
 # MAIN (PARALLEL EXECUTION)
@@ -207,6 +224,9 @@ def main():
         for k in KEYWORDS:
             all_queries.append(f"{k} {d}")
 
+    replay_orphans(save_progress, spill_dir_for(OUTPUT_FILE))
+    SeenIndex().close()   # create the bloom file once, before workers map it
+
     chunk_size = len(all_queries) // NUM_BROWSERS + 1
     chunks = [all_queries[i:i + chunk_size] for i in range(0, len(all_queries), chunk_size)]
 
@@ -216,9 +236,15 @@ def main():
         p.start()
         processes.append(p)
 
+    compactor = shards.start_background(OUTPUT_FILE, shards.key_phone_or_name)
+
     for p in processes:
         p.join()
 
+    compactor.stop()
+    shards.compact(OUTPUT_FILE, shards.key_phone_or_name)
+    shards.export(OUTPUT_FILE)
+
     print("🏁 ALL DISTRICTS SCRAPED SUCCESSFULLY")
 
 if __name__ == "__main__":
@@ -0,0 +1,444 @@
+import os
+import re
+import sys
+import json
+import time
+
+import pandas as pd
+
+# =====================================================
+# CONFIG
+# =====================================================
+PINCODE_FILE = "pincodes.json"     # exact 6-digit index, written by `build` from India Post data
+TAIL_PARTS = 3                     # "..., <locality>, <city>, <state> <pin>": only the tail is parsed
+OUTPUT_COLUMNS = ["City", "District", "State", "Pincode"]
+
+PINCODE_RE = re.compile(r"(?<!\d)([1-9]\d{2})\s?(\d{3})(?!\d)")
+TOKEN_RE = re.compile(r"[a-z]+")
+ROAD_WORDS = {"road", "rd", "marg", "highway"}   # "Ajmer Road" is a street, not Ajmer
+
+# =====================================================
+# BUNDLED PINCODE → STATE / DISTRICT TABLE
+# =====================================================
+# the first two digits of a pincode fix the postal circle, which is a
+# state apart from the three-digit exceptions below
+STATE_BY_2 = {
+    "11": "Delhi",
+    "12": "Haryana", "13": "Haryana",
+    "14": "Punjab", "15": "Punjab", "16": "Punjab",
+    "17": "Himachal Pradesh",
+    "18": "Jammu and Kashmir", "19": "Jammu and Kashmir",
+    **{str(p): "Uttar Pradesh" for p in range(20, 29)},
+    **{str(p): "Rajasthan" for p in range(30, 35)},
+    **{str(p): "Gujarat" for p in range(36, 40)},
+    **{str(p): "Maharashtra" for p in range(40, 45)},
+    **{str(p): "Madhya Pradesh" for p in range(45, 49)},
+    "49": "Chhattisgarh",
+    "50": "Telangana",
+    "51": "Andhra Pradesh", "52": "Andhra Pradesh", "53": "Andhra Pradesh",
+    **{str(p): "Karnataka" for p in range(56, 60)},
+    **{str(p): "Tamil Nadu" for p in range(60, 65)},
+    "67": "Kerala", "68": "Kerala", "69": "Kerala",
+    **{str(p): "West Bengal" for p in range(70, 75)},
+    "75": "Odisha", "76": "Odisha", "77": "Odisha",
+    "78": "Assam",
+    **{str(p): "Bihar" for p in range(80, 86)},
+}
+
+STATE_BY_3 = {
+    "160": "Chandigarh",
+    "194": "Ladakh",
+    "246": "Uttarakhand", "248": "Uttarakhand", "249": "Uttarakhand", "263": "Uttarakhand",
+    "403": "Goa",
+    "737": "Sikkim",
+    "744": "Andaman and Nicobar Islands",
+    "790": "Arunachal Pradesh", "791": "Arunachal Pradesh", "792": "Arunachal Pradesh",
+    "793": "Meghalaya", "794": "Meghalaya",
+    "795": "Manipur",
+    "796": "Mizoram",
+    "797": "Nagaland", "798": "Nagaland",
+    "799": "Tripura",
+    **{p: "Jharkhand" for p in ("814", "815", "816", "822", "825", "826", "827", "828", "829",
+                                "831", "832", "833", "834", "835")},
+}
+
+# head-office district of a three-digit prefix. every Rajasthan prefix, and
+# the main trading cities elsewhere; a prefix can reach into a neighbouring
+# district, which the exact 6-digit index (PINCODE_FILE) settles
+DISTRICT_BY_3 = {
+    # Rajasthan
+    "301": "Alwar", "302": "Jaipur", "303": "Jaipur", "304": "Tonk", "305": "Ajmer",
+    "306": "Pali", "307": "Sirohi", "311": "Bhilwara", "312": "Chittorgarh",
+    "313": "Udaipur", "314": "Dungarpur", "321": "Bharatpur", "322": "Sawai Madhopur",
+    "323": "Bundi", "324": "Kota", "325": "Baran", "326": "Jhalawar", "327": "Banswara",
+    "328": "Dholpur", "331": "Churu", "332": "Sikar", "333": "Jhunjhunu",
+    "334": "Bikaner", "335": "Sri Ganganagar", "341": "Nagaur", "342": "Jodhpur",
+    "343": "Jalore", "344": "Barmer", "345": "Jaisalmer",
+    # elsewhere
+    "110": "Delhi", "121": "Faridabad", "122": "Gurugram", "131": "Sonipat", "132": "Panipat",
+    "141": "Ludhiana", "143": "Amritsar", "144": "Jalandhar", "160": "Chandigarh",
+    "201": "Ghaziabad", "202": "Aligarh", "208": "Kanpur Nagar", "211": "Prayagraj",
+    "221": "Varanasi", "226": "Lucknow", "243": "Bareilly", "244": "Moradabad",
+    "247": "Saharanpur", "248": "Dehradun", "249": "Haridwar", "250": "Meerut", "282": "Agra",
+    "360": "Rajkot", "363": "Morbi", "364": "Bhavnagar", "380": "Ahmedabad",
+    "390": "Vadodara", "395": "Surat", "396": "Valsad",
+    "400": "Mumbai", "411": "Pune", "416": "Kolhapur", "421": "Thane", "422": "Nashik",
+    "431": "Aurangabad", "440": "Nagpur", "452": "Indore", "462": "Bhopal",
+    "492": "Raipur", "495": "Bilaspur", "500": "Hyderabad", "506": "Warangal",
+    "520": "NTR", "522": "Guntur", "530": "Visakhapatnam",
+    "560": "Bengaluru Urban", "570": "Mysuru", "575": "Dakshina Kannada", "580": "Dharwad",
+    "590": "Belagavi", "600": "Chennai", "625": "Madurai", "636": "Salem", "638": "Erode",
+    "641": "Coimbatore", "673": "Kozhikode", "680": "Thrissur", "682": "Ernakulam",
+    "695": "Thiruvananthapuram", "700": "Kolkata", "711": "Howrah", "713": "Paschim Bardhaman",
+    "751": "Khordha", "753": "Cuttack", "781": "Kamrup Metropolitan", "788": "Cachar",
+    "793": "East Khasi Hills", "795": "Imphal West", "800": "Patna", "831": "East Singhbhum",
+    "834": "Ranchi", "842": "Muzaffarpur",
+}
+
+# =====================================================
+# CITY / STATE NAMES
+# =====================================================
+# canonical city → (district, state)
+CITIES = {
+    # Rajasthan (district headquarters, as in the scrapers' district lists)
+    "Ajmer": ("Ajmer", "Rajasthan"), "Alwar": ("Alwar", "Rajasthan"),
+    "Anupgarh": ("Anupgarh", "Rajasthan"), "Balotra": ("Balotra", "Rajasthan"),
+    "Banswara": ("Banswara", "Rajasthan"), "Baran": ("Baran", "Rajasthan"),
+    "Barmer": ("Barmer", "Rajasthan"), "Beawar": ("Beawar", "Rajasthan"),
+    "Bharatpur": ("Bharatpur", "Rajasthan"), "Bhilwara": ("Bhilwara", "Rajasthan"),
+    "Bikaner": ("Bikaner", "Rajasthan"), "Bundi": ("Bundi", "Rajasthan"),
+    "Chittorgarh": ("Chittorgarh", "Rajasthan"), "Churu": ("Churu", "Rajasthan"),
+    "Dausa": ("Dausa", "Rajasthan"), "Deeg": ("Deeg", "Rajasthan"),
+    "Didwana": ("Didwana Kuchaman", "Rajasthan"), "Kuchaman City": ("Didwana Kuchaman", "Rajasthan"),
+    "Dholpur": ("Dholpur", "Rajasthan"), "Dungarpur": ("Dungarpur", "Rajasthan"),
+    "Dudu": ("Dudu", "Rajasthan"), "Gangapur City": ("Gangapur City", "Rajasthan"),
+    "Hanumangarh": ("Hanumangarh", "Rajasthan"), "Jaipur": ("Jaipur", "Rajasthan"),
+    "Jaisalmer": ("Jaisalmer", "Rajasthan"), "Jalore": ("Jalore", "Rajasthan"),
+    "Jhalawar": ("Jhalawar", "Rajasthan"), "Jhunjhunu": ("Jhunjhunu", "Rajasthan"),
+    "Jodhpur": ("Jodhpur", "Rajasthan"), "Karauli": ("Karauli", "Rajasthan"),
+    "Kekri": ("Kekri", "Rajasthan"), "Khairthal": ("Khairthal Tijara", "Rajasthan"),
+    "Tijara": ("Khairthal Tijara", "Rajasthan"), "Kota": ("Kota", "Rajasthan"),
+    "Kotputli": ("Kotputli Behror", "Rajasthan"), "Behror": ("Kotputli Behror", "Rajasthan"),
+    "Nagaur": ("Nagaur", "Rajasthan"), "Neem Ka Thana": ("Neem Ka Thana", "Rajasthan"),
+    "Pali": ("Pali", "Rajasthan"), "Phalodi": ("Phalodi", "Rajasthan"),
+    "Pratapgarh": ("Pratapgarh", "Rajasthan"), "Rajsamand": ("Rajsamand", "Rajasthan"),
+    "Salumbar": ("Salumbar", "Rajasthan"), "Sanchore": ("Sanchore", "Rajasthan"),
+    "Sawai Madhopur": ("Sawai Madhopur", "Rajasthan"), "Shahpura": ("Shahpura", "Rajasthan"),
+    "Sikar": ("Sikar", "Rajasthan"), "Sirohi": ("Sirohi", "Rajasthan"),
+    "Sri Ganganagar": ("Sri Ganganagar", "Rajasthan"), "Tonk": ("Tonk", "Rajasthan"),
+    "Udaipur": ("Udaipur", "Rajasthan"),
+    # trading cities (cities.py and the per-city scrapers)
+    "Delhi": ("Delhi", "Delhi"), "Mumbai": ("Mumbai", "Maharashtra"),
+    "Bengaluru": ("Bengaluru Urban", "Karnataka"), "Hyderabad": ("Hyderabad", "Telangana"),
+    "Chennai": ("Chennai", "Tamil Nadu"), "Kolkata": ("Kolkata", "West Bengal"),
+    "Pune": ("Pune", "Maharashtra"), "Ahmedabad": ("Ahmedabad", "Gujarat"),
+    "Surat": ("Surat", "Gujarat"), "Rajkot": ("Rajkot", "Gujarat"),
+    "Vadodara": ("Vadodara", "Gujarat"), "Morbi": ("Morbi", "Gujarat"),
+    "Bhavnagar": ("Bhavnagar", "Gujarat"), "Vapi": ("Valsad", "Gujarat"),
+    "Valsad": ("Valsad", "Gujarat"),
+    "Silvassa": ("Dadra and Nagar Haveli", "Dadra and Nagar Haveli and Daman and Diu"),
+    "Daman": ("Daman", "Dadra and Nagar Haveli and Daman and Diu"),
+    "Ludhiana": ("Ludhiana", "Punjab"), "Jalandhar": ("Jalandhar", "Punjab"),
+    "Amritsar": ("Amritsar", "Punjab"), "Chandigarh": ("Chandigarh", "Chandigarh"),
+    "Panipat": ("Panipat", "Haryana"), "Sonipat": ("Sonipat", "Haryana"),
+    "Faridabad": ("Faridabad", "Haryana"), "Gurugram": ("Gurugram", "Haryana"),
+    "Coimbatore": ("Coimbatore", "Tamil Nadu"), "Tiruppur": ("Tiruppur", "Tamil Nadu"),
+    "Erode": ("Erode", "Tamil Nadu"), "Salem": ("Salem", "Tamil Nadu"),
+    "Madurai": ("Madurai", "Tamil Nadu"), "Indore": ("Indore", "Madhya Pradesh"),
+    "Bhopal": ("Bhopal", "Madhya Pradesh"), "Lucknow": ("Lucknow", "Uttar Pradesh"),
+    "Kanpur": ("Kanpur Nagar", "Uttar Pradesh"), "Agra": ("Agra", "Uttar Pradesh"),
+    "Meerut": ("Meerut", "Uttar Pradesh"), "Noida": ("Gautam Buddha Nagar", "Uttar Pradesh"),
+    "Greater Noida": ("Gautam Buddha Nagar", "Uttar Pradesh"),
+    "Ghaziabad": ("Ghaziabad", "Uttar Pradesh"), "Varanasi": ("Varanasi", "Uttar Pradesh"),
+    "Prayagraj": ("Prayagraj", "Uttar Pradesh"), "Bareilly": ("Bareilly", "Uttar Pradesh"),
+    "Moradabad": ("Moradabad", "Uttar Pradesh"), "Aligarh": ("Aligarh", "Uttar Pradesh"),
+    "Saharanpur": ("Saharanpur", "Uttar Pradesh"), "Dehradun": ("Dehradun", "Uttarakhand"),
+    "Haridwar": ("Haridwar", "Uttarakhand"), "Roorkee": ("Haridwar", "Uttarakhand"),
+    "Thane": ("Thane", "Maharashtra"), "Bhiwandi": ("Thane", "Maharashtra"),
+    "Navi Mumbai": ("Thane", "Maharashtra"), "Nagpur": ("Nagpur", "Maharashtra"),
+    "Aurangabad": ("Aurangabad", "Maharashtra"), "Nashik": ("Nashik", "Maharashtra"),
+    "Kolhapur": ("Kolhapur", "Maharashtra"), "Sangli": ("Sangli", "Maharashtra"),
+    "Howrah": ("Howrah", "West Bengal"), "Durgapur": ("Paschim Bardhaman", "West Bengal"),
+    "Asansol": ("Paschim Bardhaman", "West Bengal"), "Belagavi": ("Belagavi", "Karnataka"),
+    "Hubballi": ("Dharwad", "Karnataka"), "Dharwad": ("Dharwad", "Karnataka"),
+    "Mysuru": ("Mysuru", "Karnataka"), "Mangaluru": ("Dakshina Kannada", "Karnataka"),
+    "Vijayawada": ("NTR", "Andhra Pradesh"), "Guntur": ("Guntur", "Andhra Pradesh"),
+    "Visakhapatnam": ("Visakhapatnam", "Andhra Pradesh"), "Warangal": ("Warangal", "Telangana"),
+    "Kochi": ("Ernakulam", "Kerala"), "Thrissur": ("Thrissur", "Kerala"),
+    "Kozhikode": ("Kozhikode", "Kerala"), "Thiruvananthapuram": ("Thiruvananthapuram", "Kerala"),
+    "Bhubaneswar": ("Khordha", "Odisha"), "Cuttack": ("Cuttack", "Odisha"),
+    "Raipur": ("Raipur", "Chhattisgarh"), "Bilaspur": ("Bilaspur", "Chhattisgarh"),
+    "Ranchi": ("Ranchi", "Jharkhand"), "Jamshedpur": ("East Singhbhum", "Jharkhand"),
+    "Patna": ("Patna", "Bihar"), "Muzaffarpur": ("Muzaffarpur", "Bihar"),
+    "Guwahati": ("Kamrup Metropolitan", "Assam"), "Silchar": ("Cachar", "Assam"),
+    "Imphal": ("Imphal West", "Manipur"), "Shillong": ("East Khasi Hills", "Meghalaya"),
+    "Manali": ("Kullu", "Himachal Pradesh"),
+}
+
+CITY_ALIASES = {
+    "New Delhi": "Delhi", "Bombay": "Mumbai", "Bangalore": "Bengaluru", "Calcutta": "Kolkata",
+    "Madras": "Chennai", "Poona": "Pune", "Baroda": "Vadodara", "Gurgaon": "Gurugram",
+    "Allahabad": "Prayagraj", "Belgaum": "Belagavi", "Hubli": "Hubballi", "Mysore": "Mysuru",
+    "Mangalore": "Mangaluru", "Cochin": "Kochi", "Calicut": "Kozhikode",
+    "Trivandrum": "Thiruvananthapuram", "Vizag": "Visakhapatnam", "Secunderabad": "Hyderabad",
+    "Ganganagar": "Sri Ganganagar", "Shri Ganganagar": "Sri Ganganagar",
+    "Sriganganagar": "Sri Ganganagar", "Chittaurgarh": "Chittorgarh", "Jalor": "Jalore",
+    "Jhunjhunun": "Jhunjhunu", "Dhaulpur": "Dholpur", "Kuchaman": "Kuchaman City",
+    "Neemkathana": "Neem Ka Thana",
+}
+
+STATES = [
+    "Andhra Pradesh", "Arunachal Pradesh", "Assam", "Bihar", "Chhattisgarh", "Goa", "Gujarat",
+    "Haryana", "Himachal Pradesh", "Jharkhand", "Karnataka", "Kerala", "Madhya Pradesh",
+    "Maharashtra", "Manipur", "Meghalaya", "Mizoram", "Nagaland", "Odisha", "Punjab",
+    "Rajasthan", "Sikkim", "Tamil Nadu", "Telangana", "Tripura", "Uttar Pradesh",
+    "Uttarakhand", "West Bengal", "Andaman and Nicobar Islands", "Chandigarh",
+    "Dadra and Nagar Haveli and Daman and Diu", "Delhi", "Jammu and Kashmir", "Ladakh",
+    "Lakshadweep", "Puducherry",
+]
+
+STATE_ALIASES = {
+    "Orissa": "Odisha", "Pondicherry": "Puducherry", "Uttaranchal": "Uttarakhand",
+    "Tamilnadu": "Tamil Nadu", "NCT of Delhi": "Delhi", "Jammu & Kashmir": "Jammu and Kashmir",
+    "Andaman & Nicobar Islands": "Andaman and Nicobar Islands",
+    "The Dadra and Nagar Haveli and Daman and Diu": "Dadra and Nagar Haveli and Daman and Diu",
+}
+
+# =====================================================
+# ALIAS TRIE (WORD LEVEL)
+# =====================================================
+def tokens(text):
+    return TOKEN_RE.findall(text.lower().replace("&", " and "))
+
+
+class NameTrie:
+    # word-level trie: "sawai madhopur" is two hops, and the longest name
+    # starting at a word wins ("greater noida" over "noida")
+    def __init__(self):
+        self.root = {}
+
+    def add(self, name, kind, value):
+        node = self.root
+        for tok in tokens(name):
+            node = node.setdefault(tok, {})
+        node.setdefault("$", {})[kind] = value
+
+    def scan(self, words):
+        # → [(start, end, {kind: value})], non-overlapping, left to right
+        out = []
+        i = 0
+        while i < len(words):
+            node, hit = self.root, None
+            for j in range(i, len(words)):
+                node = node.get(words[j])
+                if node is None:
+                    break
+                if "$" in node:
+                    hit = (i, j + 1, node["$"])
+            if hit:
+                out.append(hit)
+                i = hit[1]
+            else:
+                i += 1
+        return out
+
+
+def build_trie():
+    trie = NameTrie()
+    for city in CITIES:
+        trie.add(city, "city", city)
+    for alias, city in CITY_ALIASES.items():
+        trie.add(alias, "city", city)
+    for state in STATES:
+        trie.add(state, "state", state)
+    for alias, state in STATE_ALIASES.items():
+        trie.add(alias, "state", state)
+    return trie
+
+
+TRIE = build_trie()
+
+# =====================================================
+# PINCODE INDEX
+# =====================================================
+class PincodeIndex:
+    def __init__(self, path=PINCODE_FILE):
+        self.exact = {}
+        self.prefix = dict(DISTRICT_BY_3)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.exact = {k: tuple(v) for k, v in data["pincodes"].items()}
+            self.prefix.update(data.get("prefixes", {}))
+
+    def lookup(self, pincode):
+        # → (district, state); either may be None
+        if not pincode:
+            return None, None
+        if pincode in self.exact:
+            return self.exact[pincode]
+        p3 = pincode[:3]
+        return self.prefix.get(p3), STATE_BY_3.get(p3) or STATE_BY_2.get(p3[:2])
+
+
+_default = None
+
+
+def get_index():
+    global _default
+    if _default is None:
+        _default = PincodeIndex()
+    return _default
+
+
+def canonical_state(name):
+    if not name:
+        return None
+    for _, _, found in TRIE.scan(tokens(name)):
+        if "state" in found:
+            return found["state"]
+    return str(name).strip().title()
+
+
+def build(csv_path, out=PINCODE_FILE):
+    # India Post "all India pincode directory" CSV: one row per post office,
+    # with pincode, district and statename columns (any case)
+    df = pd.read_csv(csv_path, dtype=str, usecols=lambda c: c.lower() in ("pincode", "district", "statename"))
+    df.columns = [c.lower() for c in df.columns]
+    df = df.dropna()
+    df["pincode"] = df["pincode"].str.strip()
+    df = df[df["pincode"].str.fullmatch(r"[1-9]\d{5}")]
+    df["district"] = df["district"].str.strip().str.title()
+    df["state"] = df["statename"].map(canonical_state)
+
+    # a pincode's offices can straddle a district line: keep the commonest
+    top = (
+        df.groupby(["pincode", "district", "state"]).size()
+        .reset_index(name="n")
+        .sort_values("n", ascending=False)
+        .drop_duplicates("pincode")
+    )
+    top["p3"] = top["pincode"].str[:3]
+    prefixes = top.groupby("p3")["district"].agg(lambda s: s.value_counts().index[0])
+
+    data = {
+        "pincodes": {p: [d, s] for p, d, s in zip(top["pincode"], top["district"], top["state"])},
+        "prefixes": prefixes.to_dict(),
+    }
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    return len(data["pincodes"]), len(data["prefixes"])
+
+# =====================================================
+# SCALAR (FOR USE INSIDE SCRAPE LOOPS)
+# =====================================================
+def tail(address):
+    return ",".join(str(address).split(",")[-TAIL_PARTS:])
+
+
+def parse_tail(text, index=None):
+    index = index or get_index()
+    pins = PINCODE_RE.findall(text)
+    pincode = "".join(pins[-1]) if pins else None
+
+    # streets are often named after other cities: a name followed by
+    # road / rd / marg / highway is skipped, and of the rest the last one wins
+    words = tokens(text)
+    named, state_named = [], None
+    for _, end, found in TRIE.scan(words):
+        if "city" in found and not (end < len(words) and words[end] in ROAD_WORDS):
+            named.append(found["city"])
+        state_named = found.get("state", state_named)
+
+    # the pincode is the stronger signal: its district stands, and a city
+    # name is only taken when it lies in that district
+    district, state = index.lookup(pincode)
+    state = state or state_named
+    city = None
+    for name in reversed(named):
+        city_district, city_state = CITIES[name]
+        if district:
+            fits = city_district.lower() == district.lower()
+        else:
+            fits = state is None or city_state == state
+        if fits:
+            city = name
+            district = district or city_district
+            state = state or city_state
+            break
+
+    if not city:
+        # unknown town: the last part that is neither state, pincode nor a road
+        for part in reversed(text.split(",")):
+            part = PINCODE_RE.sub("", part).strip(" .-")
+            last = tokens(part)[-1:]
+            if last and last[0] not in ROAD_WORDS and canonical_state(part) != state:
+                city = part.title()
+                break
+    return {"City": city, "District": district, "State": state, "Pincode": pincode}
+
+
+def parse(address):
+    if not address or (isinstance(address, float) and address != address):
+        return dict.fromkeys(OUTPUT_COLUMNS)
+    return parse_tail(tail(address))
+
+# =====================================================
+# VECTORIZED (PANDAS)
+# =====================================================
+def parse_series(s):
+    # scraped addresses share their tails ("Malviya Nagar, Jaipur, Rajasthan
+    # 302017"), so each distinct tail is parsed once and broadcast back
+    tails = s.astype("string").str.split(",").str[-TAIL_PARTS:].str.join(",")
+    codes, uniques = pd.factorize(tails)
+    index = get_index()
+    parsed = pd.DataFrame([parse_tail(t, index) for t in uniques], columns=OUTPUT_COLUMNS)
+    # missing addresses factorize to -1, i.e. this trailing empty row
+    empty = pd.DataFrame([dict.fromkeys(OUTPUT_COLUMNS)])
+    out = pd.concat([parsed, empty], ignore_index=True).iloc[codes].astype("string")
+    out.index = s.index
+    return out
+
+
+def fill_frame(df, column="Address"):
+    # City / District / State / Pincode from `column`; values the parser
+    # cannot settle keep whatever the row already had
+    parsed = parse_series(df[column])
+    for col in OUTPUT_COLUMNS:
+        if col in df.columns:
+            df[col] = parsed[col].fillna(df[col].astype("string"))
+        else:
+            df[col] = parsed[col]
+    return df
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    usage = (
+        "usage: python address_parser.py build <india_post.csv>\n"
+        "       python address_parser.py fill <leads.xlsx> [address column]\n"
+        "       python address_parser.py \"<address>\""
+    )
+    args = sys.argv[1:]
+    if not args:
+        print(usage)
+        return
+
+    if args[0] == "build" and len(args) > 1:
+        n, p = build(args[1])
+        print(f"📮 {n:,} pincodes / {p} prefixes → {PINCODE_FILE}")
+    elif args[0] == "fill" and len(args) > 1:
+        df = pd.read_excel(args[1])
+        t0 = time.perf_counter()
+        fill_frame(df, args[2] if len(args) > 2 else "Address")
+        dt = time.perf_counter() - t0
+        out = args[1].replace(".xlsx", "_geo.xlsx")
+        df.to_excel(out, index=False)
+        print(f"📍 {len(df):,} addresses in {dt:.2f}s ({len(df) / max(dt, 1e-9) * 60:,.0f}/min) → {out}")
+    else:
+        print(parse(" ".join(args)))
+
+
+if __name__ == "__main__":
+    main()
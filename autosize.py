@@ -0,0 +1,156 @@
+import os
+import time
+from multiprocessing import Value
+from queue import Empty
+
+import psutil
+
+# =====================================================
+# CONFIG
+# =====================================================
+MEM_RESERVE_MB = 1536      # left for the OS and the main process
+MAX_WORKERS = 16
+CONTROL_EVERY = 30         # seconds between AIMD decisions
+
+SLOWDOWN = 1.5             # seconds per card this far above the baseline = overloaded
+MIN_CARDS = 20             # a window needs this many cards to judge latency on
+QUEUE_WAIT = 5             # seconds a worker blocks on the task queue per try
+MAX_ERROR_RATE = 0.2       # share of failed queries in the last window
+MEM_PRESSURE = 0.9         # system memory use above this → back off
+
+# =====================================================
+# STARTUP PROBE
+# =====================================================
+def probe(launch_fn, settle=5):
+    # launch_fn starts one browser, loads a real page and returns a close()
+    # callable; we measure what that cost the whole machine
+    cpu_before = psutil.cpu_times()
+    mem_before = psutil.virtual_memory().available
+    t0 = time.time()
+
+    close = launch_fn()
+    time.sleep(settle)
+
+    mem_after = psutil.virtual_memory().available
+    cpu_after = psutil.cpu_times()
+    elapsed = time.time() - t0
+    try:
+        close()
+    except Exception:
+        pass
+
+    busy = (cpu_after.user - cpu_before.user) + (cpu_after.system - cpu_before.system)
+    mem_mb = max((mem_before - mem_after) / (1024 * 1024), 300.0)
+    cores = max(busy / elapsed, 0.25)
+    return mem_mb, cores
+
+
+def pick_workers(mem_mb, cores):
+    avail = psutil.virtual_memory().available / (1024 * 1024) - MEM_RESERVE_MB
+    by_mem = int(avail // (mem_mb * 1.5))     # head-room: tabs grow during a run
+    by_cpu = int((os.cpu_count() or 2) // cores)
+    n = max(1, min(by_mem, by_cpu, MAX_WORKERS))
+    print(f"📐 Browser ≈ {mem_mb:.0f} MB / {cores:.2f} cores → "
+          f"mem allows {by_mem}, cpu allows {by_cpu}, using {n}")
+    return n
+
+# =====================================================
+# AIMD CONTROLLER
+# =====================================================
+class AIMD:
+    # Queries differ wildly in size (3 cards vs 120), so whole-query time says
+    # nothing about load. The signal is seconds per card over the window,
+    # compared with the best window seen so far, which is the least contended.
+    def __init__(self, start, ceiling, floor=1):
+        self.value = start
+        self.ceiling = ceiling
+        self.floor = floor
+        self.baseline = None
+
+    def per_card(self, samples):
+        # samples: (seconds, cards) per finished query
+        cards = sum(c for _, c in samples)
+        if cards < MIN_CARDS:
+            return None
+        return sum(s for s, c in samples if c) / cards
+
+    def update(self, samples, errors, total):
+        mem = psutil.virtual_memory().percent / 100
+        err_rate = errors / total if total else 0.0
+        per_card = self.per_card(samples)
+        if per_card is not None and (self.baseline is None or per_card < self.baseline):
+            self.baseline = per_card
+        slow = per_card is not None and per_card > self.baseline * SLOWDOWN
+
+        if mem > MEM_PRESSURE or err_rate > MAX_ERROR_RATE or slow:
+            self.value = max(self.floor, self.value // 2)
+            reason = "memory" if mem > MEM_PRESSURE else "errors" if err_rate > MAX_ERROR_RATE else "latency"
+            print(f"📉 Concurrency → {self.value} ({reason})")
+        elif total and self.value < self.ceiling:
+            self.value += 1
+            print(f"📈 Concurrency → {self.value}")
+        return self.value
+
+# =====================================================
+# SHARED GATE (MAIN ↔ WORKER PROCESSES)
+# =====================================================
+class Gate:
+    # workers 0..target-1 run, the rest wait (and should drop their browser);
+    # once the queue is drained everyone is let through to collect their DONE
+    def __init__(self, start):
+        self.target = Value("i", start)
+        self.closed = Value("b", 0)
+
+    def allowed(self, worker_id):
+        return bool(self.closed.value) or worker_id < self.target.value
+
+    def set(self, n):
+        self.target.value = n
+
+    def close(self):
+        self.closed.value = 1
+
+# =====================================================
+# TASK QUEUE
+# =====================================================
+DONE = None   # one per worker, queued behind the last query
+
+
+def feed(task_q, queries, workers):
+    for q in queries:
+        task_q.put(q)
+    for _ in range(workers):
+        task_q.put(DONE)
+
+
+def take(task_q, gate, timeout=QUEUE_WAIT):
+    # Empty from a multiprocessing queue can be spurious (the feeder thread
+    # has not flushed yet), so only DONE means there is no work left
+    while True:
+        try:
+            q = task_q.get(timeout=timeout)
+        except Empty:
+            continue
+        if q is DONE:
+            gate.close()
+        return q
+
+
+def control_loop(gate, stats_q, procs, controller, every=CONTROL_EVERY):
+    # main process: read (seconds, cards, ok) reports, adjust the gate until done
+    while any(p.is_alive() for p in procs):
+        deadline = time.time() + every
+        samples, errors, total = [], 0, 0
+        while time.time() < deadline:
+            try:
+                seconds, cards, ok = stats_q.get(timeout=1)
+            except Empty:
+                if not any(p.is_alive() for p in procs):
+                    break
+                continue
+            total += 1
+            if ok:
+                samples.append((seconds, cards))
+            else:
+                errors += 1
+        gate.set(controller.update(samples, errors, total))
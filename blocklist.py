@@ -0,0 +1,163 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+from phone_norm import normalize_phone, normalize_series
+
+# =====================================================
+# CONFIG
+# =====================================================
+BLOCKLIST_FILE = "blocklist.u64"          # sorted, unique uint64, memory-mapped
+DELTA_FILE = "blocklist.delta.u64"        # append-only additions since last compact
+COMPACT_AFTER = 100_000                   # fold the delta in once it gets this big
+DTYPE = np.dtype("<u8")
+
+# numbers that must never be written, whatever the files say
+ALWAYS_BLOCKED = ["9999999776"]
+
+# =====================================================
+# ENCODING
+# =====================================================
+def to_key(phone):
+    e164 = normalize_phone(phone)
+    return int(e164[1:]) if e164 else None
+
+
+def to_keys(series):
+    e164 = normalize_series(series).dropna()
+    return e164.str[1:].astype("uint64").to_numpy(dtype=DTYPE)
+
+# =====================================================
+# BLOCKLIST
+# =====================================================
+class Blocklist:
+    def __init__(self, path=BLOCKLIST_FILE, delta_path=DELTA_FILE):
+        self.path = path
+        self.delta_path = delta_path
+        self.load()
+
+    def load(self):
+        if os.path.exists(self.path) and os.path.getsize(self.path):
+            self.keys = np.memmap(self.path, dtype=DTYPE, mode="r")
+        else:
+            self.keys = np.empty(0, dtype=DTYPE)
+
+        if os.path.exists(self.delta_path):
+            delta = np.fromfile(self.delta_path, dtype=DTYPE)
+        else:
+            delta = np.empty(0, dtype=DTYPE)
+        self.delta = set(delta.tolist())
+        self.delta.update(k for k in map(to_key, ALWAYS_BLOCKED) if k)
+
+    def __len__(self):
+        return len(self.keys) + len(self.delta)
+
+    def __contains__(self, phone):
+        key = to_key(phone)
+        if key is None:
+            return False
+        if key in self.delta:
+            return True
+        i = np.searchsorted(self.keys, key)
+        return bool(i < len(self.keys) and self.keys[i] == key)
+
+    def mask(self, series):
+        # vectorized membership test for a whole phone column
+        e164 = normalize_series(series)
+        valid = e164.notna().to_numpy()
+        keys = np.zeros(len(series), dtype=DTYPE)
+        keys[valid] = e164[valid].str[1:].astype("uint64").to_numpy(dtype=DTYPE)
+
+        hit = np.zeros(len(series), dtype=bool)
+        if len(self.keys):
+            pos = np.searchsorted(self.keys, keys).clip(max=len(self.keys) - 1)
+            hit = self.keys[pos] == keys
+        if self.delta:
+            hit |= np.isin(keys, np.fromiter(self.delta, dtype=DTYPE))
+        return hit & valid
+
+    def add(self, phones):
+        keys = [k for k in map(to_key, phones) if k and k not in self]
+        if not keys:
+            return 0
+        with open(self.delta_path, "ab") as f:
+            np.asarray(keys, dtype=DTYPE).tofile(f)
+        self.delta.update(keys)
+        if len(self.delta) >= COMPACT_AFTER:
+            self.compact()
+        return len(keys)
+
+    def import_keys(self, keys):
+        # bulk path for registry exports: merge straight into the sorted file
+        merged = np.union1d(np.asarray(self.keys), np.asarray(keys, dtype=DTYPE))
+        self.write(merged)
+
+    def compact(self):
+        delta = np.fromiter(self.delta, dtype=DTYPE, count=len(self.delta))
+        merged = np.union1d(np.asarray(self.keys), delta)
+        self.write(merged)
+        if os.path.exists(self.delta_path):
+            os.remove(self.delta_path)
+        self.load()
+
+    def write(self, keys):
+        tmp = self.path + ".tmp"
+        keys.astype(DTYPE).tofile(tmp)
+        self.keys = np.empty(0, dtype=DTYPE)   # release the old mapping first
+        os.replace(tmp, self.path)
+        self.load()
+
+
+_default = None
+
+
+def get_blocklist():
+    global _default
+    if _default is None:
+        _default = Blocklist()
+    return _default
+
+
+def is_blocked(phone):
+    return phone in get_blocklist()
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    import pandas as pd
+
+    usage = "usage: python blocklist.py import <file.csv|xlsx> [column] | add <phone>... | compact | check <phone>..."
+    if len(sys.argv) < 2:
+        print(usage)
+        return
+
+    cmd, args = sys.argv[1], sys.argv[2:]
+    t0 = time.perf_counter()
+    bl = get_blocklist()
+    print(f"📂 Loaded {len(bl):,} numbers in {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+    if cmd == "import" and args:
+        path = args[0]
+        column = args[1] if len(args) > 1 else 0
+        reader = pd.read_excel if path.endswith(".xlsx") else pd.read_csv
+        df = reader(path, dtype=str)
+        col = df[column] if column in df.columns else df.iloc[:, 0]
+        bl.import_keys(to_keys(col))
+        print(f"🚫 Blocklist now holds {len(bl):,} numbers")
+    elif cmd == "add" and args:
+        print(f"🚫 Added {bl.add(args)} numbers")
+    elif cmd == "compact":
+        bl.compact()
+        print(f"🗜️ Compacted to {len(bl):,} numbers")
+    elif cmd == "check" and args:
+        for phone in args:
+            print(f"{phone}: {'BLOCKED' if phone in bl else 'ok'}")
+    else:
+        print(usage)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+import os
+import time
+import shutil
+import threading
+
+import psutil
+
+# =====================================================
+# CONFIG
+# =====================================================
+MAX_MEM_MB = 1500          # recycle once the Chrome tree uses more than this (PSS/USS)
+MAX_LEAK_MB_PER_MIN = 40   # ... or grows faster than this over the window
+WINDOW = 10                # samples used for the growth rate
+MIN_AGE = 120              # seconds; never recycle a browser younger than this
+SAMPLE_EVERY = 15          # seconds between background samples while a query runs
+PROFILE_ROOT = "profiles"  # user-data-dir per worker process, removed on recycle
+
+# =====================================================
+# MEASUREMENT
+# =====================================================
+def driver_pid(driver):
+    # selenium: chromedriver is the service process, Chrome hangs below it
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+
+def proc_mem(p):
+    # RSS counts the pages Chrome's processes share once per process, so a
+    # tree sum overstates it; PSS splits shared pages (Linux), USS drops them
+    try:
+        full = p.memory_full_info()
+        return getattr(full, "pss", None) or full.uss
+    except psutil.AccessDenied:
+        return p.memory_info().rss
+
+
+def tree_mem_mb(pid):
+    if not pid:
+        return 0.0
+    try:
+        root = psutil.Process(pid)
+        procs = [root] + root.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return 0.0
+
+    total = 0
+    for p in procs:
+        try:
+            total += proc_mem(p)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return total / (1024 * 1024)
+
+
+def profile_dir(worker_id):
+    # worker ids restart at 1 every run: with the pid in the name two runs on
+    # one box never share a user-data-dir, which Chrome's profile lock forbids.
+    # Crash restarts in the same process keep cookies, consent and cache
+    sweep_profiles()
+    name = f"worker-{worker_id}-{os.getpid()}"
+    path = os.path.abspath(os.path.join(PROFILE_ROOT, name))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def sweep_profiles():
+    # folders left by runs that died without cleaning up
+    if not os.path.isdir(PROFILE_ROOT):
+        return
+    for name in os.listdir(PROFILE_ROOT):
+        pid = name.rsplit("-", 1)[-1]
+        if pid.isdigit() and not psutil.pid_exists(int(pid)):
+            shutil.rmtree(os.path.join(PROFILE_ROOT, name), ignore_errors=True)
+
+
+def remove_profiles():
+    # this process's folders; the browsers using them must have quit
+    if not os.path.isdir(PROFILE_ROOT):
+        return
+    suffix = f"-{os.getpid()}"
+    for name in os.listdir(PROFILE_ROOT):
+        if name.endswith(suffix):
+            shutil.rmtree(os.path.join(PROFILE_ROOT, name), ignore_errors=True)
+
+# =====================================================
+# RECYCLER
+# =====================================================
+class Recycler:
+    # should_recycle() is called between queries; a background thread keeps
+    # sampling the current driver while a query runs, so a long query that
+    # balloons is caught at its end even if memory drops back before that.
+    # close() once the last driver has quit: stops the sampler, drops profiles
+    def __init__(self, driver=None, max_mem_mb=MAX_MEM_MB, max_leak=MAX_LEAK_MB_PER_MIN,
+                 window=WINDOW, sample_every=SAMPLE_EVERY):
+        self.max_mem_mb = max_mem_mb
+        self.max_leak = max_leak
+        self.window = window
+        self.lock = threading.Lock()
+        self.stop = threading.Event()
+        self.thread = None
+        self.reset(driver)
+        if sample_every:
+            self.thread = threading.Thread(target=self._sampler, args=(sample_every,), daemon=True)
+            self.thread.start()
+
+    def reset(self, driver=None):
+        with self.lock:
+            self.samples = []
+            self.peak = 0.0
+            self.started = time.time()
+        self.pid = driver_pid(driver) if driver is not None else None
+
+    def record(self, mem):
+        with self.lock:
+            self.samples.append((time.time(), mem))
+            del self.samples[:-self.window]
+            self.peak = max(self.peak, mem)
+
+    def watch(self, driver):
+        self.pid = driver_pid(driver)
+
+    def _sampler(self, every):
+        while not self.stop.wait(every):
+            pid = self.pid
+            mem = tree_mem_mb(pid) if pid else 0.0
+            if mem:   # 0 = no driver yet, or it just died
+                self.record(mem)
+
+    def sample(self, driver):
+        self.watch(driver)
+        mem = tree_mem_mb(self.pid)
+        self.record(mem)
+        return mem
+
+    def leak_rate(self):
+        # least-squares slope of memory over the window, in MB per minute
+        with self.lock:
+            samples = list(self.samples)
+        if len(samples) < 3:
+            return 0.0
+        n = len(samples)
+        ts = [t for t, _ in samples]
+        rs = [r for _, r in samples]
+        mt, mr = sum(ts) / n, sum(rs) / n
+        var = sum((t - mt) ** 2 for t in ts)
+        if not var:
+            return 0.0
+        slope = sum((t - mt) * (r - mr) for t, r in zip(ts, rs)) / var
+        return slope * 60
+
+    def should_recycle(self, driver):
+        mem = self.sample(driver)
+        with self.lock:
+            peak, self.peak = self.peak, mem   # peak since the previous check
+            full = len(self.samples) >= self.window
+        if time.time() - self.started < MIN_AGE:
+            return False
+        if peak > self.max_mem_mb:
+            print(f"♻️ Chrome peaked at {peak:.0f} MB > {self.max_mem_mb} MB, recycling")
+            return True
+        rate = self.leak_rate()
+        if full and rate > self.max_leak:
+            print(f"♻️ Chrome growing {rate:.0f} MB/min at {mem:.0f} MB, recycling")
+            return True
+        return False
+
+    def recycle(self, driver, setup_fn, *args, restore_url=True):
+        url = None
+        try:
+            url = driver.current_url
+        except Exception:
+            pass
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+        self.pid = None
+        # a fresh profile: the old one's cache grew along with the browser
+        remove_profiles()
+        driver = setup_fn(*args)
+        self.reset(driver)
+        if restore_url and url and url.startswith("http"):
+            try:
+                driver.get(url)
+            except Exception:
+                pass
+        return driver
+
+    def close(self):
+        self.stop.set()
+        if self.thread:
+            self.thread.join()
+        remove_profiles()
@@ -0,0 +1,346 @@
+import os
+import csv
+import sys
+import time
+import sqlite3
+import hashlib
+from collections import Counter, defaultdict
+from datetime import datetime
+
+import lead_db
+from phone_norm import extract_phones
+from snapshot_archive import place_id_from_url
+
+# =====================================================
+# CONFIG
+# =====================================================
+CHUNK = 5_000             # rows per transaction; memory stays flat whatever the file size
+
+# every historical output column → canonical record key
+FIELD_MAP = {
+    "Brand_Name": "name", "Business Name": "name", "Seller name": "name", "Name": "name", "name": "name",
+    "Phone": "phone", "phone": "phone", "Phones": "phone",
+    "Place_Id": "place_id", "place_id": "place_id",
+    "Maps_Url": "url", "Google": "url", "url": "url",
+    "Category": "category", "category": "category",
+    "Address": "address", "address": "address",
+    "City": "city", "city": "city",
+    "District": "district", "district": "district",
+    "Pincode": "pincode", "pincode": "pincode",
+    "State": "state", "state": "state",
+    "Rating": "rating", "rating": "rating",
+    "Reviews": "reviews", "reviews": "reviews",
+    "Website": "website", "website": "website",
+    "Confidence_Tier": "tier", "tier": "tier",
+    "Source": "source", "source": "source",
+    "Query": "query", "Keyword": "query", "query": "query",
+    "Scraped_At": "scraped_at", "scraped_at": "scraped_at",
+    "Emails": "email", "email": "email",
+}
+
+# hash → place, persisted next to the places it points at so reruns and
+# later consolidations start from what is already there
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dedupe_index (
+    hash INTEGER PRIMARY KEY,
+    place_rowid INTEGER NOT NULL,
+    origin TEXT
+)
+"""
+
+# =====================================================
+# KEYS
+# =====================================================
+def key_hash(key):
+    # 64-bit signed so it fits an INTEGER PRIMARY KEY (the table's rowid)
+    d = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(d, "little", signed=True)
+
+
+def record_keys(rec, phones):
+    keys = []
+    if rec.get("place_id"):
+        keys.append(key_hash(f"pid:{rec['place_id']}"))
+    keys.extend(key_hash(f"ph:{p}") for p in phones)
+    return keys
+
+
+def seed_index(con, origin):
+    # places already in the target db count as the first source
+    con.create_function("key_hash", 1, key_hash, deterministic=True)
+    with con:
+        con.execute(INDEX_SCHEMA)
+        con.execute("""
+            INSERT OR IGNORE INTO dedupe_index
+            SELECT key_hash('pid:' || place_id), id, ? FROM places WHERE place_id IS NOT NULL
+        """, (origin,))
+        con.execute("""
+            INSERT OR IGNORE INTO dedupe_index
+            SELECT key_hash('ph:' || value), place_rowid, ? FROM contacts WHERE kind = 'phone'
+        """, (origin,))
+
+# =====================================================
+# CANONICAL RECORDS
+# =====================================================
+def clean(value):
+    if value is None:
+        return None
+    if isinstance(value, float):
+        if value != value:                 # NaN
+            return None
+        if value.is_integer():             # excel stores phones as floats
+            value = int(value)
+    if isinstance(value, datetime):
+        return value.isoformat(sep="T", timespec="seconds")
+    value = str(value).strip()
+    return value if value and value.lower() not in ("nan", "none", "null") else None
+
+
+def to_number(value, kind):
+    try:
+        return kind(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def canonical(raw, default_source, default_time):
+    rec = {}
+    for col, value in raw.items():
+        key = FIELD_MAP.get(col)
+        if key and rec.get(key) is None:
+            rec[key] = clean(value)
+    if not rec.get("name"):
+        return None
+    if not rec.get("place_id") and rec.get("url"):
+        rec["place_id"] = place_id_from_url(rec["url"])
+    rec["rating"] = to_number(rec.get("rating"), float)
+    rec["reviews"] = to_number(rec.get("reviews"), int)
+    if rec.get("email"):
+        rec["email"] = rec["email"].split(",")[0].strip()
+    rec["source"] = rec.get("source") or default_source
+    rec["scraped_at"] = rec.get("scraped_at") or default_time
+    return rec
+
+# =====================================================
+# READERS (EACH YIELDS LISTS OF RAW DICTS, CHUNK ROWS AT A TIME)
+# =====================================================
+def chunked(rows):
+    batch = []
+    for r in rows:
+        batch.append(r)
+        if len(batch) >= CHUNK:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def read_xlsx(path):
+    import openpyxl
+
+    # read_only streams rows off the zip instead of building the whole sheet
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            rows = ws.iter_rows(values_only=True)
+            header = next(rows, None)
+            if not header:
+                continue
+            header = [str(h).strip() if h is not None else "" for h in header]
+            yield from chunked(dict(zip(header, r)) for r in rows)
+    finally:
+        wb.close()
+
+
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        yield from chunked(csv.DictReader(f))
+
+
+def read_db(path):
+    con = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    tables = {r[0] for r in con.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")}
+    if "places" in tables:
+        # stores older than lead_db v5 have no district / pincode yet
+        cols = {r[1] for r in con.execute("PRAGMA table_info(places)")}
+        geo = ("p.district AS district, p.pincode AS pincode" if "district" in cols
+               else "NULL AS district, NULL AS pincode")
+        sql = f"""
+            SELECT p.name AS name, p.place_id AS place_id, p.category AS category,
+                   p.address AS address, p.city AS city, p.state AS state,
+                   {geo},
+                   p.rating AS rating, p.reviews AS reviews, p.website AS website,
+                   p.tier AS tier, p.source AS source, p.first_seen AS scraped_at,
+                   (SELECT group_concat(c.value, ', ') FROM contacts c
+                    WHERE c.place_rowid = p.id AND +c.kind = 'phone') AS phone
+            FROM places p
+        """
+    elif "leads" in tables:
+        sql = "SELECT name, phone, query, scraped_at, 'Google Maps' AS source FROM leads"
+    else:
+        con.close()
+        return
+    cur = con.execute(sql)
+    cols = [d[0] for d in cur.description]
+    while True:
+        rows = cur.fetchmany(CHUNK)
+        if not rows:
+            break
+        yield [dict(zip(cols, r)) for r in rows]
+    con.close()
+
+
+READERS = {".xlsx": read_xlsx, ".csv": read_csv, ".db": read_db}
+
+# =====================================================
+# CONSOLIDATION
+# =====================================================
+def merge_chunk(con, records, source, counts, overlap, state):
+    with con:
+        for rec in records:
+            phones = extract_phones(rec.get("phone"))
+            rec["phone"] = phones[0] if phones else None
+            keys = record_keys(rec, phones)
+
+            hit = None
+            if keys:
+                found = {h: (rowid, origin) for h, rowid, origin in con.execute(
+                    f"SELECT hash, place_rowid, origin FROM dedupe_index WHERE hash IN ({','.join('?' * len(keys))})",
+                    keys
+                )}
+                # place id outranks phone when they point at different places
+                hit = next((found[k] for k in keys if k in found), None)
+
+            if hit:
+                rec["source"] = None           # the first source to see a place keeps it
+                rowid = lead_db.save_lead(con, rec, rec.get("query"), rowid=hit[0])
+                origin = hit[1]
+            else:
+                rowid = lead_db.save_lead(con, rec, rec.get("query"))
+                # no key match, but lead_db may still match on name + city
+                # (never across two different phones)
+                origin = None if rowid > state["top"] else "name match"
+
+            for p in phones[1:]:
+                lead_db.add_contact(con, rowid, "phone", p, p)
+            con.executemany(
+                "INSERT OR IGNORE INTO dedupe_index VALUES (?, ?, ?)",
+                [(k, rowid, source) for k in keys]
+            )
+
+            if origin is None:
+                counts["new"] += 1
+                state["top"] = rowid
+            else:
+                counts["merged"] += 1
+                overlap[(source, origin)] += 1
+
+
+def save_rows(rows, source, db=lead_db.DB_FILE):
+    # for the live scrapers: their output rows, whatever the column names,
+    # straight into lead_db so delta_export and lead_search see them
+    when = datetime.now().isoformat(timespec="seconds")
+    con = lead_db.connect(db)
+    n = 0
+    try:
+        with con:
+            for raw in rows:
+                rec = canonical(raw, source, when)
+                if rec is None:
+                    continue
+                lead_db.save_lead(con, rec, rec.get("query"))
+                n += 1
+    finally:
+        con.close()
+    return n
+
+
+def consolidate(paths, db=lead_db.DB_FILE):
+    con = lead_db.connect(db)
+    existing = os.path.basename(db)
+    seed_index(con, existing)
+    state = {"top": con.execute("SELECT COALESCE(MAX(id), 0) FROM places").fetchone()[0]}
+
+    report = {}
+    overlap = Counter()
+    t_all = time.perf_counter()
+
+    for path in paths:
+        source = os.path.basename(path)
+        ext = os.path.splitext(path)[1].lower()
+        if ext not in READERS or not os.path.exists(path):
+            print(f"⚠️ Skipping {path}: not found or unsupported")
+            continue
+        if ext == ".db" and os.path.exists(db) and os.path.samefile(path, db):
+            print(f"⚠️ Skipping {path}: it is the target store")
+            continue
+
+        counts = Counter(read=0, skipped=0, new=0, merged=0)
+        when = datetime.fromtimestamp(os.path.getmtime(path)).isoformat(timespec="seconds")
+        t0 = time.perf_counter()
+        for raw in READERS[ext](path):
+            counts["read"] += len(raw)
+            records = []
+            for r in raw:
+                rec = canonical(r, source, when)
+                if rec is None:
+                    counts["skipped"] += 1
+                else:
+                    records.append(rec)
+            merge_chunk(con, records, source, counts, overlap, state)
+
+        dt = time.perf_counter() - t0
+        report[source] = counts
+        print(f"📥 {source}: {counts['read']:,} rows → {counts['new']:,} new, "
+              f"{counts['merged']:,} merged, {counts['skipped']:,} skipped "
+              f"({counts['read'] / max(dt, 1e-9):,.0f} rows/s)")
+
+    total = con.execute("SELECT COUNT(*) FROM places").fetchone()[0]
+    con.close()
+    print_overlap(report, overlap)
+    print(f"🗃️ {total:,} distinct places in {db} after {time.perf_counter() - t_all:.1f}s")
+    return report, overlap
+
+
+def print_overlap(report, overlap):
+    # rows of `source` that turned out to be places first seen in `origin`
+    if not overlap:
+        return
+    by_source = defaultdict(list)
+    for (source, origin), n in overlap.most_common():
+        by_source[source].append((origin, n))
+    print("🔁 Overlap (source → already known from):")
+    for source, hits in by_source.items():
+        read = report.get(source, {}).get("read") or 1
+        print(f"   {source}")
+        for origin, n in hits:
+            label = "itself" if origin == source else origin
+            print(f"      {label:<30} {n:>9,}  ({n / read:.1%})")
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    usage = (
+        "usage: python consolidate.py <file.xlsx|file.csv|leads.db>... [--db target.db]\n"
+        "  e.g. python consolidate.py Trademark_Sellers_All.xlsx Master_Leads.xlsx "
+        "Auto_leads.xlsx out.xlsx old_leads.db"
+    )
+    args = sys.argv[1:]
+    db = lead_db.DB_FILE
+    if "--db" in args:
+        i = args.index("--db")
+        if i + 1 >= len(args):
+            print(usage)
+            return
+        db = args[i + 1]
+        del args[i:i + 2]
+    if not args:
+        print(usage)
+        return
+
+    consolidate(args, db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+import os
+import sys
+import json
+import time
+import uuid
+import threading
+import urllib.request
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# =====================================================
+# CONFIG
+# =====================================================
+HOST = "0.0.0.0"
+PORT = 8765
+STATE_FILE = "coordinator_state.json"
+STAGING_DIR = "coordinator_staging"   # one jsonl per open lease, until it completes
+LEAD_DB = "leads.db"                  # completed leases land here (lead_db.py)
+SOURCE = "Google Maps"                # for leads that do not name their own
+
+LEASE_TIMEOUT = 1800     # seconds a worker may hold a query without renewing
+MAX_ATTEMPTS = 3         # after this many expired leases a query is marked failed
+HEARTBEAT_EVERY = 300    # worker side renew interval
+UPLOAD_EVERY = 20        # leads per /leads batch, so results never pile up in the worker
+COMPLETE_RETRIES = 3     # /complete attempts before the lease is left to expire
+RETRY_WAIT = 10          # seconds, multiplied by the attempt number
+
+# =====================================================
+# STATE (FILE BACKED)
+# =====================================================
+state_lock = threading.Lock()
+state = {"queries": {}, "leases": {}}
+
+
+def load_state():
+    global state
+    if os.path.exists(STATE_FILE):
+        with open(STATE_FILE, encoding="utf-8") as f:
+            state = json.load(f)
+
+
+def save_state():
+    tmp = STATE_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, STATE_FILE)
+
+
+def add_queries(queries):
+    with state_lock:
+        added = 0
+        for q in queries:
+            if q not in state["queries"]:
+                state["queries"][q] = {"status": "pending", "attempts": 0, "leads": 0}
+                added += 1
+        save_state()
+    return added
+
+
+def staging_file(lease_id):
+    return os.path.join(STAGING_DIR, f"{lease_id}.jsonl")
+
+
+def stage(lease_id, leads):
+    os.makedirs(STAGING_DIR, exist_ok=True)
+    with open(staging_file(lease_id), "a", encoding="utf-8") as f:
+        for lead in leads:
+            f.write(json.dumps(lead, ensure_ascii=False) + "\n")
+
+
+def staged(lease_id):
+    path = staging_file(lease_id)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def drop_staged(lease_id):
+    try:
+        os.remove(staging_file(lease_id))
+    except FileNotFoundError:
+        pass
+
+
+def commit_leads(leads):
+    # lead_db matches on Place_Id / phone, so a query scraped twice (a retried
+    # /complete, an overlapping query) still ends up as one place per business
+    import consolidate
+
+    return consolidate.save_rows(leads, SOURCE, LEAD_DB)
+
+
+def reclaim_expired(now):
+    for lease_id, lease in list(state["leases"].items()):
+        if lease["expires_at"] > now:
+            continue
+        q = state["queries"][lease["query"]]
+        q["status"] = "failed" if q["attempts"] >= MAX_ATTEMPTS else "pending"
+        del state["leases"][lease_id]
+        # the next worker scrapes the query from the start
+        drop_staged(lease_id)
+        print(f"⏰ Lease expired: {lease['query']} ({lease['worker']})")
+
+
+def take_lease(worker):
+    now = time.time()
+    with state_lock:
+        reclaim_expired(now)
+        for query, q in state["queries"].items():
+            if q["status"] != "pending":
+                continue
+            lease_id = uuid.uuid4().hex
+            q["status"] = "leased"
+            q["attempts"] += 1
+            state["leases"][lease_id] = {
+                "query": query,
+                "worker": worker,
+                "expires_at": now + LEASE_TIMEOUT,
+            }
+            save_state()
+            return {"lease_id": lease_id, "query": query, "timeout": LEASE_TIMEOUT}
+        save_state()
+        done = not any(q["status"] in ("pending", "leased") for q in state["queries"].values())
+        return {"lease_id": None, "query": None, "done": done}
+
+
+def renew_lease(lease_id):
+    with state_lock:
+        lease = state["leases"].get(lease_id)
+        if not lease:
+            return {"ok": False}
+        lease["expires_at"] = time.time() + LEASE_TIMEOUT
+        save_state()
+        return {"ok": True}
+
+
+def store_leads(lease_id, leads, finish):
+    with state_lock:
+        lease = state["leases"].get(lease_id)
+        if not lease:
+            # expired and handed to someone else; their copy wins
+            return {"ok": False}
+
+        for lead in leads:
+            lead.setdefault("Query", lease["query"])
+
+        q = state["queries"][lease["query"]]
+        if finish:
+            # partial uploads only count once the whole query is in
+            rows = staged(lease_id) + leads
+            commit_leads(rows)
+            q["leads"] += len(rows)
+            q["status"] = "done"
+            del state["leases"][lease_id]
+            drop_staged(lease_id)
+        else:
+            if leads:
+                stage(lease_id, leads)
+            lease["expires_at"] = time.time() + LEASE_TIMEOUT
+        save_state()
+        return {"ok": True}
+
+
+def progress():
+    with state_lock:
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        leads = 0
+        for q in state["queries"].values():
+            counts[q["status"]] += 1
+            leads += q["leads"]
+        workers = sorted({l["worker"] for l in state["leases"].values()})
+        return {"queries": counts, "leads": leads, "active_workers": workers}
+
+# =====================================================
+# HTTP SERVER
+# =====================================================
+class Handler(BaseHTTPRequestHandler):
+    def reply(self, body, code=200):
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/progress":
+            self.reply(progress())
+        else:
+            self.reply({"error": "not found"}, 404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self.reply({"error": "bad json"}, 400)
+
+        if self.path == "/lease":
+            self.reply(take_lease(body.get("worker", "?")))
+        elif self.path == "/renew":
+            self.reply(renew_lease(body.get("lease_id")))
+        elif self.path == "/leads":
+            self.reply(store_leads(body.get("lease_id"), body.get("leads", []), False))
+        elif self.path == "/complete":
+            self.reply(store_leads(body.get("lease_id"), body.get("leads", []), True))
+        elif self.path == "/queries":
+            self.reply({"added": add_queries(body.get("queries", []))})
+        else:
+            self.reply({"error": "not found"}, 404)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def serve(host=HOST, port=PORT):
+    load_state()
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"🛰️ Coordinator on {host}:{port} | {progress()}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+# =====================================================
+# WORKER CLIENT
+# =====================================================
+def call(url, path, body=None):
+    data = json.dumps(body or {}).encode() if body is not None else None
+    req = urllib.request.Request(
+        url.rstrip("/") + path,
+        data=data,
+        headers={"Content-Type": "application/json"},
+        method="POST" if data is not None else "GET",
+    )
+    with urllib.request.urlopen(req, timeout=30) as r:
+        return json.loads(r.read())
+
+
+def lease(url, worker):
+    return call(url, "/lease", {"worker": worker})
+
+
+def upload(url, lease_id, leads):
+    return call(url, "/leads", {"lease_id": lease_id, "leads": leads})
+
+
+def complete(url, lease_id, leads):
+    return call(url, "/complete", {"lease_id": lease_id, "leads": leads})
+
+
+def heartbeat(url, lease_id, stop):
+    # keeps a lease alive while a long query is being scraped
+    while not stop.wait(HEARTBEAT_EVERY):
+        try:
+            call(url, "/renew", {"lease_id": lease_id})
+        except (OSError, ValueError):
+            pass
+
+
+def iter_leases(url, worker, idle_wait=30):
+    # yields (lease_id, query) until the coordinator says everything is done
+    while True:
+        try:
+            got = lease(url, worker)
+        except (OSError, ValueError):    # URLError is an OSError; ValueError = bad reply
+            time.sleep(idle_wait)
+            continue
+        if got["query"]:
+            yield got["lease_id"], got["query"]
+        elif got.get("done"):
+            return
+        else:
+            time.sleep(idle_wait)   # others still hold leases that may expire
+
+class CoordinatorError(Exception):
+    pass
+
+
+class LeaseLost(CoordinatorError):
+    # the coordinator answered ok: False; the query now belongs to another worker
+    pass
+
+
+class LeaseUploader:
+    # list-like sink for scrape_query: every `batch` leads go out over /leads,
+    # the remainder with /complete. "_" fields stay local; on_sent(leads) runs
+    # once the coordinator has accepted them
+    def __init__(self, url, lease_id, batch=UPLOAD_EVERY, on_sent=None):
+        self.url = url
+        self.lease_id = lease_id
+        self.batch = batch
+        self.on_sent = on_sent
+        self.pending = []
+        self.sent = 0
+        self.next_try = batch
+
+    def __len__(self):
+        return self.sent + len(self.pending)
+
+    def append(self, lead):
+        self.pending.append(lead)
+        if len(self.pending) >= self.next_try:
+            self.upload()
+
+    def outgoing(self):
+        return [{k: v for k, v in lead.items() if not k.startswith("_")} for lead in self.pending]
+
+    def accepted(self):
+        sent, self.pending = self.pending, []
+        self.sent += len(sent)
+        if self.on_sent:
+            self.on_sent(sent)
+
+    def upload(self):
+        try:
+            got = upload(self.url, self.lease_id, self.outgoing())
+        except (OSError, ValueError) as e:
+            # keep the batch and try again once another batch has built up
+            self.next_try = len(self.pending) + self.batch
+            print(f"⚠️ Upload failed, {len(self.pending)} leads kept for retry: {e}")
+            return
+        if not got.get("ok"):
+            raise LeaseLost(self.lease_id)
+        self.accepted()
+        self.next_try = self.batch
+
+    def finish(self):
+        for attempt in range(1, COMPLETE_RETRIES + 1):
+            try:
+                got = complete(self.url, self.lease_id, self.outgoing())
+                break
+            except (OSError, ValueError) as e:
+                if attempt == COMPLETE_RETRIES:
+                    raise CoordinatorError(f"complete failed after {attempt} attempts: {e}")
+                time.sleep(RETRY_WAIT * attempt)
+        if not got.get("ok"):
+            raise LeaseLost(self.lease_id)
+        self.accepted()
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    usage = "usage: python coordinator.py serve | seed <queries.txt> | progress [url]"
+    if len(sys.argv) < 2:
+        print(usage)
+        return
+
+    cmd = sys.argv[1]
+    if cmd == "serve":
+        serve()
+    elif cmd == "seed" and len(sys.argv) > 2:
+        load_state()
+        with open(sys.argv[2], encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+        print(f"🌱 Added {add_queries(queries)} queries")
+    elif cmd == "progress":
+        url = sys.argv[2] if len(sys.argv) > 2 else f"http://127.0.0.1:{PORT}"
+        print(json.dumps(call(url, "/progress"), indent=2))
+    else:
+        print(usage)
+
+
+if __name__ == "__main__":
+    main()
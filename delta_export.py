@@ -0,0 +1,187 @@
+import os
+import csv
+import sys
+import json
+import time
+from datetime import datetime
+
+import lead_db
+
+# =====================================================
+# CONFIG
+# =====================================================
+EXPORT_DIR = "exports"
+FETCH = 10_000            # rows pulled from SQLite at a time
+ROW_CAP = 1_000_000       # data rows per xlsx sheet, the rest rolls over
+
+COLUMNS = [
+    "Change", "Brand_Name", "Phone", "Category", "Address", "City", "State",
+    "Rating", "Reviews", "Website", "Confidence_Tier", "Place_Id",
+    "First_Seen", "Last_Seen", "Version",
+]
+WIDTHS = [8, 34, 16, 22, 48, 14, 14, 7, 8, 30, 15, 24, 20, 20, 8]
+
+DELTA_SQL = """
+    SELECT CASE WHEN p.created_version > :since THEN 'new' ELSE 'changed' END,
+           p.name,
+           (SELECT group_concat(c.value, ', ') FROM contacts c
+            WHERE c.place_rowid = p.id AND +c.kind = 'phone'),
+           p.category, p.address, p.city, p.state, p.rating, p.reviews,
+           p.website, p.tier, p.place_id, p.first_seen, p.last_seen, p.version
+    FROM places p
+    WHERE p.version > :since AND p.version <= :upto
+    ORDER BY p.version
+"""
+
+# =====================================================
+# CURSORS
+# =====================================================
+def get_cursor(con, consumer):
+    row = con.execute(
+        "SELECT version FROM export_cursors WHERE consumer = ?", (consumer,)
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def set_cursor(con, consumer, version, rows):
+    with con:
+        con.execute(
+            "INSERT OR REPLACE INTO export_cursors VALUES (?, ?, ?, ?)",
+            (consumer, version, datetime.now().isoformat(timespec="seconds"), rows)
+        )
+
+
+def head(con):
+    return con.execute("SELECT value FROM change_seq WHERE id = 1").fetchone()[0]
+
+# =====================================================
+# WRITERS (ALL STREAMING, ONE FETCH BATCH IN MEMORY)
+# =====================================================
+def write_csv(path, batches):
+    n = 0
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        w = csv.writer(f)
+        w.writerow(COLUMNS)
+        for rows in batches:
+            w.writerows(rows)
+            n += len(rows)
+    return n
+
+
+def write_jsonl(path, batches):
+    n = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for rows in batches:
+            for r in rows:
+                f.write(json.dumps(dict(zip(COLUMNS, r)), ensure_ascii=False) + "\n")
+            n += len(rows)
+    return n
+
+
+def write_xlsx(path, batches):
+    from excel_export import XlsxStream
+
+    book = XlsxStream(path, COLUMNS, WIDTHS)
+    n, room, sheet = 0, 0, 0
+    try:
+        for rows in batches:
+            while rows:
+                if room == 0:
+                    sheet += 1
+                    book.add_sheet("Delta" if sheet == 1 else f"Delta ({sheet})")
+                    room = ROW_CAP
+                take, rows = rows[:room], rows[room:]
+                book.write(take)
+                room -= len(take)
+                n += len(take)
+        if sheet == 0:
+            book.add_sheet("Delta")
+    finally:
+        book.close()
+    return n
+
+
+WRITERS = {"csv": write_csv, "jsonl": write_jsonl, "xlsx": write_xlsx}
+
+# =====================================================
+# EXPORT
+# =====================================================
+def export(consumer, fmt="csv", path=None, db=lead_db.DB_FILE, full=False):
+    if fmt not in WRITERS:
+        raise ValueError(f"format must be one of {sorted(WRITERS)}")
+
+    con = lead_db.connect(db)
+    since = 0 if full else get_cursor(con, consumer)
+    upto = head(con)           # rows changing while we export go in the next delta
+    if upto <= since:
+        print(f"✅ {consumer}: nothing new since version {since}")
+        con.close()
+        return None, 0
+
+    if path is None:
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(EXPORT_DIR, f"{consumer}_{stamp}.{fmt}")
+
+    def batches():
+        cur = con.execute(DELTA_SQL, {"since": since, "upto": upto})
+        while True:
+            rows = cur.fetchmany(FETCH)
+            if not rows:
+                return
+            yield rows
+
+    t0 = time.perf_counter()
+    root, ext = os.path.splitext(path)
+    tmp = root + ".part" + ext
+    n = WRITERS[fmt](tmp, batches())
+    os.replace(tmp, path)
+    # the cursor only moves once the file is safely on disk
+    set_cursor(con, consumer, upto, n)
+    con.close()
+
+    print(f"📤 {consumer}: {n} new/changed leads (v{since} → v{upto}) → {path} "
+          f"in {time.perf_counter() - t0:.2f}s")
+    return path, n
+
+
+def status(db=lead_db.DB_FILE):
+    con = lead_db.connect(db)
+    top = head(con)
+    rows = con.execute("SELECT consumer, version, exported_at, rows FROM export_cursors").fetchall()
+    for consumer, version, at, n in rows:
+        pending = con.execute(
+            "SELECT COUNT(*) FROM places WHERE version > ?", (version,)
+        ).fetchone()[0]
+        print(f"   {consumer:<15} v{version} at {at} ({n} rows) → {pending} pending")
+    print(f"📈 Store at version {top}")
+    con.close()
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    usage = (
+        "usage: python delta_export.py export <consumer> [csv|jsonl|xlsx] [path]\n"
+        "       python delta_export.py full <consumer> [csv|jsonl|xlsx] [path]\n"
+        "       python delta_export.py status\n"
+        "  reads leads.db, which trade_scraper, test, test2, mac_scrapV1/V2 and consolidate.py write"
+    )
+    args = sys.argv[1:]
+    if not args:
+        print(usage)
+        return
+
+    cmd = args[0]
+    if cmd in ("export", "full") and len(args) > 1:
+        fmt = args[2] if len(args) > 2 else "csv"
+        path = args[3] if len(args) > 3 else None
+        export(args[1], fmt, path, full=(cmd == "full"))
+    elif cmd == "status":
+        status()
+    else:
+        print(usage)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import time
+from collections import deque
+
+# =====================================================
+# CONFIG
+# =====================================================
+TABS = 4                 # detail pages loading at once in the one browser
+DETAIL_TIMEOUT = 15      # seconds a tab may take before its place is retried
+DETAIL_RETRIES = 1       # extra attempts for a place that timed out
+POLL = 0.2               # pause when no tab was ready in a full sweep
+SCROLL_PAUSE = 2
+MAX_IDLE_SCROLLS = 3     # feed stops growing this many times → done
+
+FEED_JS = """
+    const feed = document.querySelector('div[role="feed"]');
+    if (feed) feed.scrollTop = feed.scrollHeight;
+"""
+
+# navigate without blocking the WebDriver session; the flag lives on the
+# old document, so it disappears as soon as the new one replaces it
+NAVIGATE_JS = "window.__stale = true; window.location.href = arguments[0];"
+STALE_JS = "return window.__stale === true;"
+
+# =====================================================
+# FEED → PLACE URLS
+# =====================================================
+def collect_place_urls(driver, selectors, limit=None):
+    # card anchors (a.hfpxzc) carry the place URL, no click needed
+    urls, seen = [], set()
+    idle = 0
+    while idle < MAX_IDLE_SCROLLS:
+        before = len(urls)
+        for a in selectors.find_all(driver, "card_link"):
+            try:
+                href = a.get_attribute("href")
+            except Exception:
+                continue
+            if href and href not in seen:
+                seen.add(href)
+                urls.append(href)
+        if limit and len(urls) >= limit:
+            return urls[:limit]
+
+        idle = idle + 1 if len(urls) == before else 0
+        driver.execute_script(FEED_JS)
+        time.sleep(SCROLL_PAUSE)
+    return urls
+
+# =====================================================
+# TABS
+# =====================================================
+def open_tabs(driver, n):
+    first = driver.current_window_handle
+    handles = [first]
+    for _ in range(n - 1):
+        driver.switch_to.new_window("tab")
+        handles.append(driver.current_window_handle)
+    driver.switch_to.window(first)
+    return handles
+
+
+def close_tabs(driver, handles):
+    for h in handles[1:]:
+        try:
+            driver.switch_to.window(h)
+            driver.close()
+        except Exception:
+            pass
+    driver.switch_to.window(handles[0])
+
+
+def fetch_details(driver, urls, parse_fn, ready_fn, tabs=TABS, timeout=DETAIL_TIMEOUT,
+                  retries=DETAIL_RETRIES):
+    # one WebDriver session runs one command at a time, but the pages load
+    # in parallel: start a navigation in every tab, then sweep the tabs and
+    # parse whichever has finished. yields parse_fn(driver, url) in url order
+    # (None for places that failed to parse or timed out on every attempt,
+    # each of which is logged)
+    if not urls:
+        return
+    handles = open_tabs(driver, min(tabs, len(urls)))
+    busy = {}            # handle → (index, url, started)
+    done = {}            # index → result, waiting for earlier ones
+    todo = deque(range(len(urls)))
+    attempts = {}        # index → navigations started
+    next_out = 0
+
+    def start(handle):
+        if not todo:
+            return
+        i = todo.popleft()
+        attempts[i] = attempts.get(i, 0) + 1
+        driver.switch_to.window(handle)
+        driver.execute_script(NAVIGATE_JS, urls[i])
+        busy[handle] = (i, urls[i], time.time())
+
+    try:
+        for h in handles:
+            start(h)
+
+        while busy:
+            progressed = False
+            for h in list(busy):
+                i, url, started = busy[h]
+                driver.switch_to.window(h)
+                try:
+                    loaded = not driver.execute_script(STALE_JS) and ready_fn(driver)
+                except Exception:
+                    loaded = False
+
+                if loaded:
+                    try:
+                        done[i] = parse_fn(driver, url)
+                    except Exception as e:
+                        print(f"⚠️ Could not parse {url}: {e}")
+                        done[i] = None
+                elif time.time() - started > timeout:
+                    if attempts[i] <= retries:
+                        # front of the queue: output waits on this index
+                        todo.appendleft(i)
+                    else:
+                        print(f"⚠️ Gave up on {url} after {attempts[i]} timeouts")
+                        done[i] = None
+                else:
+                    continue
+
+                del busy[h]
+                start(h)
+                progressed = True
+
+            while next_out in done:
+                yield done.pop(next_out)
+                next_out += 1
+
+            if not progressed:
+                time.sleep(POLL)
+    finally:
+        close_tabs(driver, handles)
@@ -0,0 +1,215 @@
+import re
+import sys
+import json
+from collections import defaultdict
+from itertools import combinations
+
+import pandas as pd
+
+from phone_norm import normalize_series
+
+# =====================================================
+# CONFIG
+# =====================================================
+MATCH_SCORE = 0.8        # shared share of the longer name needed to merge two names
+MIN_COMMON = 2           # distinctive tokens two names must share before they are compared
+MAX_BLOCK = 200          # blocks bigger than this are too generic to compare
+NAME_COLUMNS = ["Business Name", "Brand_Name", "Seller name", "Name"]
+
+# words that say nothing about which business it is
+STOPWORDS = {
+    "the", "and", "of", "in", "pvt", "private", "ltd", "limited", "llp",
+    "co", "company", "agency", "agencies", "enterprise", "enterprises",
+    "traders", "trading", "dealer", "dealers", "store", "stores", "shop",
+    "centre", "center", "sales", "service", "services", "authorized",
+    "authorised", "showroom", "mart", "house",
+}
+
+# only legal form and filler: "Sharma Traders" and "Sharma Traders Pvt Ltd"
+# are the same name, "Sharma Traders" and "Sharma Agencies" are not
+NOISE = {"the", "and", "of", "in", "pvt", "private", "ltd", "limited", "llp", "co", "company", "ms"}
+
+# what a business sells, not which business it is (stemmed like name_tokens)
+TRADE_WORDS = {
+    "tyre", "tire", "battery", "batterie", "wheel", "motor", "auto", "automobile",
+    "part", "spare", "accessorie", "hardware", "electrical", "electronic",
+    "mobile", "tool", "machinery", "steel", "paint", "lubricant", "oil",
+}
+
+# =====================================================
+# NAME / KEY NORMALIZATION
+# =====================================================
+def name_tokens(name):
+    words = re.findall(r"[a-z0-9]+", str(name).lower())
+    out = set()
+    for w in words:
+        if w in STOPWORDS or len(w) < 2:
+            continue
+        # tyres / tyre, motors / motor
+        out.add(w[:-1] if len(w) > 3 and w.endswith("s") else w)
+    return frozenset(out)
+
+
+def name_key(name):
+    # order-free key for exact matching (seen-index, lead db)
+    tokens = name_tokens(name)
+    if tokens:
+        return " ".join(sorted(tokens))
+    return re.sub(r"[^a-z0-9]+", " ", str(name).lower()).strip()
+
+
+def distinctive(tokens):
+    return tokens - TRADE_WORDS
+
+
+def exact_key(name):
+    # the whole name minus legal form; equal keys in one city are one business
+    words = [w for w in re.findall(r"[a-z0-9]+", str(name).lower()) if w not in NOISE]
+    return " ".join(w[:-1] if len(w) > 3 and w.endswith("s") else w for w in words)
+
+
+def name_score(a, b):
+    # a, b: distinctive tokens. One shared word ("Sharma", "Jain") is a
+    # surname or a place, not a match, and every extra word counts against
+    # it, so "Jain Tyres" never absorbs "Jain Tyres and Batteries Wheels"
+    if not a or not b:
+        return 0.0
+    common = len(a & b)
+    if common < MIN_COMMON:
+        return 0.0
+    return common / max(len(a), len(b))
+
+
+def pick_name_column(df):
+    for col in NAME_COLUMNS:
+        if col in df.columns:
+            return col
+    raise KeyError(f"no name column in {list(df.columns)}")
+
+# =====================================================
+# UNION FIND
+# =====================================================
+def find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def union(parent, a, b):
+    ra, rb = find(parent, a), find(parent, b)
+    if ra != rb:
+        parent[max(ra, rb)] = min(ra, rb)
+
+
+def union_checked(parent, root_phones, a, b):
+    # names never merge two entities that each have a phone and share none,
+    # not even through a record without a phone in between
+    ra, rb = find(parent, a), find(parent, b)
+    if ra == rb:
+        return True
+    pa, pb = root_phones[ra], root_phones[rb]
+    if pa and pb and not pa & pb:
+        return False
+    union(parent, ra, rb)
+    root_phones[min(ra, rb)] = pa | pb
+    return True
+
+# =====================================================
+# RESOLUTION
+# =====================================================
+def build_blocks(phones, cities, tokens, keys):
+    blocks = defaultdict(list)
+    for i, (phone, city, toks, key) in enumerate(zip(phones, cities, tokens, keys)):
+        if isinstance(phone, str):
+            blocks["p:" + phone].append(i)
+        if key:
+            blocks[f"k:{city}|{key}"].append(i)
+        for t in toks:
+            blocks[f"n:{city}|{t}"].append(i)
+    # phones first, so every name merge sees each entity's phones
+    return sorted(blocks.items(), key=lambda kv: not kv[0].startswith("p:"))
+
+
+def cluster(df, name_col):
+    phones = normalize_series(df["Phone"]) if "Phone" in df.columns else pd.Series(pd.NA, index=df.index)
+    cities = df["City"].fillna("").astype(str).str.strip().str.lower() if "City" in df.columns else pd.Series("", index=df.index)
+    names = df[name_col].fillna("")
+    tokens = [distinctive(name_tokens(n)) for n in names]
+    keys = [exact_key(n) for n in names]
+    phones = phones.tolist()
+    cities = cities.tolist()
+
+    parent = list(range(len(df)))
+    root_phones = [{p} if isinstance(p, str) else set() for p in phones]
+    compared = 0
+
+    for key, members in build_blocks(phones, cities, tokens, keys):
+        if len(members) < 2:
+            continue
+        if key.startswith("p:"):
+            # same normalized phone is the same business
+            for m in members[1:]:
+                union_checked(parent, root_phones, members[0], m)
+            continue
+        if key.startswith("k:"):
+            for m in members[1:]:
+                union_checked(parent, root_phones, members[0], m)
+            continue
+        if len(members) > MAX_BLOCK:
+            continue
+        for a, b in combinations(members, 2):
+            if find(parent, a) == find(parent, b):
+                continue
+            compared += 1
+            if name_score(tokens[a], tokens[b]) >= MATCH_SCORE:
+                union_checked(parent, root_phones, a, b)
+
+    return [find(parent, i) for i in range(len(df))], phones, compared
+
+
+def resolve(df):
+    df = df.reset_index(drop=True)
+    name_col = pick_name_column(df)
+    roots, phones, compared = cluster(df, name_col)
+
+    df["Entity_Id"] = roots
+    df["Phone_E164"] = phones
+    if "Source" not in df.columns:
+        df["Source"] = ""
+
+    merged = []
+    for root, group in df.groupby("Entity_Id", sort=False):
+        names = group[name_col].fillna("").astype(str)
+        phones_ = [p for p in dict.fromkeys(group["Phone_E164"]) if isinstance(p, str)]
+        row = group.iloc[0].to_dict()
+        row[name_col] = names.loc[names.str.len().idxmax()]
+        row["Phone"] = phones_[0] if phones_ else row.get("Phone", "")
+        row["Phone_Extra"] = ", ".join(phones_[1:])
+        row["Sources"] = ", ".join(sorted(set(group["Source"].fillna("").astype(str)) - {""}))
+        row["Provenance"] = json.dumps([
+            {"source": r["Source"], "name": r[name_col], "phone": r["Phone_E164"]}
+            for r in group[["Source", name_col, "Phone_E164"]].to_dict("records")
+        ], ensure_ascii=False, default=str)
+        row["Records"] = len(group)
+        merged.append(row)
+
+    out = pd.DataFrame(merged).drop(columns=["Entity_Id", "Phone_E164"])
+    return out, compared
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    if len(sys.argv) < 3:
+        print("usage: python entity_resolve.py <input.xlsx> <output.xlsx>")
+        return
+
+    df = pd.read_excel(sys.argv[1])
+    out, compared = resolve(df)
+    out.to_excel(sys.argv[2], index=False)
+    print(f"🧩 {len(df)} records → {len(out)} entities ({compared} name comparisons)")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,14 +5,18 @@ import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
 from webdriver_manager.chrome import ChromeDriverManager
 
+import gmaps_fetch
+from browser_recycler import Recycler, profile_dir
+from blocklist import is_blocked
+
 # ---------------- CONFIG ----------------
 INPUT_FILE = "sample.xlsx"
 OUTPUT_FILE = "out.xlsx"
 BLOCKED_NUMBER = "9999999776"
-RESTART_AFTER = 50
+RESTART_AFTER = None  # fixed-row restarts; None = recycle on measured Chrome memory
+FETCH_MODE = "http"   # "http" = plain fetch first, "browser" = always Chrome
 
 
 # ---------------- DRIVER ----------------
@@ -20,6 +24,7 @@ def setup_driver():
     options = Options()
     options.add_argument("--start-maximized")
     options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument(f"--user-data-dir={profile_dir('exc_scraper')}")
     return webdriver.Chrome(
         service=Service(ChromeDriverManager().install()),
         options=options
@@ -35,7 +40,7 @@ def clean_phone(text):
     if not text:
         return None
     phone = re.sub(r"[^\d]", "", text)
-    if BLOCKED_NUMBER in phone:
+    if BLOCKED_NUMBER in phone or is_blocked(phone):
         return None
     if len(phone) < 10:
         return None
@@ -45,29 +50,20 @@ def clean_phone(text):
 # ---------------- GOOGLE MAPS SCRAPER ----------------
 def get_phone_google_maps(driver, url):
     if not isinstance(url, str) or not url.startswith("http"):
-        return None
-
-    try:
-        driver.get(url)
-        random_sleep(4, 6)
-
-        driver.execute_script("window.scrollBy(0,600)")
-        random_sleep(2, 3)
-
-        elements = driver.find_elements(
-            By.XPATH,
-            "//button[contains(@aria-label,'Phone')] | //a[starts-with(@href,'tel:')]"
-        )
-
-        for el in elements:
-            phone = clean_phone(el.text or el.get_attribute("href"))
-            if phone:
-                return phone
+        return None, ""
 
-    except Exception:
-        pass
+    if FETCH_MODE == "http":
+        # place data is embedded in the initial HTML, Chrome only on parse failure
+        place = gmaps_fetch.fetch_place(url, driver)
+    else:
+        try:
+            place = gmaps_fetch.browser_place(driver, url)
+        except Exception:
+            place = None
 
-    return None
+    if not place:
+        return None, ""
+    return clean_phone(place["phone"]), place["address"]
 
 
 # ---------------- SAVE SAFE ----------------
@@ -82,6 +78,7 @@ def main():
     results = []
 
     driver = setup_driver()
+    recycler = Recycler(driver)
 
     try:
         for idx, row in df.iterrows():
@@ -92,7 +89,7 @@ def main():
 
             print(f"\n[{idx+1}] {name} - {city}")
 
-            phone = get_phone_google_maps(driver, gmap)
+            phone, address = get_phone_google_maps(driver, gmap)
 
             if phone:
                 print(f"  ✔ Found: {phone}")
@@ -100,7 +97,8 @@ def main():
                     "Seller name": name,
                     "City": city,
                     "State": state,
-                    "Phone": phone
+                    "Phone": phone,
+                    "Address": address
                 })
                 save_progress(results)
             else:
@@ -108,15 +106,21 @@ def main():
 
             random_sleep(5, 9)
 
-            # Restart browser to avoid detection
-            if (idx + 1) % RESTART_AFTER == 0:
+            # Restart browser to avoid detection / when Chrome has bloated
+            if RESTART_AFTER and (idx + 1) % RESTART_AFTER == 0:
                 driver.quit()
                 random_sleep(10, 15)
                 driver = setup_driver()
+                recycler.reset(driver)
+            elif recycler.should_recycle(driver):
+                driver = recycler.recycle(driver, setup_driver, restore_url=False)
 
     finally:
         save_progress(results)
         driver.quit()
+        recycler.close()
+        if FETCH_MODE == "http":
+            print(f"📊 Maps hit rate: {gmaps_fetch.hit_rate()}")
 
 
 if __name__ == "__main__":
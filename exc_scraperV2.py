@@ -8,6 +8,9 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from webdriver_manager.chrome import ChromeDriverManager
 
+import jd_fetch
+from blocklist import is_blocked
+
 # ---------------- CONFIG ----------------
 INPUT_FILE = "sample.xlsx"
 OUTPUT_FILE = "out.xlsx"
@@ -35,39 +38,16 @@ def clean_phone(text):
     if not text:
         return None
     phone = re.sub(r"[^\d]", "", text)
-    if BLOCKED_NUMBER in phone:
+    if BLOCKED_NUMBER in phone or is_blocked(phone):
         return None
     if len(phone) < 10:
         return None
     return phone
 
 def get_phone_justdial(driver, url):
-    if not isinstance(url, str) or not url.startswith("http"):
-        return None
-
-    try:
-        driver.get(url)
-        random_sleep(5, 8)
-
-        # Scroll to load content
-        driver.execute_script("window.scrollBy(0,800)")
-        random_sleep(2, 3)
-
-        # Common Justdial phone containers
-        elements = driver.find_elements(
-            By.XPATH,
-            "//a[contains(@href,'tel:')] | //span[contains(@class,'callcontent')]"
-        )
-
-        for el in elements:
-            phone = clean_phone(el.text or el.get_attribute("href"))
-            if phone:
-                return phone
-
-    except Exception:
-        pass
-
-    return None
+    # plain HTTP first, Chrome only if the page is blocked or JS-only
+    phone = jd_fetch.fetch_phone(url, driver)
+    return clean_phone(phone)
 
 # ---------------- GOOGLE MAPS SCRAPER ----------------
 def get_phone_google_maps(driver, url):
@@ -157,6 +137,7 @@ def main():
     finally:
         save_progress(results)
         driver.quit()
+        print(f"📊 Justdial hit rate: {jd_fetch.hit_rate()}")
 
 
 if __name__ == "__main__":
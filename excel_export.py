@@ -0,0 +1,388 @@
+import os
+import re
+import sys
+import gzip
+import time
+import shutil
+import sqlite3
+import zipfile
+import tempfile
+from datetime import datetime
+from xml.sax.saxutils import quoteattr
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import lead_db
+
+# =====================================================
+# CONFIG
+# =====================================================
+EXPORT_DIR = "exports"
+ROW_CAP = 1_000_000        # data rows per sheet; excel stops at 1,048,576 incl. header
+FETCH = 10_000             # rows pulled from SQLite at a time
+WORKERS = os.cpu_count() or 2
+PIECE = 50_000             # rows rendered per pool task; big partitions are spread over many
+COPY_CHUNK = 1 << 20       # bytes per copy from a rendered piece into its workbook
+
+COLUMNS = [
+    "Brand_Name", "Phone", "Category", "Address", "City", "District", "State", "Pincode",
+    "Rating", "Reviews", "Website", "Confidence_Tier", "Place_Id", "Source",
+    "First_Seen", "Last_Seen",
+]
+WIDTHS = [34, 16, 22, 48, 14, 16, 14, 8, 7, 8, 30, 15, 24, 16, 20, 20]
+
+SELECT = """
+    SELECT p.name,
+           (SELECT group_concat(c.value, ', ') FROM contacts c
+            WHERE c.place_rowid = p.id AND +c.kind = 'phone'),
+           p.category, p.address, p.city, p.district, p.state, p.pincode, p.rating, p.reviews,
+           p.website, p.tier, p.place_id, p.source, p.first_seen, p.last_seen
+    FROM places p
+"""
+
+# what a sheet / file may be split by → places column
+PARTITION_BY = {"State": "state", "District": "district", "City": "city", "Confidence_Tier": "tier"}
+UNKNOWN = "Unknown"
+
+# =====================================================
+# STREAMING XLSX WRITER
+# =====================================================
+# xlsxwriter's constant_memory mode keeps memory flat but spends ~12 µs a
+# cell on type dispatch (≈6k rows/s at 14 columns). an xlsx is just a zip of
+# XML parts, so rows are rendered straight into the sheet entry as inline
+# strings: one row of XML at a time, nothing kept per row or per string
+NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+NS_R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_PKG = "http://schemas.openxmlformats.org/package/2006"
+CT = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+
+# & < > escaped, control characters XML 1.0 cannot carry dropped; most
+# values need neither, and the regex check is far cheaper than translate()
+ESCAPE = {ord("&"): "&amp;", ord("<"): "&lt;", ord(">"): "&gt;"}
+ESCAPE.update({c: None for c in range(32) if c not in (9, 10, 13)})
+NEEDS_ESCAPE = re.compile(r"[&<>\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+STYLES = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<styleSheet xmlns="{NS}">
+<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font><font><b/><sz val="11"/><name val="Calibri"/></font></fonts>
+<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>
+<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>
+<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>
+<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/><xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>
+<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>
+</styleSheet>"""
+
+
+def row_xml(row):
+    cells = []
+    for v in row:
+        if v is None:
+            cells.append("<c/>")
+        elif isinstance(v, str):
+            if NEEDS_ESCAPE.search(v):
+                v = v.translate(ESCAPE)
+            cells.append(f'<c t="inlineStr"><is><t>{v}</t></is></c>')
+        elif v == v:                                   # NaN has no xlsx form
+            cells.append(f"<c><v>{v}</v></c>")
+        else:
+            cells.append("<c/>")
+    return "<row>" + "".join(cells) + "</row>"
+
+
+class XlsxStream:
+    def __init__(self, path, columns=COLUMNS, widths=WIDTHS):
+        self.zf = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=1)
+        self.columns = columns
+        self.widths = widths
+        self.sheets = []
+        self.fh = None
+
+    def add_sheet(self, title):
+        self.end_sheet()
+        # excel refuses two sheets whose names differ only in case
+        taken = {s.lower() for s in self.sheets}
+        base, i = title, 2
+        while title.lower() in taken:
+            title = f"{base[:27]} ~{i}"
+            i += 1
+        self.sheets.append(title)
+        self.fh = self.zf.open(f"xl/worksheets/sheet{len(self.sheets)}.xml", "w", force_zip64=True)
+        cols = "".join(
+            f'<col min="{i}" max="{i}" width="{w}" customWidth="1"/>' for i, w in enumerate(self.widths, 1)
+        )
+        header = "".join(
+            f'<c t="inlineStr" s="1"><is><t>{c}</t></is></c>' for c in self.columns
+        )
+        self.fh.write((
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<worksheet xmlns="{NS}">'
+            '<sheetViews><sheetView workbookViewId="0">'
+            '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+            f'</sheetView></sheetViews><cols>{cols}</cols><sheetData><row>{header}</row>'
+        ).encode("utf-8"))
+
+    def write(self, rows):
+        self.fh.write("".join(map(row_xml, rows)).encode("utf-8"))
+
+    def end_sheet(self):
+        if self.fh is not None:
+            self.fh.write(b"</sheetData></worksheet>")
+            self.fh.close()
+            self.fh = None
+
+    def close(self):
+        self.end_sheet()
+        n = len(self.sheets)
+        head = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        self.zf.writestr("[Content_Types].xml", head + (
+            f'<Types xmlns="{NS_PKG}/content-types">'
+            f'<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            f'<Override PartName="/xl/workbook.xml" ContentType="{CT}.sheet.main+xml"/>'
+            f'<Override PartName="/xl/styles.xml" ContentType="{CT}.styles+xml"/>'
+            + "".join(
+                f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="{CT}.worksheet+xml"/>'
+                for i in range(1, n + 1)
+            ) + "</Types>"
+        ))
+        self.zf.writestr("_rels/.rels", head + (
+            f'<Relationships xmlns="{NS_PKG}/relationships">'
+            f'<Relationship Id="rId1" Type="{NS_R}/officeDocument" Target="xl/workbook.xml"/>'
+            "</Relationships>"
+        ))
+        self.zf.writestr("xl/workbook.xml", head + (
+            f'<workbook xmlns="{NS}" xmlns:r="{NS_R}"><sheets>'
+            + "".join(
+                f'<sheet name={quoteattr(t)} sheetId="{i}" r:id="rId{i}"/>'
+                for i, t in enumerate(self.sheets, 1)
+            ) + "</sheets></workbook>"
+        ))
+        self.zf.writestr("xl/_rels/workbook.xml.rels", head + (
+            f'<Relationships xmlns="{NS_PKG}/relationships">'
+            + "".join(
+                f'<Relationship Id="rId{i}" Type="{NS_R}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+                for i in range(1, n + 1)
+            )
+            + f'<Relationship Id="rId{n + 1}" Type="{NS_R}/styles" Target="styles.xml"/>'
+            "</Relationships>"
+        ))
+        self.zf.writestr("xl/styles.xml", STYLES)
+        self.zf.close()
+
+# =====================================================
+# PARTITIONS
+# =====================================================
+def plan(con, by=None, cap=ROW_CAP):
+    # → [(label, where, args, rows)]; one entry per file (or per sheet in sheets mode)
+    if by is None:
+        # row cap only: split on id boundaries so every part is its own range scan
+        total = con.execute("SELECT COUNT(*) FROM places").fetchone()[0]
+        bounds = [con.execute(
+            "SELECT id FROM places ORDER BY id LIMIT 1 OFFSET ?", (i,)
+        ).fetchone()[0] for i in range(0, total, cap)]
+        parts = []
+        for n, lo in enumerate(bounds):
+            hi = bounds[n + 1] if n + 1 < len(bounds) else None
+            where = "p.id >= ?" + (" AND p.id < ?" if hi is not None else "")
+            args = [lo] + ([hi] if hi is not None else [])
+            rows = min(cap, total - n * cap)
+            parts.append((f"part_{n + 1:03d}", where, args, rows))
+        return parts
+
+    col = PARTITION_BY[by]
+    # NULL and '' are one partition: both would be labelled "Unknown"
+    rows = con.execute(
+        f"SELECT NULLIF({col}, ''), COUNT(*) FROM places GROUP BY 1 ORDER BY COUNT(*) DESC"
+    ).fetchall()
+    # biggest first, so the long partitions start early in the pool
+    return [
+        (value, f"p.{col} = ?", [value], n) if value is not None
+        else (UNKNOWN, f"NULLIF(p.{col}, '') IS NULL", [], n)
+        for value, n in rows
+    ]
+
+
+def split(con, where, args, cap=ROW_CAP, piece=PIECE):
+    # one partition → [(sheet, lo, hi)] id ranges of ≤ piece rows, none of
+    # them straddling a sheet boundary; every range is rendered on its own
+    marks = con.execute(f"""
+        SELECT id, (n - 1) / ? FROM (
+            SELECT p.id AS id, row_number() OVER (ORDER BY p.id) AS n FROM places p WHERE {where}
+        ) WHERE ((n - 1) % ?) % ? = 0
+    """, [cap, *args, cap, piece]).fetchall()
+    if not marks:
+        return []
+    # rows added while we export get ids past the end and wait for the next run
+    top = con.execute(f"SELECT MAX(p.id) FROM places p WHERE {where}", args).fetchone()[0]
+    return [
+        (sheet, lo, marks[i + 1][0] if i + 1 < len(marks) else top + 1)
+        for i, (lo, sheet) in enumerate(marks)
+    ]
+
+
+def safe_name(text, limit):
+    # sheet names: ≤31 chars, none of []:*?/\ ; file names: no path separators
+    return re.sub(r"[\[\]:*?/\\<>|\"]", "_", str(text)).strip()[:limit] or UNKNOWN
+
+
+def unique_names(labels, limit):
+    # file names must differ after cleaning and truncation, ignoring case
+    # (Windows and macOS), or two workers would write the same file
+    taken, names = set(), []
+    for label in labels:
+        base = safe_name(label, limit)
+        name, i = base, 2
+        while name.lower() in taken:
+            name = f"{base[:limit - 5]} ~{i}"
+            i += 1
+        taken.add(name.lower())
+        names.append(name)
+    return names
+
+# =====================================================
+# WRITERS
+# =====================================================
+# Rendering rows to XML is the slow part (~50k rows/s a core), so it runs in
+# the process pool one piece at a time, whatever the partitioning: a single
+# huge partition or a whole sheets-mode workbook still uses every core. Each
+# piece lands in a small gzip file; one thread per output file then streams
+# the pieces, in order, into its workbook (zlib releases the GIL).
+def render_piece(db, where, args, lo, hi, path):
+    # runs in a worker process: own read-only connection
+    con = sqlite3.connect(f"file:{db}?mode=ro", uri=True)
+    cur = con.execute(f"{SELECT} WHERE {where} AND p.id >= ? AND p.id < ? ORDER BY p.id", [*args, lo, hi])
+    n = 0
+    with gzip.open(path, "wb", compresslevel=1) as f:
+        while True:
+            rows = cur.fetchmany(FETCH)
+            if not rows:
+                break
+            f.write("".join(map(row_xml, rows)).encode("utf-8"))
+            n += len(rows)
+    con.close()
+    return path, n
+
+
+def assemble(path, parts):
+    # parts: [(title, [(sheet, future)])]; a partition bigger than one sheet
+    # rolls over into "<title> (2)", "<title> (3)", ...
+    t0 = time.perf_counter()
+    tmp = path[:-len(".xlsx")] + ".part.xlsx"
+    book = XlsxStream(tmp)
+    n = 0
+    try:
+        for title, pieces in parts:
+            current = None
+            for sheet, future in pieces:
+                if sheet != current:
+                    current = sheet
+                    name = title if sheet == 0 else f"{title[:25]} ({sheet + 1})"
+                    book.add_sheet(safe_name(name, 31))
+                piece, rows = future.result()
+                with gzip.open(piece, "rb") as f:
+                    shutil.copyfileobj(f, book.fh, COPY_CHUNK)
+                os.remove(piece)
+                n += rows
+            if not pieces:
+                book.add_sheet(safe_name(title, 31))
+        if not book.sheets:
+            book.add_sheet("Leads")
+    finally:
+        book.close()
+    os.replace(tmp, path)
+    return path, n, time.perf_counter() - t0
+
+# =====================================================
+# EXPORT
+# =====================================================
+def export(by=None, mode="files", out=None, db=lead_db.DB_FILE, cap=ROW_CAP, workers=WORKERS,
+           piece=PIECE):
+    if by is not None and by not in PARTITION_BY:
+        raise ValueError(f"partition must be one of {sorted(PARTITION_BY)} or None")
+
+    lead_db.connect(db).close()       # apply pending migrations before readers open it
+    con = sqlite3.connect(f"file:{db}?mode=ro", uri=True)
+    layout = [
+        (label, where, args, split(con, where, args, cap, piece))
+        for label, where, args, _ in plan(con, by, cap)
+    ]
+    con.close()
+
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    stem = f"leads_{by or 'all'}_{stamp}"
+    if mode == "sheets":
+        # one workbook, one sheet per partition
+        path = out or os.path.join(EXPORT_DIR, f"{stem}.xlsx")
+        folder = os.path.dirname(path) or "."
+        books = [(path, layout)]
+    else:
+        folder = out or os.path.join(EXPORT_DIR, stem)
+        names = unique_names([label for label, *_ in layout], 80)
+        books = [(os.path.join(folder, f"{name}.xlsx"), [part]) for name, part in zip(names, layout)]
+    os.makedirs(folder, exist_ok=True)
+
+    t0 = time.perf_counter()
+    total = 0
+    with tempfile.TemporaryDirectory(dir=folder, prefix=".pieces-") as scratch, \
+            ProcessPoolExecutor(max_workers=max(1, workers)) as pool, \
+            ThreadPoolExecutor(max_workers=max(1, min(workers, len(books)))) as writers:
+        # submitted in output order, so the first files are ready first
+        k = 0
+        jobs = []
+        for path, parts in books:
+            planned = []
+            for label, where, args, ranges in parts:
+                pieces = []
+                for sheet, lo, hi in ranges:
+                    k += 1
+                    scratch_path = os.path.join(scratch, f"{k}.xml.gz")
+                    pieces.append((sheet, pool.submit(render_piece, db, where, args, lo, hi, scratch_path)))
+                planned.append((label, pieces))
+            jobs.append(writers.submit(assemble, path, planned))
+
+        for job in as_completed(jobs):
+            path, n, dt = job.result()
+            total += n
+            if mode == "files":
+                print(f"   📗 {os.path.basename(path)}: {n:,} rows in {dt:.1f}s")
+
+    if mode == "sheets":
+        print(f"📗 {books[0][0]}: {len(layout)} sheets")
+    else:
+        print(f"📁 {folder}: {len(books)} files")
+    dt = time.perf_counter() - t0
+    print(f"📤 Exported {total:,} leads in {dt:.1f}s ({total / max(dt, 1e-9):,.0f} rows/s)")
+    return total
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    usage = (
+        "usage: python excel_export.py [State|District|City|Confidence_Tier|all] [files|sheets] "
+        "[out] [cap=..] [workers=..] [piece=..]\n"
+        "  e.g. python excel_export.py State files\n"
+        "       python excel_export.py all files cap=500000"
+    )
+    args = [a for a in sys.argv[1:] if "=" not in a]
+    opts = dict(a.split("=", 1) for a in sys.argv[1:] if "=" in a)
+    if args and args[0] in ("-h", "--help"):
+        print(usage)
+        return
+
+    by = args[0] if args else "all"
+    mode = args[1] if len(args) > 1 else "files"
+    if (by != "all" and by not in PARTITION_BY) or mode not in ("files", "sheets"):
+        print(usage)
+        return
+
+    export(
+        by=None if by == "all" else by,
+        mode=mode,
+        out=args[2] if len(args) > 2 else None,
+        cap=int(opts.get("cap", ROW_CAP)),
+        workers=int(opts.get("workers", WORKERS)),
+        piece=int(opts.get("piece", PIECE)),
+    )
+
+
+if __name__ == "__main__":
+    main()
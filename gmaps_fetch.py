@@ -0,0 +1,181 @@
+import time
+import random
+import re
+import json
+import threading
+
+import requests
+
+from blocklist import is_blocked
+from http_fetch import get_session, clean_phone
+from selector_registry import XPATH
+
+# =====================================================
+# CONFIG
+# =====================================================
+REQUEST_TIMEOUT = 15
+DELAY_RANGE = (0.5, 1.5)  # politeness delay per HTTP fetch
+BROWSER_WAIT = (4, 6)     # only paid when we escalate to Chrome
+
+STATE_RE = re.compile(r"window\.APP_INITIALIZATION_STATE\s*=\s*(\[.*?\]);window\.", re.S)
+META_RE = re.compile(r'<meta\s+(?:property|itemprop)="([^"]+)"\s+content="([^"]*)"', re.I)
+TEL_RE = re.compile(r'tel:(\+?[\d\s\-]{10,16})')
+XSSI_PREFIX = ")]}'"
+
+# positions inside the place array of the preview payload
+NAME_PATH = (11,)
+ADDRESS_PATHS = ((39,), (18,))
+PHONE_PATHS = ((178, 0, 0), (178, 0, 1, 1, 0), (3, 0))
+
+PHONE_XPATH = "//button[contains(@aria-label,'Phone')] | //a[starts-with(@href,'tel:')]"
+
+stats = {"http": 0, "browser": 0, "miss": 0}
+_stats_lock = threading.Lock()
+
+
+def count(path):
+    with _stats_lock:
+        stats[path] += 1
+
+
+def hit_rate():
+    total = sum(stats.values())
+    if not total:
+        return {k: 0.0 for k in stats}
+    return {k: round(v / total, 3) for k, v in stats.items()}
+
+# =====================================================
+# PAYLOAD PARSING
+# =====================================================
+def dig(obj, path):
+    for key in path:
+        try:
+            obj = obj[key]
+        except (IndexError, KeyError, TypeError):
+            return None
+    return obj
+
+
+def load_place_array(text):
+    m = STATE_RE.search(text)
+    if not m:
+        return None
+    try:
+        state = json.loads(m.group(1))
+    except ValueError:
+        return None
+
+    # the place preview is a JSON string (with XSSI prefix) nested in the state
+    stack = [state]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            if node.startswith(XSSI_PREFIX):
+                try:
+                    data = json.loads(node[len(XSSI_PREFIX):])
+                except ValueError:
+                    continue
+                place = dig(data, (6,))
+                if isinstance(place, list) and isinstance(dig(place, NAME_PATH), str):
+                    return place
+        elif isinstance(node, list):
+            stack.extend(node)
+    return None
+
+
+def first_str(place, paths):
+    for path in paths:
+        value = dig(place, path)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return ""
+
+
+def parse_place(text):
+    if not text:
+        return None
+
+    place = load_place_array(text)
+    if place is not None:
+        name = first_str(place, (NAME_PATH,))
+        address = first_str(place, ADDRESS_PATHS)
+        candidates = [first_str(place, PHONE_PATHS)]
+    else:
+        meta = dict(META_RE.findall(text))
+        name = meta.get("og:title", "").split("·")[0].strip()
+        address = ""
+        candidates = []
+
+    # same blocklist as the browser path; a blocked number does not hide the next
+    candidates += TEL_RE.findall(text)
+    phone = next((p for p in map(clean_phone, candidates) if p and not is_blocked(p)), None)
+    if not phone:
+        return None
+    return {"name": name, "address": address, "phone": phone}
+
+# =====================================================
+# FETCH PATHS
+# =====================================================
+def fetch_html(url):
+    time.sleep(random.uniform(*DELAY_RANGE))
+    try:
+        r = get_session().get(url, timeout=REQUEST_TIMEOUT)
+    except requests.RequestException:
+        return ""
+    return r.text if r.status_code == 200 else ""
+
+
+def browser_place(driver, url):
+    driver.get(url)
+    time.sleep(random.uniform(*BROWSER_WAIT))
+
+    driver.execute_script("window.scrollBy(0,600)")
+    time.sleep(random.uniform(2, 3))
+
+    for el in driver.find_elements(XPATH, PHONE_XPATH):
+        phone = clean_phone(el.text or el.get_attribute("href"))
+        if phone and not is_blocked(phone):
+            return {"name": "", "address": "", "phone": phone}
+    return None
+
+
+def fetch_place(url, driver=None):
+    if not isinstance(url, str) or not url.startswith("http"):
+        return None
+
+    place = parse_place(fetch_html(url))
+    if place:
+        count("http")
+        return place
+
+    if driver is not None:
+        try:
+            place = browser_place(driver, url)
+        except Exception:
+            place = None
+        if place:
+            count("browser")
+            return place
+
+    count("miss")
+    return None
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    import sys
+
+    urls = sys.argv[1:]
+    if not urls:
+        print("usage: python gmaps_fetch.py <place url> [<place url> ...]")
+        return
+
+    for url in urls:
+        print(f"📍 {url} → {fetch_place(url)}")
+
+    print(f"📊 Hit rate: {hit_rate()}")
+
+
+if __name__ == "__main__":
+    main()
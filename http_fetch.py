@@ -0,0 +1,61 @@
+import re
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# =====================================================
+# CONFIG
+# =====================================================
+POOL_SIZE = 8            # connections per host, at most; further requests wait for one
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-IN,en;q=0.9",
+}
+
+# =====================================================
+# HTTP SESSION (POOLED, KEEP-ALIVE, SHARED BY THE FETCHERS)
+# =====================================================
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=2,
+                backoff_factor=1.0,
+                status_forcelist=(500, 502, 504),
+                allowed_methods=("GET",),
+            )
+            # pool_block: without it urllib3 opens a throwaway connection once
+            # the pool is empty, and the per-host cap is not a cap at all
+            adapter = HTTPAdapter(
+                pool_connections=POOL_SIZE,
+                pool_maxsize=POOL_SIZE,
+                pool_block=True,
+                max_retries=retry,
+            )
+            s = requests.Session()
+            s.headers.update(HEADERS)
+            s.mount("http://", adapter)
+            s.mount("https://", adapter)
+            _session = s
+    return _session
+
+# =====================================================
+# HELPERS
+# =====================================================
+def clean_phone(text):
+    if not text:
+        return None
+    phone = re.sub(r"[^\d]", "", text)
+    return phone if len(phone) >= 10 else None
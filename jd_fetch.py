@@ -0,0 +1,182 @@
+import time
+import random
+import threading
+
+import requests
+from lxml import html
+
+from blocklist import is_blocked
+from http_fetch import get_session, clean_phone
+
+# =====================================================
+# CONFIG
+# =====================================================
+REQUEST_TIMEOUT = 15
+DELAY_RANGE = (0.5, 1.5)  # politeness delay per HTTP fetch
+BROWSER_WAIT = (5, 8)     # only paid when we fall back to Chrome
+
+BLOCKED_STATUS = {401, 403, 429, 503}
+BLOCK_MARKERS = ("access denied", "captcha", "unusual traffic", "are you a robot")
+
+# markers that only exist once the results / detail page is server rendered
+CONTENT_MARKERS = ("resultbox_info", "callcontent", "tel:")
+
+CARD_XPATH = "//*[contains(concat(' ', normalize-space(@class), ' '), ' resultbox_info ')]"
+TITLE_XPATH = ".//*[contains(concat(' ', normalize-space(@class), ' '), ' resultbox_title_anchor ')]"
+CALL_XPATH = ".//*[contains(concat(' ', normalize-space(@class), ' '), ' callcontent ')]"
+TEL_XPATH = ".//a[starts-with(@href, 'tel:')]"
+
+# =====================================================
+# HIT RATE
+# =====================================================
+stats = {"http": 0, "browser": 0, "miss": 0}
+_stats_lock = threading.Lock()
+
+
+def count(path):
+    with _stats_lock:
+        stats[path] += 1
+
+
+def hit_rate():
+    total = sum(stats.values())
+    if not total:
+        return {k: 0.0 for k in stats}
+    return {k: round(v / total, 3) for k, v in stats.items()}
+
+# =====================================================
+# HELPERS
+# =====================================================
+def fetch_html(url):
+    time.sleep(random.uniform(*DELAY_RANGE))
+    try:
+        r = get_session().get(url, timeout=REQUEST_TIMEOUT)
+    except requests.RequestException:
+        return None, ""
+    return r.status_code, r.text
+
+
+def needs_browser(status, text):
+    if status is None or status in BLOCKED_STATUS:
+        return True
+    low = text.lower()
+    if any(m in low for m in BLOCK_MARKERS):
+        return True
+    # JS-only shell: none of the server rendered markers are present
+    return not any(m in text for m in CONTENT_MARKERS)
+
+# =====================================================
+# PARSERS (SHARED BY HTTP AND BROWSER PATHS)
+# =====================================================
+def phone_from_node(node):
+    # a card can show the blocked placeholder first and the real number after it
+    candidates = [el.text_content() for el in node.xpath(CALL_XPATH)]
+    candidates += [a.get("href") for a in node.xpath(TEL_XPATH)]
+    for text in candidates:
+        phone = clean_phone(text)
+        if phone and not is_blocked(phone):
+            return phone
+    return None
+
+
+def parse_listing(text):
+    if not text:
+        return []
+    tree = html.fromstring(text)
+    cards = []
+    for card in tree.xpath(CARD_XPATH):
+        titles = card.xpath(TITLE_XPATH)
+        name = titles[0].text_content().strip() if titles else ""
+        phone = phone_from_node(card)
+        if name or phone:
+            cards.append({"name": name, "phone": phone})
+    return cards
+
+
+def parse_phone(text):
+    if not text:
+        return None
+    return phone_from_node(html.fromstring(text))
+
+# =====================================================
+# BROWSER FALLBACK
+# =====================================================
+def browser_html(driver, url, scroll=0):
+    driver.get(url)
+    time.sleep(random.uniform(*BROWSER_WAIT))
+    if scroll:
+        driver.execute_script(f"window.scrollBy(0,{scroll})")
+        time.sleep(random.uniform(2, 3))
+    return driver.page_source
+
+# =====================================================
+# PUBLIC API
+# =====================================================
+def fetch_listing(url, driver=None):
+    status, text = fetch_html(url)
+    if not needs_browser(status, text):
+        cards = parse_listing(text)
+        if cards:
+            count("http")
+            return cards
+
+    if driver is not None:
+        try:
+            cards = parse_listing(browser_html(driver, url))
+        except Exception:
+            cards = []
+        if cards:
+            count("browser")
+            return cards
+
+    count("miss")
+    return []
+
+
+def fetch_phone(url, driver=None):
+    if not isinstance(url, str) or not url.startswith("http"):
+        return None
+
+    status, text = fetch_html(url)
+    if not needs_browser(status, text):
+        phone = parse_phone(text)
+        if phone:
+            count("http")
+            return phone
+
+    if driver is not None:
+        try:
+            phone = parse_phone(browser_html(driver, url, scroll=800))
+        except Exception:
+            phone = None
+        if phone:
+            count("browser")
+            return phone
+
+    count("miss")
+    return None
+
+# =====================================================
+# MAIN (OFFLINE CHECK AGAINST RECORDED PAGES)
+# =====================================================
+def main():
+    # Serve recorded pages with `python -m http.server 8000` from the folder
+    # holding them, then pass their local URLs here.
+    import sys
+
+    urls = sys.argv[1:]
+    if not urls:
+        print("usage: python jd_fetch.py <url> [<url> ...]")
+        return
+
+    for url in urls:
+        cards = fetch_listing(url)
+        print(f"📄 {url} → {len(cards)} cards")
+        for c in cards:
+            print(f"   {c['name']} | {c['phone']}")
+
+    print(f"📊 Hit rate: {hit_rate()}")
+
+
+if __name__ == "__main__":
+    main()
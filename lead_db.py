@@ -0,0 +1,426 @@
+import sys
+import time
+import sqlite3
+from datetime import datetime, timedelta
+
+from phone_norm import normalize_phone
+from entity_resolve import name_key
+import address_parser
+
+# =====================================================
+# CONFIG
+# =====================================================
+DB_FILE = "leads.db"
+
+# =====================================================
+# SCHEMA MIGRATIONS (PRAGMA user_version = number applied)
+# =====================================================
+V1_SCHEMA = """
+CREATE TABLE IF NOT EXISTS places (
+    id INTEGER PRIMARY KEY,
+    place_id TEXT UNIQUE,            -- Maps place / feature id when known
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,          -- normalized name, for matching
+    category TEXT,
+    address TEXT,
+    city TEXT,
+    state TEXT,
+    rating REAL,
+    reviews INTEGER,
+    website TEXT,
+    tier TEXT,
+    source TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_places_city_seen ON places(city, last_seen);
+CREATE INDEX IF NOT EXISTS idx_places_state_city ON places(state, city);
+CREATE INDEX IF NOT EXISTS idx_places_last_seen ON places(last_seen);
+CREATE INDEX IF NOT EXISTS idx_places_name_city ON places(name_key, city);
+
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY,
+    place_rowid INTEGER NOT NULL REFERENCES places(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,              -- phone / email
+    value TEXT NOT NULL,             -- E.164 for phones
+    raw TEXT,
+    UNIQUE(kind, value, place_rowid)
+);
+CREATE INDEX IF NOT EXISTS idx_contacts_place ON contacts(place_rowid);
+
+CREATE TABLE IF NOT EXISTS queries (
+    id INTEGER PRIMARY KEY,
+    query TEXT NOT NULL UNIQUE,
+    city TEXT
+);
+
+CREATE TABLE IF NOT EXISTS query_hits (
+    query_rowid INTEGER NOT NULL REFERENCES queries(id),
+    place_rowid INTEGER NOT NULL REFERENCES places(id) ON DELETE CASCADE,
+    scraped_at TEXT NOT NULL,
+    PRIMARY KEY (query_rowid, place_rowid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_hits_place ON query_hits(place_rowid);
+CREATE INDEX IF NOT EXISTS idx_hits_scraped ON query_hits(scraped_at);
+"""
+
+# old readers (lead_store.import_db, ad-hoc SQL) keep seeing the flat table
+LEADS_VIEW = """
+CREATE VIEW IF NOT EXISTS leads AS
+SELECT c.raw AS phone, p.name AS name, q.query AS query, h.scraped_at AS scraped_at
+FROM query_hits h
+JOIN places p ON p.id = h.place_rowid
+JOIN queries q ON q.id = h.query_rowid
+LEFT JOIN contacts c ON c.place_rowid = p.id AND c.kind = 'phone'
+"""
+
+
+def run_script(con, script):
+    # executescript() COMMITs before it runs, which would end migrate()'s
+    # transaction and leave a half-applied step behind; this stays inside it
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            con.execute(statement)
+            statement = ""
+
+
+def migrate_v1(con):
+    run_script(con, V1_SCHEMA)
+
+
+def migrate_v2(con):
+    # the legacy flat table: phone, name, query, scraped_at, UNIQUE(phone, name)
+    legacy = con.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'leads'"
+    ).fetchone()
+    if legacy:
+        con.execute("ALTER TABLE leads RENAME TO leads_v0")
+        n = 0
+        rows = con.cursor().execute("SELECT phone, name, query, scraped_at FROM leads_v0 ORDER BY rowid")
+        for phone, name, query, scraped_at in rows:
+            if name:
+                save_lead(con, {"name": name, "phone": phone, "scraped_at": scraped_at,
+                                "source": "Google Maps"}, query)
+                n += 1
+        print(f"🚚 Migrated {n} legacy leads (kept as leads_v0)")
+    con.execute(LEADS_VIEW)
+
+
+# external-content FTS5 index over places (lead_search.py); the update trigger
+# only fires when an indexed column really changed, so re-seeing a place is free
+V3_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS places_fts USING fts5(
+    name, category, address,
+    content='places', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS places_fts_ai AFTER INSERT ON places BEGIN
+    INSERT INTO places_fts (rowid, name, category, address)
+    VALUES (new.id, new.name, new.category, new.address);
+END;
+CREATE TRIGGER IF NOT EXISTS places_fts_ad AFTER DELETE ON places BEGIN
+    INSERT INTO places_fts (places_fts, rowid, name, category, address)
+    VALUES ('delete', old.id, old.name, old.category, old.address);
+END;
+CREATE TRIGGER IF NOT EXISTS places_fts_au AFTER UPDATE OF name, category, address ON places
+WHEN old.name IS NOT new.name OR old.category IS NOT new.category OR old.address IS NOT new.address
+BEGIN
+    INSERT INTO places_fts (places_fts, rowid, name, category, address)
+    VALUES ('delete', old.id, old.name, old.category, old.address);
+    INSERT INTO places_fts (rowid, name, category, address)
+    VALUES (new.id, new.name, new.category, new.address);
+END;
+CREATE INDEX IF NOT EXISTS idx_places_tier ON places(tier);
+
+-- phone-per-place lookups: without stats the planner takes the covering
+-- UNIQUE(kind, ...) index on kind alone and walks every phone row. joins
+-- from places write `+c.kind` so only this index is usable
+DROP INDEX IF EXISTS idx_contacts_place;
+CREATE INDEX IF NOT EXISTS idx_contacts_place_kind ON contacts(place_rowid, kind);
+DROP VIEW IF EXISTS leads;
+CREATE VIEW leads AS
+SELECT c.raw AS phone, p.name AS name, q.query AS query, h.scraped_at AS scraped_at
+FROM query_hits h
+JOIN places p ON p.id = h.place_rowid
+JOIN queries q ON q.id = h.query_rowid
+LEFT JOIN contacts c ON c.place_rowid = p.id AND +c.kind = 'phone';
+"""
+
+
+def migrate_v3(con):
+    run_script(con, V3_SCHEMA)
+    con.execute("INSERT INTO places_fts (places_fts) VALUES ('rebuild')")
+
+
+# change tracking for delta_export.py: every insert or real change of an
+# exported field (or a new contact) stamps the place with the next value of a
+# global counter, so "changed since N" is an index range scan
+TRACKED = ["place_id", "name", "category", "address", "city", "state",
+           "rating", "reviews", "website", "tier"]
+
+V4_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS change_seq (id INTEGER PRIMARY KEY CHECK (id = 1), value INTEGER NOT NULL);
+INSERT OR IGNORE INTO change_seq VALUES (1, 0);
+
+CREATE TABLE IF NOT EXISTS export_cursors (
+    consumer TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    exported_at TEXT NOT NULL,
+    rows INTEGER NOT NULL
+);
+
+ALTER TABLE places ADD COLUMN version INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE places ADD COLUMN created_version INTEGER NOT NULL DEFAULT 0;
+CREATE INDEX IF NOT EXISTS idx_places_version ON places(version);
+
+CREATE TRIGGER IF NOT EXISTS places_version_ai AFTER INSERT ON places BEGIN
+    UPDATE change_seq SET value = value + 1 WHERE id = 1;
+    UPDATE places SET version = (SELECT value FROM change_seq WHERE id = 1),
+                      created_version = (SELECT value FROM change_seq WHERE id = 1)
+    WHERE id = new.id;
+END;
+CREATE TRIGGER IF NOT EXISTS places_version_au AFTER UPDATE OF {', '.join(TRACKED)} ON places
+WHEN {' OR '.join(f'old.{c} IS NOT new.{c}' for c in TRACKED)}
+BEGIN
+    UPDATE change_seq SET value = value + 1 WHERE id = 1;
+    UPDATE places SET version = (SELECT value FROM change_seq WHERE id = 1) WHERE id = new.id;
+END;
+CREATE TRIGGER IF NOT EXISTS contacts_version_ai AFTER INSERT ON contacts BEGIN
+    UPDATE change_seq SET value = value + 1 WHERE id = 1;
+    UPDATE places SET version = (SELECT value FROM change_seq WHERE id = 1) WHERE id = new.place_rowid;
+END;
+"""
+
+
+def migrate_v4(con):
+    run_script(con, V4_SCHEMA)
+    # existing rows all count as one initial change set
+    con.execute("UPDATE change_seq SET value = 1 WHERE id = 1")
+    con.execute("UPDATE places SET version = 1, created_version = 1")
+
+
+# canonical district / pincode (address_parser.py) so leads partition and
+# dedupe by district; the version trigger watches them too
+TRACKED_V5 = TRACKED + ["district", "pincode"]
+
+V5_COLUMNS = ["district", "pincode"]
+
+V5_SCHEMA = f"""
+CREATE INDEX IF NOT EXISTS idx_places_state_district ON places(state, district);
+CREATE INDEX IF NOT EXISTS idx_places_pincode ON places(pincode);
+
+DROP TRIGGER IF EXISTS places_version_au;
+CREATE TRIGGER places_version_au AFTER UPDATE OF {', '.join(TRACKED_V5)} ON places
+WHEN {' OR '.join(f'old.{c} IS NOT new.{c}' for c in TRACKED_V5)}
+BEGIN
+    UPDATE change_seq SET value = value + 1 WHERE id = 1;
+    UPDATE places SET version = (SELECT value FROM change_seq WHERE id = 1) WHERE id = new.id;
+END;
+"""
+
+
+def migrate_v5(con):
+    # parsed values replace what the old "last two comma parts" split left
+    # behind ("Rajasthan 302001" as a state); rows the parser cannot read keep theirs
+    have = {r[1] for r in con.execute("PRAGMA table_info(places)")}
+    for col in V5_COLUMNS:
+        # a store left half-migrated by an older version may have them already
+        if col not in have:
+            con.execute(f"ALTER TABLE places ADD COLUMN {col} TEXT")
+    run_script(con, V5_SCHEMA)
+    rows = con.execute(
+        "SELECT id, address FROM places WHERE address IS NOT NULL AND address != ''"
+    ).fetchall()
+    if not rows:
+        return
+    ids, addresses = zip(*rows)
+    geo = address_parser.parse_series(address_parser.pd.Series(addresses))
+    geo = geo.astype(object).where(geo.notna(), None)
+    con.executemany("""
+        UPDATE places SET district = ?, pincode = ?,
+            city = COALESCE(?, city), state = COALESCE(?, state)
+        WHERE id = ?
+    """, zip(geo["District"], geo["Pincode"], geo["City"], geo["State"], ids))
+    print(f"📍 Parsed {len(rows)} addresses into district / pincode")
+
+
+MIGRATIONS = [migrate_v1, migrate_v2, migrate_v3, migrate_v4, migrate_v5]
+
+# =====================================================
+# CONNECTION
+# =====================================================
+def migrate(con):
+    version = con.execute("PRAGMA user_version").fetchone()[0]
+    for i, step in enumerate(MIGRATIONS[version:], version + 1):
+        t0 = time.perf_counter()
+        with con:
+            # explicit, or the DDL before the first DML would run in autocommit
+            con.execute("BEGIN")
+            step(con)
+            con.execute(f"PRAGMA user_version = {i}")
+        print(f"🧬 Lead db schema → v{i} ({time.perf_counter() - t0:.1f}s)")
+    return con
+
+
+def connect(path=DB_FILE):
+    con = sqlite3.connect(path, timeout=30)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    con.execute("PRAGMA foreign_keys=ON")
+    return migrate(con)
+
+# =====================================================
+# WRITES
+# =====================================================
+PLACE_FIELDS = ["category", "address", "city", "state", "rating", "reviews",
+                "website", "tier", "source", "district", "pincode"]
+GEO_FIELDS = {"city": "City", "district": "District", "state": "State", "pincode": "Pincode"}
+
+
+def find_place(con, place_id, e164, nkey, city):
+    # strongest identity first: Maps id, then phone + name, then name + city
+    # (only for a record without a phone, or whose phone that place already
+    # has: branches of one chain share a name and a city, not a number)
+    if place_id:
+        row = con.execute("SELECT id FROM places WHERE place_id = ?", (place_id,)).fetchone()
+        if row:
+            return row[0]
+    if e164:
+        row = con.execute("""
+            SELECT p.id FROM contacts c JOIN places p ON p.id = c.place_rowid
+            WHERE c.kind = 'phone' AND c.value = ? AND p.name_key = ?
+        """, (e164, nkey)).fetchone()
+        if row:
+            return row[0]
+    if city:
+        row = con.execute("""
+            SELECT id FROM places p WHERE name_key = ? AND city = ?
+              AND (? IS NULL OR EXISTS (
+                  SELECT 1 FROM contacts c
+                  WHERE c.place_rowid = p.id AND c.kind = 'phone' AND c.value = ?))
+        """, (nkey, city, e164, e164)).fetchone()
+        if row:
+            return row[0]
+    return None
+
+
+def add_contact(con, rowid, kind, value, raw=None):
+    con.execute(
+        "INSERT OR IGNORE INTO contacts (place_rowid, kind, value, raw) VALUES (?, ?, ?, ?)",
+        (rowid, kind, value, raw)
+    )
+
+
+def save_lead(con, rec, query=None, rowid=None):
+    # rec: name (required), phone, place_id, scraped_at and any of PLACE_FIELDS;
+    # pass rowid when the caller already knows which place this is
+    name = str(rec["name"]).strip()
+    nkey = name_key(name)
+    raw_phone = rec.get("phone")
+    e164 = normalize_phone(raw_phone) if raw_phone else None
+    now = rec.get("scraped_at") or datetime.now().isoformat(timespec="seconds")
+    if rec.get("address") and not all(rec.get(f) for f in GEO_FIELDS):
+        geo = address_parser.parse(rec["address"])
+        rec = dict(rec)
+        for f, col in GEO_FIELDS.items():
+            rec[f] = rec.get(f) or geo[col]
+    # only the fields this record carries: missing ones stay NULL on insert
+    # and untouched on update, and older schemas (the v2 migration) still fit
+    fields = [f for f in PLACE_FIELDS if rec.get(f) is not None]
+    values = [rec[f] for f in fields]
+
+    if rowid is None:
+        rowid = find_place(con, rec.get("place_id"), e164, nkey, rec.get("city"))
+    if rowid is None:
+        cur = con.execute(f"""
+            INSERT INTO places (place_id, name, name_key, {''.join(f + ', ' for f in fields)}first_seen, last_seen)
+            VALUES (?, ?, ?, {'?, ' * len(fields)}?, ?)
+        """, [rec.get("place_id"), name, nkey, *values, now, now])
+        rowid = cur.lastrowid
+    else:
+        # newer non-empty values win, missing ones keep what we had
+        sets = "".join(f"{f} = ?, " for f in fields)
+        con.execute(f"""
+            UPDATE places SET {sets}place_id = COALESCE(place_id, ?),
+                first_seen = MIN(first_seen, ?), last_seen = MAX(last_seen, ?)
+            WHERE id = ?
+        """, [*values, rec.get("place_id"), now, now, rowid])
+
+    if e164:
+        add_contact(con, rowid, "phone", e164, str(raw_phone))
+    if rec.get("email"):
+        add_contact(con, rowid, "email", rec["email"].lower(), rec["email"])
+
+    if query:
+        con.execute(
+            "INSERT OR IGNORE INTO queries (query, city) VALUES (?, ?)", (query, rec.get("city"))
+        )
+        con.execute("""
+            INSERT OR IGNORE INTO query_hits (query_rowid, place_rowid, scraped_at)
+            SELECT id, ?, ? FROM queries WHERE query = ?
+        """, (rowid, now, query))
+    return rowid
+
+# =====================================================
+# REPORTS
+# =====================================================
+def leads_in(con, city, days=7):
+    since = (datetime.now() - timedelta(days=days)).isoformat(timespec="seconds")
+    return con.execute("""
+        SELECT p.name, c.value, p.category, p.address, p.last_seen
+        FROM places p
+        LEFT JOIN contacts c ON c.place_rowid = p.id AND +c.kind = 'phone'
+        WHERE p.city = ? AND p.last_seen >= ?
+        ORDER BY p.last_seen DESC
+    """, (city, since)).fetchall()
+
+
+def by_phone(con, phone):
+    e164 = normalize_phone(phone)
+    return con.execute("""
+        SELECT p.* FROM contacts c JOIN places p ON p.id = c.place_rowid
+        WHERE c.kind = 'phone' AND c.value = ?
+    """, (e164,)).fetchall()
+
+
+def stats(con):
+    out = {}
+    for table in ("places", "contacts", "queries", "query_hits"):
+        out[table] = con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    out["schema"] = con.execute("PRAGMA user_version").fetchone()[0]
+    return out
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    usage = "usage: python lead_db.py migrate | stats | city <name> [days] | phone <number>"
+    args = sys.argv[1:]
+    if not args:
+        print(usage)
+        return
+
+    con = connect()
+    cmd = args[0]
+    t0 = time.perf_counter()
+    if cmd == "migrate":
+        print(stats(con))
+    elif cmd == "stats":
+        print(stats(con))
+    elif cmd == "city" and len(args) > 1:
+        rows = leads_in(con, args[1], int(args[2]) if len(args) > 2 else 7)
+        for r in rows[:50]:
+            print("   ", " | ".join(str(v or "") for v in r))
+        print(f"📍 {len(rows)} leads in {args[1]} ({(time.perf_counter() - t0) * 1000:.1f} ms)")
+    elif cmd == "phone" and len(args) > 1:
+        for r in by_phone(con, args[1]):
+            print(r)
+    else:
+        print(usage)
+    con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import re
+
+import address_parser
+
+# =====================================================
+# BRAND INTELLIGENCE
+# =====================================================
+BLACKLIST = {
+    "retailer", "shop", "store", "wholesaler", "trading",
+    "general trading", "import export", "broker", "resale"
+}
+
+WHITELIST = {
+    "authorized distributor", "official distributor",
+    "exclusive distributor", "sole distributor",
+    "channel partner", "distribution partner"
+}
+
+STRONG_SIGNALS = {
+    "iso", "iso 9001", "certified distributor",
+    "authorized partner", "registered company",
+    "since", "established"
+}
+
+AGGREGATOR_DOMAINS = ["justdial", "indiamart", "facebook", "tradeindia"]
+
+# =====================================================
+# SCORING ENGINE
+# =====================================================
+def evaluate_brand(name, category, website, rating, reviews):
+    text = f"{name} {category}".lower()
+    score = 0
+    signals = []
+
+    for word in BLACKLIST:
+        if word in text:
+            score -= 40
+            signals.append("Reseller keyword")
+
+    for word in WHITELIST:
+        if word in text:
+            score += 30
+            signals.append(word)
+
+    for word in STRONG_SIGNALS:
+        if word in text:
+            score += 20
+            signals.append(word)
+
+    if website:
+        if not any(x in website for x in AGGREGATOR_DOMAINS):
+            score += 25
+            signals.append("Official Website")
+        else:
+            score -= 10
+            signals.append("Aggregator Website")
+
+    if re.search(r"\b(pvt|private|ltd|limited)\b", text):
+        score += 20
+        signals.append("Legal Entity")
+
+    if rating:
+        if rating >= 4.0:
+            score += 20
+            signals.append("High Rating")
+        elif rating < 3.5:
+            score -= 10
+
+    if reviews and reviews >= 50:
+        score += 15
+        signals.append("High Reviews")
+
+    if score >= 50:
+        tier = "HIGH"
+    elif score >= 20:
+        tier = "MEDIUM"
+    else:
+        tier = "LOW"
+
+    status = (
+        "APPROVED" if score >= 20 else
+        "REVIEW_REQUIRED" if score >= 0 else
+        "REJECTED"
+    )
+
+    return score, tier, status, list(set(signals))
+
+# =====================================================
+# LEAD ENRICHMENT (LIVE SCRAPE AND OFFLINE RE-EXTRACT)
+# =====================================================
+def score_lead(lead):
+    # "…, Jaipur, Rajasthan 302017" → City / District / State / Pincode
+    geo = address_parser.parse(lead.get("Address"))
+
+    score, tier, status, signals = evaluate_brand(
+        lead["Brand_Name"], lead["Category"], lead["Website"],
+        lead["Rating"], lead["Reviews"]
+    )
+
+    lead.update({
+        "City": geo["City"] or "",
+        "District": geo["District"] or "",
+        "State": geo["State"] or "",
+        "Pincode": geo["Pincode"] or "",
+        "Confidence_Score": score,
+        "Confidence_Tier": tier,
+        "Status": status,
+        "Ownership_Signals": ", ".join(signals),
+    })
+    return lead
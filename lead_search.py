@@ -0,0 +1,130 @@
+import re
+import sys
+import time
+import sqlite3
+
+import lead_db
+
+# =====================================================
+# CONFIG
+# =====================================================
+LIMIT = 50
+# bm25 column weights: name, category, address
+WEIGHTS = (10.0, 4.0, 1.0)
+
+FTS_SYNTAX_RE = re.compile(r'["*:()^]|\b(AND|OR|NOT|NEAR)\b')
+
+# =====================================================
+# QUERY BUILDING
+# =====================================================
+def to_match(text):
+    # plain words become AND-ed prefix terms ("tyre agen" → tyre* agen*);
+    # anything already in FTS5 syntax (quotes, name:, OR, *) is passed through
+    text = text.strip()
+    if FTS_SYNTAX_RE.search(text):
+        return text
+    words = re.findall(r"\w+", text, re.UNICODE)
+    return " ".join(f"{w}*" for w in words)
+
+
+def to_quoted(text):
+    # fallback for input that looked like FTS5 syntax but is not valid
+    # ('sharma "'): every word quoted, so nothing in it is an operator
+    words = re.findall(r"\w+", text, re.UNICODE)
+    return " ".join(f'"{w}"*' for w in words)
+
+
+def search(con, text, state=None, city=None, tier=None, min_rating=None, limit=LIMIT):
+    # rank and cut inside the CTE; display columns (and the phone lookup)
+    # are only computed for the rows that survive the LIMIT
+    sql = f"""
+        SELECT p.id, bm25(places_fts, {', '.join(map(str, WEIGHTS))}) AS score
+        FROM places_fts
+        JOIN places p ON p.id = places_fts.rowid
+        WHERE places_fts MATCH ?
+    """
+    args = [to_match(text)]
+    if state:
+        sql += " AND p.state = ? COLLATE NOCASE"
+        args.append(state)
+    if city:
+        sql += " AND p.city = ? COLLATE NOCASE"
+        args.append(city)
+    if tier:
+        sql += " AND p.tier = ? COLLATE NOCASE"
+        args.append(tier)
+    if min_rating is not None:
+        sql += " AND p.rating >= ?"
+        args.append(float(min_rating))
+    sql += " ORDER BY score LIMIT ?"
+    args.append(limit)
+
+    sql = f"""
+        WITH hits AS ({sql})
+        SELECT p.id, p.name, p.category, p.address, p.city, p.state, p.rating, p.tier,
+               (SELECT value FROM contacts c
+                WHERE c.place_rowid = p.id AND +c.kind = 'phone' LIMIT 1) AS phone,
+               hits.score
+        FROM hits JOIN places p ON p.id = hits.id
+        ORDER BY hits.score
+    """
+
+    try:
+        cur = con.execute(sql, args)
+    except sqlite3.OperationalError:
+        args[0] = to_quoted(text)
+        if not args[0]:
+            return []
+        cur = con.execute(sql, args)
+    cols = [d[0] for d in cur.description]
+    return [dict(zip(cols, row)) for row in cur]
+
+
+def rebuild(con):
+    with con:
+        con.execute("INSERT INTO places_fts (places_fts) VALUES ('rebuild')")
+        con.execute("INSERT INTO places_fts (places_fts) VALUES ('optimize')")
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    usage = (
+        "usage: python lead_search.py \"<words | fts query>\" [state=..] [city=..] [tier=..] "
+        "[rating=..] [limit=..]\n"
+        "       python lead_search.py --rebuild\n"
+        "  e.g. python lead_search.py \"name:agencies tyre\" state=Rajasthan"
+    )
+    args = sys.argv[1:]
+    if not args:
+        print(usage)
+        return
+
+    con = lead_db.connect()
+    if args[0] == "--rebuild":
+        rebuild(con)
+        print("🧱 Search index rebuilt")
+        con.close()
+        return
+
+    filters = dict(a.split("=", 1) for a in args[1:] if "=" in a)
+    t0 = time.perf_counter()
+    rows = search(
+        con, args[0],
+        state=filters.get("state"),
+        city=filters.get("city"),
+        tier=filters.get("tier"),
+        min_rating=filters.get("rating"),
+        limit=int(filters.get("limit", LIMIT)),
+    )
+    dt = (time.perf_counter() - t0) * 1000
+
+    for r in rows:
+        print(f"   {r['name']} | {r['category'] or ''} | {r['city'] or ''} | "
+              f"{r['phone'] or ''} | ⭐ {r['rating'] or '-'} | {r['tier'] or ''}")
+    print(f"🔎 {len(rows)} matches in {dt:.1f} ms")
+    con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+import os
+import sys
+import time
+import uuid
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from phone_norm import to_text
+
+# =====================================================
+# CONFIG
+# =====================================================
+STORE_DIR = "lead_store"
+PARTITIONS = ["State", "City", "run_date"]
+UNKNOWN = "Unknown"
+COMPACT_MIN_FILES = 8    # a partition with this many flush files gets folded into one
+
+SCHEMA = pa.schema([
+    ("Place_Id", pa.string()),
+    ("Brand_Name", pa.string()),
+    ("Phone", pa.string()),
+    ("Phone_Type", pa.string()),
+    ("Website", pa.string()),
+    ("Category", pa.string()),
+    ("Address", pa.string()),
+    ("Rating", pa.float64()),
+    ("Reviews", pa.int64()),
+    ("Confidence_Score", pa.int64()),
+    ("Confidence_Tier", pa.string()),
+    ("Status", pa.string()),
+    ("Ownership_Signals", pa.string()),
+    ("Query", pa.string()),
+    ("Source", pa.string()),
+    ("Scraped_At", pa.timestamp("s")),
+    ("District", pa.string()),
+    ("Pincode", pa.string()),
+    ("State", pa.string()),
+    ("City", pa.string()),
+    ("run_date", pa.string()),
+])
+
+# every historical output column → store column
+COLUMN_MAP = {
+    "Business Name": "Brand_Name",
+    "Seller name": "Brand_Name",
+    "name": "Brand_Name",
+    "phone": "Phone",
+    "Keyword": "Query",
+    "query": "Query",
+    "scraped_at": "Scraped_At",
+}
+
+# =====================================================
+# COERCION
+# =====================================================
+def to_table(df, run_date=None):
+    df = df.rename(columns=COLUMN_MAP)
+    df = df.loc[:, ~df.columns.duplicated()]
+    out = pd.DataFrame(index=df.index)
+
+    for field in SCHEMA:
+        name = field.name
+        col = df[name] if name in df.columns else pd.Series(None, index=df.index, dtype=object)
+        if pa.types.is_floating(field.type):
+            out[name] = pd.to_numeric(col, errors="coerce")
+        elif pa.types.is_integer(field.type):
+            out[name] = pd.to_numeric(col, errors="coerce").round().astype("Int64")
+        elif name == "Phone":
+            out[name] = to_text(col).str.strip().replace("", pd.NA)
+        elif pa.types.is_timestamp(field.type):
+            out[name] = pd.to_datetime(col, errors="coerce").astype("datetime64[s]")
+        else:
+            out[name] = col.astype("string").str.strip().replace("", pd.NA)
+
+    out["State"] = out["State"].fillna(UNKNOWN)
+    out["City"] = out["City"].fillna(UNKNOWN)
+    if run_date is None:
+        run_date = out["Scraped_At"].dt.strftime("%Y-%m-%d").fillna(datetime.now().strftime("%Y-%m-%d"))
+    out["run_date"] = run_date
+
+    return pa.Table.from_pandas(out, schema=SCHEMA, preserve_index=False)
+
+# =====================================================
+# WRITE / READ
+# =====================================================
+def write_leads(rows, store=STORE_DIR):
+    df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows)
+    if df.empty:
+        return 0
+    table = to_table(df)
+    ds.write_dataset(
+        table,
+        store,
+        format="parquet",
+        partitioning=ds.partitioning(
+            pa.schema([SCHEMA.field(p) for p in PARTITIONS]), flavor="hive"
+        ),
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+    return table.num_rows
+
+
+def dataset(store=STORE_DIR):
+    return ds.dataset(
+        store,
+        format="parquet",
+        schema=SCHEMA,
+        partitioning=ds.partitioning(
+            pa.schema([SCHEMA.field(p) for p in PARTITIONS]), flavor="hive"
+        ),
+    )
+
+
+FILTER_COLUMNS = ["State", "City", "run_date", "Confidence_Tier", "Rating"]
+PARTITION_FILTERS = ("state", "city", "since", "until")
+
+
+def where(state=None, city=None, since=None, until=None, tier=None, min_rating=None):
+    # partition columns prune whole directories; the rest use parquet stats
+    conds = []
+    if state:
+        conds.append(ds.field("State") == state)
+    if city:
+        conds.append(ds.field("City") == city)
+    if since:
+        conds.append(ds.field("run_date") >= str(since))
+    if until:
+        conds.append(ds.field("run_date") <= str(until))
+    if tier:
+        conds.append(ds.field("Confidence_Tier") == tier)
+    if min_rating is not None:
+        conds.append(ds.field("Rating") >= float(min_rating))
+
+    expr = None
+    for c in conds:
+        expr = c if expr is None else expr & c
+    return expr
+
+
+def latest_per_place(table):
+    # reextract and repeat scrapes append rows instead of rewriting them: the
+    # newest row per Place_Id wins, rows without a Place_Id are all kept
+    table = table.sort_by([("Place_Id", "ascending"), ("Scraped_At", "descending")])
+    ids = table["Place_Id"].combine_chunks()
+    if len(ids) < 2:
+        return table
+    prev = pa.concat_arrays([pa.nulls(1, pa.string()), ids.slice(0, len(ids) - 1)])
+    same = pc.fill_null(pc.equal(ids, prev), False)
+    return table.filter(pc.or_(pc.is_null(ids), pc.invert(same)))
+
+
+def load(columns=None, store=STORE_DIR, latest=True, **filters):
+    expr = where(**filters)
+    if not latest:
+        return dataset(store).to_table(columns=columns, filter=expr)
+    # partition filters prune directories in the scan itself, and the dedupe
+    # runs over what is left: a place whose newer row sits in another City or
+    # run_date is only deduped when that partition is selected too. Tier and
+    # rating are checked after the dedupe, on each place's newest row only.
+    parts = where(**{k: v for k, v in filters.items() if k in PARTITION_FILTERS})
+    needed = None
+    if columns:
+        needed = list(dict.fromkeys(columns + ["Place_Id", "Scraped_At", *FILTER_COLUMNS]))
+    table = latest_per_place(dataset(store).to_table(columns=needed, filter=parts))
+    return ds.dataset(table).to_table(columns=columns, filter=expr)
+
+
+def read_leads(columns=None, store=STORE_DIR, latest=True, **filters):
+    if not os.path.isdir(store):
+        return SCHEMA.empty_table().to_pandas()
+    return load(columns, store, latest, **filters).to_pandas()
+
+
+def count_by(column, store=STORE_DIR, latest=True, **filters):
+    if not os.path.isdir(store):
+        return {}
+    table = load([column], store, latest, **filters)
+    counts = pc.value_counts(table[column])
+    return {c["values"].as_py(): c["counts"].as_py() for c in counts}
+
+# =====================================================
+# COMPACTION
+# =====================================================
+def compact(store=STORE_DIR, min_files=COMPACT_MIN_FILES):
+    # every flush adds one small uuid file per partition; fold them into one
+    if not os.path.isdir(store):
+        return 0, 0
+    file_schema = pa.schema([f for f in SCHEMA if f.name not in PARTITIONS])
+    before = after = 0
+    for root, _, names in os.walk(store):
+        files = sorted(
+            os.path.join(root, n) for n in names
+            if n.endswith(".parquet") and not n.startswith(("_", "."))
+        )
+        if len(files) < min_files:
+            continue
+        # files written before a column was added read back with it as null
+        table = ds.dataset(files, format="parquet", schema=file_schema).to_table()
+        tmp = os.path.join(root, f"_compact-{uuid.uuid4().hex}.tmp")
+        pq.write_table(table, tmp)
+        # readers may briefly see both copies, never neither
+        os.replace(tmp, os.path.join(root, f"part-{uuid.uuid4().hex}-0.parquet"))
+        for f in files:
+            os.remove(f)
+        before += len(files)
+        after += 1
+    return before, after
+
+# =====================================================
+# IMPORT EXISTING OUTPUTS
+# =====================================================
+def import_xlsx(path, store=STORE_DIR):
+    df = pd.read_excel(path)
+    if "Source" not in df.columns:
+        df["Source"] = os.path.basename(path)
+    return write_leads(df, store)
+
+
+def import_db(path, store=STORE_DIR, chunk=100_000):
+    total = 0
+    with sqlite3.connect(path) as con:
+        for df in pd.read_sql_query("SELECT * FROM leads", con, chunksize=chunk):
+            df["Source"] = "Google Maps"
+            total += write_leads(df, store)
+    return total
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    usage = (
+        "usage: python lead_store.py import <file.xlsx|leads.db>...\n"
+        "       python lead_store.py query [state] [city] [since]\n"
+        "       python lead_store.py count <column>\n"
+        "       python lead_store.py compact"
+    )
+    if len(sys.argv) < 2:
+        print(usage)
+        return
+
+    cmd, args = sys.argv[1], sys.argv[2:]
+    t0 = time.perf_counter()
+
+    if cmd == "import" and args:
+        for path in args:
+            n = import_db(path) if path.endswith(".db") else import_xlsx(path)
+            print(f"📥 {path}: {n} rows")
+    elif cmd == "query":
+        state, city, since = (args + [None] * 3)[:3]
+        df = read_leads(state=state, city=city, since=since)
+        print(df.head(20).to_string())
+        print(f"🔎 {len(df)} rows")
+    elif cmd == "count" and args:
+        for k, v in sorted(count_by(args[0]).items(), key=lambda x: -x[1]):
+            print(f"{k}: {v}")
+    elif cmd == "compact":
+        before, after = compact()
+        print(f"🗜️ {before} files → {after}")
+    else:
+        print(usage)
+        return
+
+    print(f"⏱️ {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
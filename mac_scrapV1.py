@@ -1,6 +1,5 @@
-import os, time, random, re, sqlite3
-from datetime import datetime
-from multiprocessing import Process, Lock
+import time, random, re
+from multiprocessing import Process, Lock, Queue
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -10,11 +9,17 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
+import autosize
+import lead_db
+from blocklist import is_blocked
+from browser_recycler import Recycler, profile_dir
+from selector_registry import get_registry
+
 # =========================
 # CONFIG
 # =========================
 DB_FILE = "leads.db"
-NUM_BROWSERS = max(2, os.cpu_count() - 1)
+NUM_BROWSERS = "auto"   # or a fixed count, e.g. max(2, os.cpu_count() - 1)
 
 WAIT_MIN, WAIT_MAX = 0.3, 0.7
 QUERY_COOLDOWN = (2, 4)
@@ -40,28 +45,28 @@ KEYWORDS = [
 db_lock = Lock()
 
 def init_db():
-    with sqlite3.connect(DB_FILE) as con:
-        con.execute("""
-            CREATE TABLE IF NOT EXISTS leads (
-                phone TEXT,
-                name TEXT,
-                query TEXT,
-                scraped_at TEXT,
-                UNIQUE(phone, name)
-            )
-        """)
+    # creates / migrates the places-contacts-queries schema (lead_db.py),
+    # including a legacy flat leads table from older runs
+    lead_db.connect(DB_FILE).close()
+
+con = None   # one connection per worker process
 
-def save_lead(name, phone, query):
+
+def save_lead(name, phone, query, **extra):
+    global con
+    city = next((d for d in RAJASTHAN_DISTRICTS if query.endswith(d)), None)
+    rec = {"name": name, "phone": phone, "city": city, "state": "Rajasthan",
+           "source": "Google Maps", **extra}
     with db_lock:
-        with sqlite3.connect(DB_FILE) as con:
-            con.execute("""
-                INSERT OR IGNORE INTO leads VALUES (?,?,?,?)
-            """, (phone, name, query, datetime.now().isoformat()))
+        if con is None:
+            con = lead_db.connect(DB_FILE)
+        with con:
+            lead_db.save_lead(con, rec, query)
 
 # =========================
 # DRIVER
 # =========================
-def setup_driver():
+def setup_driver(worker_id):
     options = Options()
     options.add_argument("--headless=new")
     options.add_argument("--disable-gpu")
@@ -71,6 +76,7 @@ def setup_driver():
     options.add_argument("--disable-extensions")
     options.add_argument("--window-size=1920,1080")
     options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument(f"--user-data-dir={profile_dir(f'mac-{worker_id}')}")
 
     service = Service("/opt/homebrew/bin/chromedriver")
     return webdriver.Chrome(service=service, options=options)
@@ -100,7 +106,7 @@ def extract_phone(driver):
 
     for c in candidates:
         phone = re.sub(r"[^\d+]", "", c)
-        if len(phone) >= 10:
+        if len(phone) >= 10 and not is_blocked(phone):
             return phone
     return ""
 
@@ -115,11 +121,13 @@ def scrape_query(driver, query):
             EC.presence_of_element_located((By.XPATH, '//div[@role="article"]'))
         )
     except TimeoutException:
-        return
+        return 0
 
     seen = set()
+    selectors = get_registry()
     last_count = 0
     stall = 0
+    opened = 0   # cards whose detail panel loaded; autosize judges load per card
 
     while True:
         cards = driver.find_elements(By.XPATH, '//div[@role="article"]')
@@ -137,11 +145,10 @@ def scrape_query(driver, query):
         for card in cards:
             try:
                 driver.execute_script("arguments[0].click();", card)
-                WebDriverWait(driver, 8).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "DUwDvf"))
-                )
+                WebDriverWait(driver, 8).until(lambda d: selectors.present(d, "name"))
+                opened += 1
 
-                name = driver.find_element(By.CLASS_NAME, "DUwDvf").text.strip()
+                name = selectors.find(driver, "name")
                 if not name or name in seen:
                     continue
 
@@ -162,23 +169,97 @@ def scrape_query(driver, query):
         """)
         time.sleep(1)
 
+    return opened
+
 # =========================
 # WORKER
 # =========================
-def worker(queries):
-    driver = setup_driver()
+def worker(worker_id, queries):
+    driver = setup_driver(worker_id)
+    recycler = Recycler(driver)
 
     for q in queries:
         try:
             scrape_query(driver, q)
             time.sleep(random.uniform(*QUERY_COOLDOWN))
+            if recycler.should_recycle(driver):
+                driver = recycler.recycle(driver, setup_driver, worker_id, restore_url=False)
         except WebDriverException:
             try: driver.quit()
             except: pass
             time.sleep(random.uniform(*CRASH_COOLDOWN))
-            driver = setup_driver()
+            driver = setup_driver(worker_id)
+            recycler.reset(driver)
 
     driver.quit()
+    recycler.close()
+
+# =========================
+# AUTO-SIZED WORKER
+# =========================
+def auto_worker(worker_id, task_q, gate, stats_q):
+    driver = None
+    recycler = Recycler()
+
+    while True:
+        if not gate.allowed(worker_id):
+            # parked by the controller: give the browser memory back
+            if driver:
+                driver.quit()
+                driver = None
+            time.sleep(5)
+            continue
+
+        q = autosize.take(task_q, gate)
+        if q is autosize.DONE:
+            break
+
+        if driver is None:
+            driver = setup_driver(worker_id)
+            recycler.reset(driver)
+
+        t0 = time.time()
+        try:
+            cards = scrape_query(driver, q)
+            stats_q.put((time.time() - t0, cards, True))
+            time.sleep(random.uniform(*QUERY_COOLDOWN))
+            if recycler.should_recycle(driver):
+                driver = recycler.recycle(driver, setup_driver, worker_id, restore_url=False)
+        except WebDriverException:
+            stats_q.put((time.time() - t0, 0, False))
+            try: driver.quit()
+            except: pass
+            driver = None
+            time.sleep(random.uniform(*CRASH_COOLDOWN))
+
+    if driver:
+        driver.quit()
+    recycler.close()
+
+
+def probe_browser():
+    driver = setup_driver("probe")
+    driver.get("https://www.google.com/maps/search/MRF+dealer+Jaipur")
+    return driver.quit
+
+
+def run_auto(all_queries):
+    mem_mb, cores = autosize.probe(probe_browser)
+    start = autosize.pick_workers(mem_mb, cores)
+    ceiling = min(autosize.MAX_WORKERS, start * 2, len(all_queries))
+
+    task_q, stats_q = Queue(), Queue()
+    autosize.feed(task_q, all_queries, ceiling)
+
+    gate = autosize.Gate(start)
+    procs = [Process(target=auto_worker, args=(i, task_q, gate, stats_q)) for i in range(ceiling)]
+    for p in procs:
+        p.start()
+
+    autosize.control_loop(gate, stats_q, procs, autosize.AIMD(start, ceiling))
+
+    for p in procs:
+        p.join()
 
 # =========================
 # MAIN
@@ -186,12 +267,18 @@ def worker(queries):
 def main():
     init_db()
     all_queries = [f"{k} {d}" for d in RAJASTHAN_DISTRICTS for k in KEYWORDS]
+
+    if NUM_BROWSERS == "auto":
+        run_auto(all_queries)
+        print("🔥 SCRAPING COMPLETE")
+        return
+
     chunk = len(all_queries) // NUM_BROWSERS + 1
     chunks = [all_queries[i:i+chunk] for i in range(0, len(all_queries), chunk)]
 
     procs = []
-    for c in chunks[:NUM_BROWSERS]:
-        p = Process(target=worker, args=(c,))
+    for i, c in enumerate(chunks[:NUM_BROWSERS]):
+        p = Process(target=worker, args=(i, c))
         p.start()
         procs.append(p)
 
@@ -1,19 +1,28 @@
-import os, re, time, random, sqlite3
-from datetime import datetime
-from multiprocessing import Process, Lock, cpu_count
+import os, re, time, random
+from multiprocessing import Process, Lock, Queue
 
 from playwright.sync_api import sync_playwright, TimeoutError
 
+import autosize
+import lead_db
+import maps_xhr
+from blocklist import is_blocked
+from selector_registry import PlaywrightPage, get_registry
+
 # =========================
 # CONFIG
 # =========================
 DB_FILE = "leads.db"
-NUM_WORKERS = max(2, cpu_count() - 1)
+NUM_WORKERS = "auto"   # or a fixed count, e.g. max(2, os.cpu_count() - 1)
 
 WAIT_MIN, WAIT_MAX = 0.2, 0.5
 QUERY_COOLDOWN = (1.5, 3)
 CRASH_COOLDOWN = (8, 12)
 
+# "dom" clicks every card; "xhr" reads the feed's own search responses.
+# Stays "dom" until `python maps_xhr.py check` passes on fresh payloads.
+EXTRACT_MODE = "dom"
+
 # =========================
 # DATA
 # =========================
@@ -34,24 +43,23 @@ KEYWORDS = [
 db_lock = Lock()
 
 def init_db():
-    with sqlite3.connect(DB_FILE) as con:
-        con.execute("""
-            CREATE TABLE IF NOT EXISTS leads (
-                phone TEXT,
-                name TEXT,
-                query TEXT,
-                scraped_at TEXT,
-                UNIQUE(phone, name)
-            )
-        """)
+    # creates / migrates the places-contacts-queries schema (lead_db.py),
+    # including a legacy flat leads table from older runs
+    lead_db.connect(DB_FILE).close()
 
-def save_lead(name, phone, query):
+con = None   # one connection per worker process
+
+
+def save_lead(name, phone, query, **extra):
+    global con
+    city = next((d for d in RAJASTHAN_DISTRICTS if query.endswith(d)), None)
+    rec = {"name": name, "phone": phone, "city": city, "state": "Rajasthan",
+           "source": "Google Maps", **extra}
     with db_lock:
-        with sqlite3.connect(DB_FILE) as con:
-            con.execute(
-                "INSERT OR IGNORE INTO leads VALUES (?,?,?,?)",
-                (phone, name, query, datetime.now().isoformat())
-            )
+        if con is None:
+            con = lead_db.connect(DB_FILE)
+        with con:
+            lead_db.save_lead(con, rec, query)
 
 # =========================
 # PHONE EXTRACTION (STRONG)
@@ -74,7 +82,7 @@ def extract_phone(page):
 
     for c in candidates:
         phone = re.sub(r"[^\d+]", "", c or "")
-        if len(phone) >= 10:
+        if len(phone) >= 10 and not is_blocked(phone):
             return phone
     return ""
 
@@ -88,11 +96,14 @@ def scrape_query(page, query):
     try:
         page.wait_for_selector("div[role='article']", timeout=15000)
     except TimeoutError:
-        return
+        return 0
 
     seen = set()
+    selectors = get_registry()
+    view = PlaywrightPage(page)
     stall = 0
     last_count = 0
+    opened = 0   # cards whose detail panel loaded; autosize judges load per card
 
     while True:
         cards = page.locator("div[role='article']")
@@ -113,8 +124,9 @@ def scrape_query(page, query):
                 card = cards.nth(i)
                 card.click(timeout=3000)
 
-                page.wait_for_selector(".DUwDvf", timeout=8000)
-                name = page.locator(".DUwDvf").inner_text().strip()
+                view.wait_for("name", 8000)
+                opened += 1
+                name = selectors.find(view, "name")
 
                 if not name or name in seen:
                     continue
@@ -136,36 +148,167 @@ def scrape_query(page, query):
         """)
         time.sleep(0.8)
 
+    return opened
+
+# =========================
+# SCRAPE QUERY (NETWORK CAPTURE, NO CLICKS)
+# =========================
+def scrape_query_xhr(page, query):
+    found = {}
+
+    def sink(records):
+        for r in records:
+            found.setdefault(r["feature_id"] or r["name"], r)
+
+    detach = maps_xhr.attach_playwright(page, sink)
+    try:
+        url = f"https://www.google.com/maps/search/{query.replace(' ', '+')}"
+        page.goto(url, timeout=60000)
+
+        try:
+            page.wait_for_selector("div[role='article']", timeout=15000)
+        except TimeoutError:
+            return 0
+
+        stall = 0
+        last_count = 0
+        while stall < 3:
+            page.evaluate("""
+                const feed = document.querySelector("div[role='feed']");
+                if (feed) feed.scrollTop = feed.scrollHeight;
+            """)
+            # time.sleep would block Playwright's event loop, so no response
+            # (and no sink call) could arrive while we wait
+            page.wait_for_timeout(800)
+
+            if len(found) == last_count:
+                stall += 1
+            else:
+                stall = 0
+            last_count = len(found)
+    finally:
+        detach()
+
+    for r in found.values():
+        phone = re.sub(r"[^\d+]", "", r["phone"] or "")
+        if r["name"] and len(phone) >= 10 and not is_blocked(phone):
+            save_lead(
+                r["name"], phone, query,
+                place_id=r["place_id"] or r["feature_id"],
+                category=r["category"],
+                address=r["address"],
+                rating=r["rating"],
+                reviews=r["reviews"],
+                website=r["website"],
+            )
+    return len(found)
+
+
+def run_query(page, query):
+    # returns the number of cards read, for the autosize controller
+    if EXTRACT_MODE == "xhr":
+        return scrape_query_xhr(page, query)
+    return scrape_query(page, query)
+
 # =========================
 # WORKER
 # =========================
+def launch(p):
+    browser = p.chromium.launch(
+        headless=True,
+        args=[
+            "--disable-gpu",
+            "--disable-extensions",
+            "--disable-blink-features=AutomationControlled",
+            "--blink-settings=imagesEnabled=false"
+        ]
+    )
+
+    context = browser.new_context(
+        viewport={"width": 1920, "height": 1080},
+        user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 13_6)"
+    )
+
+    return browser, context.new_page()
+
+
 def worker(queries):
     with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,
-            args=[
-                "--disable-gpu",
-                "--disable-extensions",
-                "--disable-blink-features=AutomationControlled",
-                "--blink-settings=imagesEnabled=false"
-            ]
-        )
-
-        context = browser.new_context(
-            viewport={"width": 1920, "height": 1080},
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 13_6)"
-        )
-
-        page = context.new_page()
+        browser, page = launch(p)
 
         for q in queries:
             try:
-                scrape_query(page, q)
+                run_query(page, q)
+                time.sleep(random.uniform(*QUERY_COOLDOWN))
+            except Exception:
+                time.sleep(random.uniform(*CRASH_COOLDOWN))
+
+        browser.close()
+
+# =========================
+# AUTO-SIZED WORKER
+# =========================
+def auto_worker(worker_id, task_q, gate, stats_q):
+    with sync_playwright() as p:
+        browser = page = None
+
+        while True:
+            if not gate.allowed(worker_id):
+                # parked by the controller: give the browser memory back
+                if browser:
+                    browser.close()
+                    browser = page = None
+                time.sleep(5)
+                continue
+
+            q = autosize.take(task_q, gate)
+            if q is autosize.DONE:
+                break
+
+            if browser is None:
+                browser, page = launch(p)
+
+            t0 = time.time()
+            try:
+                cards = run_query(page, q)
+                stats_q.put((time.time() - t0, cards, True))
                 time.sleep(random.uniform(*QUERY_COOLDOWN))
             except Exception:
+                stats_q.put((time.time() - t0, 0, False))
                 time.sleep(random.uniform(*CRASH_COOLDOWN))
 
+        if browser:
+            browser.close()
+
+
+def probe_browser():
+    p = sync_playwright().start()
+    browser, page = launch(p)
+    page.goto("https://www.google.com/maps/search/MRF+dealer+Jaipur", timeout=60000)
+
+    def close():
         browser.close()
+        p.stop()
+    return close
+
+
+def run_auto(all_queries):
+    mem_mb, cores = autosize.probe(probe_browser)
+    start = autosize.pick_workers(mem_mb, cores)
+    ceiling = min(autosize.MAX_WORKERS, start * 2, len(all_queries))
+
+    task_q, stats_q = Queue(), Queue()
+    autosize.feed(task_q, all_queries, ceiling)
+
+    gate = autosize.Gate(start)
+    procs = [Process(target=auto_worker, args=(i, task_q, gate, stats_q)) for i in range(ceiling)]
+    for p in procs:
+        p.start()
+
+    autosize.control_loop(gate, stats_q, procs, autosize.AIMD(start, ceiling))
+
+    for p in procs:
+        p.join()
 
 # =========================
 # MAIN
@@ -174,6 +317,12 @@ def main():
     init_db()
 
     all_queries = [f"{k} {d}" for d in RAJASTHAN_DISTRICTS for k in KEYWORDS]
+
+    if NUM_WORKERS == "auto":
+        run_auto(all_queries)
+        print("🔥 PLAYWRIGHT SCRAPING COMPLETE")
+        return
+
     chunk = len(all_queries) // NUM_WORKERS + 1
     chunks = [all_queries[i:i+chunk] for i in range(0, len(all_queries), chunk)]
 
@@ -0,0 +1,242 @@
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+
+# =====================================================
+# CONFIG
+# =====================================================
+# responses that carry listing data while the feed scrolls
+URL_MARKERS = ("/search?tbm=map", "/maps/search/", "/maps/preview/place", "/maps/rpc/")
+XSSI_PREFIX = ")]}'"
+PAYLOAD_DIR = None        # set to a folder to keep raw payloads for `check`
+
+FEATURE_ID_RE = re.compile(r"^0x[0-9a-f]+:0x[0-9a-f]+$")
+STATE_RE = re.compile(r"window\.APP_INITIALIZATION_STATE\s*=\s*(\[.*?\]);window\.", re.S)
+
+# positions inside one place array
+FIELDS = {
+    "name": [(11,)],
+    "phone": [(178, 0, 0), (178, 0, 1, 1, 0)],
+    "address": [(39,), (18,)],
+    "website": [(7, 0)],
+    "category": [(13, 0)],
+    "rating": [(4, 7)],
+    "reviews": [(4, 8)],
+    "place_id": [(78,)],
+    "feature_id": [(10,)],
+    "lat": [(9, 2)],
+    "lng": [(9, 3)],
+}
+
+# fields a healthy payload should fill for most places (used by `check`)
+REQUIRED = {"name": 0.95, "address": 0.8, "category": 0.8, "phone": 0.5}
+
+# =====================================================
+# PAYLOAD PARSING
+# =====================================================
+def dig(obj, path):
+    for key in path:
+        try:
+            obj = obj[key]
+        except (IndexError, KeyError, TypeError):
+            return None
+    return obj
+
+
+def strip_xssi(text):
+    text = text.lstrip()
+    if text.startswith(XSSI_PREFIX):
+        text = text[len(XSSI_PREFIX):]
+    return text.lstrip()
+
+
+def loads(text):
+    # search responses end with a /*""*/ trailer after the JSON
+    return json.JSONDecoder().raw_decode(strip_xssi(text))[0]
+
+
+def load_payload(text):
+    # the first page of results is inlined in the HTML document itself
+    m = STATE_RE.search(text) if text.lstrip().startswith("<") else None
+    if m:
+        text = m.group(1)
+    try:
+        data = loads(text)
+    except ValueError:
+        return None
+    # search responses come wrapped as {"c":0,"d":")]}'\n[...]"}
+    if isinstance(data, dict) and isinstance(data.get("d"), str):
+        try:
+            data = loads(data["d"])
+        except ValueError:
+            return None
+    return data
+
+
+def looks_like_place(node):
+    return (
+        isinstance(node, list)
+        and len(node) > 40
+        and isinstance(dig(node, (11,)), str)
+        and isinstance(dig(node, (10,)), str)
+        and bool(FEATURE_ID_RE.match(node[10]))
+    )
+
+
+def find_places(data):
+    # walk the tree instead of trusting fixed outer offsets, which drift
+    # far more often than the layout of the place array itself
+    out, stack = [], [data]
+    while stack:
+        node = stack.pop()
+        if looks_like_place(node):
+            out.append(node)
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, str) and node.startswith(XSSI_PREFIX):
+            inner = load_payload(node)
+            if inner is not None:
+                stack.append(inner)
+    return out
+
+
+def place_record(place):
+    rec = {}
+    for field, paths in FIELDS.items():
+        value = None
+        for path in paths:
+            value = dig(place, path)
+            if value not in (None, "", []):
+                break
+        rec[field] = value
+    if isinstance(rec["reviews"], str):
+        rec["reviews"] = int(re.sub(r"\D", "", rec["reviews"]) or 0)
+    return rec
+
+
+def parse_payload(text):
+    data = load_payload(text)
+    if data is None:
+        return []
+    seen, records = set(), []
+    for place in find_places(data):
+        rec = place_record(place)
+        key = rec["feature_id"] or rec["name"]
+        if key in seen:
+            continue
+        seen.add(key)
+        records.append(rec)
+    return records
+
+
+def is_listing_response(url):
+    return any(m in url for m in URL_MARKERS)
+
+
+def keep_payload(url, text):
+    if not PAYLOAD_DIR:
+        return
+    os.makedirs(PAYLOAD_DIR, exist_ok=True)
+    name = hashlib.sha1(text.encode("utf-8", "ignore")).hexdigest()[:16] + ".json"
+    with open(os.path.join(PAYLOAD_DIR, name), "w", encoding="utf-8") as f:
+        json.dump({"url": url, "body": text}, f)
+
+# =====================================================
+# CAPTURE: PLAYWRIGHT
+# =====================================================
+def attach_playwright(page, sink):
+    # sink(records) is called for every listing payload as the feed scrolls
+    def on_response(response):
+        if not is_listing_response(response.url):
+            return
+        try:
+            text = response.text()
+        except Exception:
+            return
+        keep_payload(response.url, text)
+        records = parse_payload(text)
+        if records:
+            sink(records)
+
+    page.on("response", on_response)
+    return lambda: page.remove_listener("response", on_response)
+
+# =====================================================
+# CAPTURE: SELENIUM (CDP VIA PERFORMANCE LOG)
+# =====================================================
+def enable_selenium_capture(options):
+    # call on ChromeOptions before the driver is created
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+def drain_selenium(driver):
+    records = []
+    for entry in driver.get_log("performance"):
+        try:
+            msg = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        if msg.get("method") != "Network.responseReceived":
+            continue
+        url = msg["params"]["response"]["url"]
+        if not is_listing_response(url):
+            continue
+        try:
+            body = driver.execute_cdp_cmd(
+                "Network.getResponseBody", {"requestId": msg["params"]["requestId"]}
+            )["body"]
+        except Exception:
+            continue
+        keep_payload(url, body)
+        records.extend(parse_payload(body))
+    return records
+
+# =====================================================
+# OFFLINE CHECK (FORMAT DRIFT)
+# =====================================================
+def check(folder):
+    files = sorted(f for f in os.listdir(folder) if f.endswith(".json"))
+    total, filled = 0, {f: 0 for f in FIELDS}
+
+    for name in files:
+        with open(os.path.join(folder, name), encoding="utf-8") as f:
+            saved = json.load(f)
+        records = parse_payload(saved["body"])
+        if not records and is_listing_response(saved.get("url", "")):
+            print(f"⚠️ {name}: no places parsed")
+        total += len(records)
+        for rec in records:
+            for field, value in rec.items():
+                if value not in (None, "", []):
+                    filled[field] += 1
+
+    print(f"📦 {len(files)} payloads, {total} places")
+    ok = total > 0
+    for field, n in filled.items():
+        rate = n / total if total else 0.0
+        need = REQUIRED.get(field)
+        flag = ""
+        if need is not None and rate < need:
+            flag = f"  ❌ below {need:.0%}"
+            ok = False
+        print(f"   {field:<11} {rate:6.1%}{flag}")
+    return ok
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] != "check":
+        print("usage: python maps_xhr.py check <payload folder>")
+        return
+    t0 = time.perf_counter()
+    ok = check(sys.argv[2])
+    print(f"{'✅ parser OK' if ok else '❌ payload format drift'} ({time.perf_counter() - t0:.2f}s)")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
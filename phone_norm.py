@@ -0,0 +1,152 @@
+import re
+import sys
+import time
+
+import pandas as pd
+
+# =====================================================
+# CONFIG
+# =====================================================
+COUNTRY_CODE = "+91"
+
+# trunk / country prefixes in front of a 10 digit national number
+PREFIX_PATTERN = r"^(?:0091|091|91|0)(?=\d{10}$)"
+
+# "0141-2371234", "0291 2612345" -> STD code + subscriber number
+STD_PATTERN = r"^\s*\(?0\d{2,4}\)?[\s\-]\d{6,8}\s*$"
+
+# candidate numbers inside a free text field ("98290 12345 / 0141-2371234")
+MOBILE_PATTERN = r"(?<!\d)(?:(?:\+|\b00|\b)91[\s\-]?|\b0)?[6-9]\d{4}[\s\-]?\d{5}(?!\d)"
+LANDLINE_PATTERN = r"(?<!\d)(?:(?:\+|\b00|\b)91[\s\-]?|\b0)\(?[1-8]\d{1,3}\)?[\s\-]?\d{6,8}(?!\d)"
+CANDIDATE_PATTERN = f"{MOBILE_PATTERN}|{LANDLINE_PATTERN}"
+
+PREFIX_RE = re.compile(PREFIX_PATTERN)
+STD_RE = re.compile(STD_PATTERN)
+CANDIDATE_RE = re.compile(CANDIDATE_PATTERN)
+
+# =====================================================
+# SCALAR (FOR USE INSIDE SCRAPE LOOPS)
+# =====================================================
+def normalize_phone(text):
+    if text is None:
+        return None
+    digits = re.sub(r"\D", "", str(text))
+    national = PREFIX_RE.sub("", digits)
+    if len(national) != 10 or national[0] == "0":
+        return None
+    return COUNTRY_CODE + national
+
+
+def phone_type(text):
+    e164 = normalize_phone(text)
+    if not e164:
+        return None
+    if STD_RE.match(str(text)) or e164[3] in "12345":
+        return "landline"
+    return "mobile"
+
+
+def extract_phones(text):
+    if not text:
+        return []
+    out = []
+    for m in CANDIDATE_RE.findall(str(text)):
+        e164 = normalize_phone(m)
+        if e164 and e164 not in out:
+            out.append(e164)
+    return out
+
+# =====================================================
+# VECTORIZED (PANDAS)
+# =====================================================
+def to_text(s):
+    # excel hands us ints / floats for phone columns
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype("Int64").astype("string")
+    return s.astype("string").str.replace(r"\.0$", "", regex=True)
+
+
+def normalize_series(s):
+    national = (
+        to_text(s)
+        .str.replace(r"\D", "", regex=True)
+        .str.replace(PREFIX_PATTERN, "", regex=True)
+    )
+    valid = (national.str.len() == 10) & ~national.str.startswith("0")
+    return (COUNTRY_CODE + national).where(valid.fillna(False))
+
+
+def classify_series(s, e164=None):
+    if e164 is None:
+        e164 = normalize_series(s)
+    std = to_text(s).str.match(STD_PATTERN).fillna(False)
+    landline = std | e164.str[3].isin(list("12345"))
+    out = pd.Series(pd.NA, index=s.index, dtype="string")
+    out[e164.notna() & landline] = "landline"
+    out[e164.notna() & ~landline] = "mobile"
+    return out
+
+
+def extract_series(s):
+    # one row per (source row, distinct number found), indexed by source row
+    raw = to_text(s).str.extractall(f"({CANDIDATE_PATTERN})")[0].droplevel(1)
+    found = pd.DataFrame({"raw": raw, "e164": normalize_series(raw)})
+    found = found[found["e164"].notna()]
+    dup = pd.MultiIndex.from_arrays([found.index, found["e164"]]).duplicated()
+    return found[~dup]
+
+
+def normalize_frame(df, column="Phone"):
+    # Phone -> first valid number in E.164, Phone_Type, Phone_Extra for the rest
+    text = to_text(df[column])
+    if "Phone_Extra" in df.columns:
+        # frames that were saved before already moved their extras out of Phone
+        text = text.fillna("") + ", " + to_text(df["Phone_Extra"]).fillna("")
+    found = extract_series(text)
+    nth = found.groupby(level=0).cumcount()
+
+    first = found[nth == 0]
+    extra = found.loc[nth > 0, "e164"].groupby(level=0).agg(", ".join)
+
+    # keep whatever was there when no valid number could be read from it
+    df[column] = first["e164"].reindex(df.index).fillna(to_text(df[column]))
+    df["Phone_Type"] = classify_series(first["raw"], first["e164"]).reindex(df.index)
+    df["Phone_Extra"] = extra.reindex(df.index).fillna("")
+    return df
+
+# =====================================================
+# VECTORIZED (ARROW)
+# =====================================================
+def normalize_arrow(arr):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    national = pc.replace_substring_regex(pc.cast(arr, pa.string()), r"\D", "")
+    national = pc.replace_substring_regex(national, PREFIX_PATTERN, "")
+    valid = pc.and_(
+        pc.equal(pc.utf8_length(national), 10),
+        pc.invert(pc.starts_with(national, "0")),
+    )
+    e164 = pc.binary_join_element_wise(COUNTRY_CODE, national, "")
+    return pc.if_else(valid, e164, pa.scalar(None, pa.string()))
+
+# =====================================================
+# MAIN (BENCHMARK)
+# =====================================================
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    sample = pd.Series(
+        ["+91 98290 12345", "09829012345", "9829012345", "0141-2371234", "12345", None]
+        * (rows // 6)
+    )
+
+    t0 = time.perf_counter()
+    e164 = normalize_series(sample)
+    dt = time.perf_counter() - t0
+
+    print(f"⚡ {len(sample):,} rows in {dt:.2f}s ({len(sample) / dt:,.0f} rows/s)")
+    print(f"🔢 unique numbers: {e164.nunique()}")
+
+
+if __name__ == "__main__":
+    main()
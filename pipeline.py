@@ -0,0 +1,148 @@
+import time
+import threading
+from queue import Queue
+
+# =====================================================
+# CONFIG
+# =====================================================
+QUEUE_SIZE = 200        # per stage; a full queue blocks the stage before it
+REPORT_EVERY = 30       # seconds between stage reports, 0 = off
+
+_STOP = object()
+
+# =====================================================
+# STAGE
+# =====================================================
+class Stage:
+    # fn(item) may return one item, a list of items, or None to drop it.
+    # on_close() runs once after the last item, for flushing buffers.
+    def __init__(self, name, fn, workers=1, maxsize=QUEUE_SIZE, on_close=None):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.queue = Queue(maxsize=maxsize)
+        self.on_close = on_close
+        self.next = None
+        self.threads = []
+
+        self.lock = threading.Lock()
+        self.done = 0
+        self.errors = 0
+        self.busy = 0.0
+        self.max_depth = 0
+
+    def emit(self, out):
+        if self.next is None or out is None:
+            return
+        if isinstance(out, list):
+            for item in out:
+                self.next.put(item)
+        else:
+            self.next.put(out)
+
+    def put(self, item):
+        self.queue.put(item)
+        depth = self.queue.qsize()
+        with self.lock:
+            if depth > self.max_depth:
+                self.max_depth = depth
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                self.queue.put(_STOP)   # let sibling workers see it too
+                return
+            t0 = time.perf_counter()
+            try:
+                out = self.fn(item)
+            except Exception as e:
+                out = None
+                with self.lock:
+                    self.errors += 1
+                print(f"⚠️ [{self.name}] {e}")
+            dt = time.perf_counter() - t0
+            with self.lock:
+                self.done += 1
+                self.busy += dt
+            self.emit(out)
+
+    def start(self):
+        for i in range(self.workers):
+            t = threading.Thread(target=self.run, name=f"{self.name}-{i}", daemon=True)
+            t.start()
+            self.threads.append(t)
+
+    def stop(self):
+        self.queue.put(_STOP)
+        for t in self.threads:
+            t.join()
+        if self.on_close:
+            try:
+                self.emit(self.on_close())
+            except Exception as e:
+                print(f"⚠️ [{self.name}] close: {e}")
+
+    def stats(self):
+        with self.lock:
+            avg = self.busy / self.done * 1000 if self.done else 0.0
+            return {
+                "stage": self.name,
+                "done": self.done,
+                "errors": self.errors,
+                "queue": self.queue.qsize(),
+                "max_queue": self.max_depth,
+                "avg_ms": round(avg, 1),
+            }
+
+# =====================================================
+# PIPELINE
+# =====================================================
+class Pipeline:
+    def __init__(self, stages, report_every=REPORT_EVERY):
+        self.stages = stages
+        for a, b in zip(stages, stages[1:]):
+            a.next = b
+        self.report_every = report_every
+        self.fed = 0
+        self.blocked = 0.0
+        self.source_busy = 0.0
+        self._last = time.perf_counter()
+        self._stop_report = threading.Event()
+
+    def start(self):
+        for s in self.stages:
+            s.start()
+        if self.report_every:
+            threading.Thread(target=self._reporter, daemon=True).start()
+        return self
+
+    def put(self, item):
+        # called from the browser loop; time spent waiting here is back-pressure
+        now = time.perf_counter()
+        self.source_busy += now - self._last
+        self.stages[0].put(item)
+        self._last = time.perf_counter()
+        self.blocked += self._last - now
+        self.fed += 1
+
+    def close(self):
+        # stop stages front to back so every queued item is drained
+        for s in self.stages:
+            s.stop()
+        self._stop_report.set()
+        self.report()
+
+    def report(self):
+        avg = self.source_busy / self.fed * 1000 if self.fed else 0.0
+        print(f"📈 [source] fed={self.fed} avg_ms={avg:.1f} blocked_s={self.blocked:.1f}")
+        for s in self.stages:
+            st = s.stats()
+            print(
+                f"📈 [{st['stage']}] done={st['done']} errors={st['errors']} "
+                f"queue={st['queue']}/{st['max_queue']} avg_ms={st['avg_ms']}"
+            )
+
+    def _reporter(self):
+        while not self._stop_report.wait(self.report_every):
+            self.report()
@@ -0,0 +1,230 @@
+import sys
+import json
+import time
+import hashlib
+import importlib
+from concurrent.futures import ProcessPoolExecutor
+
+from lxml import html
+
+import lead_store
+from lead_scoring import score_lead
+from selector_registry import (
+    SelectorRegistry, LxmlElement, phone_value, rating_value, reviews_value
+)
+from snapshot_archive import Archive, ARCHIVE_FILE
+
+# =====================================================
+# CONFIG
+# =====================================================
+WORKERS = None           # None = one per core
+CHUNK = 2000             # snapshots per task
+STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reextract_state (
+    place_id TEXT PRIMARY KEY,
+    fields_hash TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+)
+"""
+
+# =====================================================
+# FIELD EXTRACTORS (THE LIVE SCRAPERS' SELECTOR CHAINS)
+# =====================================================
+_registry = None
+
+
+def registry():
+    # same chains as selector_registry.get_registry(), but no stats file:
+    # hits on old snapshots say nothing about today's markup
+    global _registry
+    if _registry is None:
+        _registry = SelectorRegistry(stats_file=None)
+    return _registry
+
+
+def find(tree, field):
+    return registry().find(LxmlElement(tree), field)
+
+
+def x_name(tree):
+    return find(tree, "name")
+
+
+def x_phone(tree):
+    return phone_value(find(tree, "phone"))
+
+
+def x_category(tree):
+    return find(tree, "category")
+
+
+def x_address(tree):
+    return find(tree, "address")
+
+
+def x_website(tree):
+    return find(tree, "website")
+
+
+def x_rating(tree):
+    return rating_value(find(tree, "rating"))
+
+
+def x_reviews(tree):
+    return reviews_value(find(tree, "reviews"))
+
+
+EXTRACTORS = {
+    "Brand_Name": x_name,
+    "Phone": x_phone,
+    "Category": x_category,
+    "Address": x_address,
+    "Website": x_website,
+    "Rating": x_rating,
+    "Reviews": x_reviews,
+}
+
+# =====================================================
+# WORKER
+# =====================================================
+def load_extractors(module_name):
+    if not module_name:
+        return EXTRACTORS
+    return importlib.import_module(module_name).EXTRACTORS
+
+
+def extract(content, extractors):
+    tree = html.fromstring(content)
+    out = {}
+    for field, fn in extractors.items():
+        try:
+            out[field] = fn(tree)
+        except Exception:
+            out[field] = None
+    return out
+
+
+def run_chunk(args):
+    path, rows, module_name = args
+    extractors = load_extractors(module_name)
+    archive = Archive(path)
+    out = []
+    for place_id, query, kind, h in rows:
+        content = archive.get(h)
+        if content:
+            out.append((place_id, query, extract(content, extractors)))
+    archive.close()
+    return out
+
+
+def chunks(rows, size):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def extract_all(path, module_name=None, workers=WORKERS, limit=None):
+    archive = Archive(path)
+    rows = list(archive.iter_snapshots(kind="panel"))
+    archive.close()
+    if limit:
+        rows = rows[:limit]
+
+    tasks = [(path, c, module_name) for c in chunks(rows, CHUNK)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(run_chunk, tasks):
+            yield from result
+
+# =====================================================
+# INCREMENTAL UPDATE OF THE LEAD STORE
+# =====================================================
+def fields_hash(fields):
+    return hashlib.sha1(json.dumps(fields, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def to_lead(place_id, query, fields):
+    # same enrichment as the live pipeline, so scores stay comparable
+    lead = dict(fields)
+    lead.update({
+        "Place_Id": place_id,
+        "Query": query,
+        "Source": "Re-extract",
+        "Scraped_At": time.strftime("%Y-%m-%d %H:%M:%S"),
+    })
+    # appended, not rewritten: lead_store reads back the newest row per Place_Id
+    return score_lead(lead)
+
+
+def run(path=ARCHIVE_FILE, module_name=None, workers=WORKERS, limit=None):
+    t0 = time.perf_counter()
+    archive = Archive(path)
+    archive.con.execute(STATE_SCHEMA)
+    known = dict(archive.con.execute("SELECT place_id, fields_hash FROM reextract_state"))
+
+    seen, changed, batch = 0, 0, []
+    for place_id, query, fields in extract_all(path, module_name, workers, limit):
+        seen += 1
+        h = fields_hash(fields)
+        if not place_id or known.get(place_id) == h:
+            continue
+        batch.append(to_lead(place_id, query, fields))
+        archive.con.execute(
+            "INSERT OR REPLACE INTO reextract_state VALUES (?, ?, datetime('now'))",
+            (place_id, h)
+        )
+        if len(batch) >= 50_000:
+            changed += lead_store.write_leads(batch)
+            archive.con.commit()
+            batch.clear()
+
+    if batch:
+        changed += lead_store.write_leads(batch)
+    archive.con.commit()
+    archive.close()
+
+    dt = time.perf_counter() - t0
+    print(f"🔁 {seen} snapshots re-parsed in {dt:.1f}s ({seen / dt:,.0f}/s), {changed} leads updated")
+
+# =====================================================
+# A/B AGAINST HISTORICAL SNAPSHOTS
+# =====================================================
+def ab(module_name, path=ARCHIVE_FILE, workers=WORKERS, limit=None, examples=3):
+    base = {p: f for p, _, f in extract_all(path, None, workers, limit)}
+    test = {p: f for p, _, f in extract_all(path, module_name, workers, limit)}
+
+    diffs = {field: [] for field in EXTRACTORS}
+    filled_a = {field: 0 for field in EXTRACTORS}
+    filled_b = {field: 0 for field in EXTRACTORS}
+    for place_id, a in base.items():
+        b = test.get(place_id, {})
+        for field in EXTRACTORS:
+            filled_a[field] += a.get(field) not in (None, "")
+            filled_b[field] += b.get(field) not in (None, "")
+            if a.get(field) != b.get(field):
+                diffs[field].append((place_id, a.get(field), b.get(field)))
+
+    print(f"🧪 {len(base)} places | baseline vs {module_name}")
+    for field, d in diffs.items():
+        print(f"   {field:<11} filled {filled_a[field]} → {filled_b[field]}, changed {len(d)}")
+        for place_id, old, new in d[:examples]:
+            print(f"      {place_id}: {old!r} → {new!r}")
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    usage = "usage: python reextract.py run [limit] | ab <extractor module> [limit]"
+    args = sys.argv[1:]
+    if not args:
+        print(usage)
+        return
+
+    if args[0] == "run":
+        run(limit=int(args[1]) if len(args) > 1 else None)
+    elif args[0] == "ab" and len(args) > 1:
+        ab(args[1], limit=int(args[2]) if len(args) > 2 else None)
+    else:
+        print(usage)
+
+
+if __name__ == "__main__":
+    main()
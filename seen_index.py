@@ -0,0 +1,192 @@
+import os
+import sys
+import sqlite3
+import hashlib
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from phone_norm import normalize_phone
+from snapshot_archive import place_id_from_url
+from selector_registry import get_registry
+
+# =====================================================
+# CONFIG
+# =====================================================
+INDEX_FILE = "seen_index.db"        # authoritative keys, shared by every process (WAL)
+BLOOM_FILE = "seen_index.bloom"     # memory-mapped front for fast "never seen"
+BLOOM_SLOTS = 1 << 25               # one byte per slot: 32 MB, ~0.5% false positives at 3M keys
+BLOOM_HASHES = 7
+MAX_AGE_DAYS = 90                   # businesses seen longer ago are scraped again
+KEYS_FIELD = "_seen_keys"           # a scraped row's keys ride along with it until it is saved
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    key TEXT PRIMARY KEY,
+    seen_at TEXT NOT NULL,
+    query TEXT
+)
+"""
+
+# =====================================================
+# KEYS
+# =====================================================
+# no name-based key: "MRF Tyres" and "MRF Tyre Shop" in one city share a
+# name key, and a collision here means a business is never scraped at all
+def keys_for(place_id=None, url=None, phone=None):
+    keys = []
+    place_id = place_id or place_id_from_url(url)
+    if place_id:
+        keys.append(f"pid:{place_id}")
+    e164 = normalize_phone(phone) if phone else None
+    if e164:
+        keys.append(f"ph:{e164}")
+    return keys
+
+
+def card_keys(card):
+    # from the result card alone, before any click
+    a = get_registry().find_element(card, "card_link")
+    if a is None:
+        return []
+    try:
+        return keys_for(url=a.get_attribute("href"))
+    except Exception:
+        return []
+
+
+def without_keys(row):
+    return {k: v for k, v in row.items() if k != KEYS_FIELD}
+
+# =====================================================
+# BLOOM FILTER (SHARED MEMMAP)
+# =====================================================
+def slots(key):
+    d = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    h1 = int.from_bytes(d[:8], "little")
+    h2 = int.from_bytes(d[8:], "little") | 1
+    return [(h1 + i * h2) % BLOOM_SLOTS for i in range(BLOOM_HASHES)]
+
+
+def open_bloom(path=BLOOM_FILE):
+    # every process maps the same file MAP_SHARED, so a slot written by one
+    # worker is visible to the others at once. a byte per slot (not a bit)
+    # means writers never read-modify-write, so concurrent adds cannot
+    # clobber each other into a false "never seen"
+    fresh = not os.path.exists(path)
+    if fresh:
+        with open(path, "wb") as f:
+            f.truncate(BLOOM_SLOTS)
+    return np.memmap(path, dtype=np.uint8, mode="r+", shape=(BLOOM_SLOTS,)), fresh
+
+# =====================================================
+# INDEX
+# =====================================================
+class SeenIndex:
+    def __init__(self, path=INDEX_FILE, bloom_path=BLOOM_FILE):
+        self.con = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.con.execute("PRAGMA journal_mode=WAL")
+        self.con.execute("PRAGMA synchronous=NORMAL")
+        self.con.execute(SCHEMA)
+        self.bloom, fresh = open_bloom(bloom_path)
+        if fresh:
+            self.rebuild()
+        self.hits = {"checked": 0, "bloom_negative": 0, "known": 0}
+        self.held = set()   # keys of rows scraped here but not saved yet
+
+    def rebuild(self):
+        self.bloom[:] = 0
+        for (key,) in self.con.execute("SELECT key FROM seen"):
+            self.bloom[slots(key)] = 1
+        self.bloom.flush()
+
+    def maybe(self, key):
+        return bool(self.bloom[slots(key)].all())
+
+    def seen_any(self, keys):
+        self.hits["checked"] += 1
+        if self.held.intersection(keys):
+            self.hits["known"] += 1
+            return True
+        candidates = [k for k in keys if self.maybe(k)]
+        if not candidates:
+            self.hits["bloom_negative"] += 1
+            return False
+        cutoff = (datetime.now() - timedelta(days=MAX_AGE_DAYS)).isoformat(timespec="seconds")
+        row = self.con.execute(
+            f"SELECT 1 FROM seen WHERE seen_at > ? AND key IN ({','.join('?' * len(candidates))}) LIMIT 1",
+            [cutoff, *candidates]
+        ).fetchone()
+        if row:
+            self.hits["known"] += 1
+        return row is not None
+
+    def hold(self, keys):
+        # this process skips them from now on; the index only learns them
+        # through add_saved(), once the row is safely written
+        self.held.update(keys)
+
+    def add(self, keys, query=None):
+        self.add_pairs([(k, query) for k in keys])
+
+    def add_saved(self, rows):
+        # rows that carry KEYS_FIELD have been written: mark them seen for everyone
+        self.add_pairs([(k, r.get("Query")) for r in rows for k in r.get(KEYS_FIELD) or ()])
+
+    def add_pairs(self, pairs):
+        if not pairs:
+            return
+        now = datetime.now().isoformat(timespec="seconds")
+        # slots first: a reader may then hit the db a moment early, never miss it
+        for k, _ in pairs:
+            self.bloom[slots(k)] = 1
+        self.con.executemany(
+            "INSERT OR REPLACE INTO seen (key, seen_at, query) VALUES (?, ?, ?)",
+            [(k, now, q) for k, q in pairs]
+        )
+        self.con.commit()
+        self.held.difference_update(k for k, _ in pairs)
+
+    def summary(self):
+        c = self.hits
+        return (f"👀 Seen-index: {c['checked']} cards checked, {c['known']} skipped as known, "
+                f"{c['bloom_negative']} cleared by the bloom filter alone")
+
+    def __len__(self):
+        return self.con.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def close(self):
+        self.bloom.flush()
+        self.con.close()
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    usage = "usage: python seen_index.py stats | rebuild | forget <days>"
+    if len(sys.argv) < 2:
+        print(usage)
+        return
+
+    index = SeenIndex()
+    cmd = sys.argv[1]
+    if cmd == "stats":
+        fill = float(np.count_nonzero(index.bloom)) / BLOOM_SLOTS
+        print(f"📇 {len(index):,} keys, bloom {fill:.2%} full "
+              f"(≈{fill ** BLOOM_HASHES:.3%} false positives)")
+    elif cmd == "rebuild":
+        index.rebuild()
+        print(f"🧱 Bloom rebuilt from {len(index):,} keys")
+    elif cmd == "forget" and len(sys.argv) > 2:
+        cutoff = (datetime.now() - timedelta(days=int(sys.argv[2]))).isoformat(timespec="seconds")
+        n = index.con.execute("DELETE FROM seen WHERE seen_at < ?", (cutoff,)).rowcount
+        index.con.commit()
+        index.rebuild()
+        print(f"🧹 Forgot {n:,} keys older than {sys.argv[2]} days")
+    else:
+        print(usage)
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+# not selectors.py: that name would shadow the stdlib module
+import os
+import re
+import sys
+import json
+import threading
+from collections import deque
+
+# =====================================================
+# CONFIG
+# =====================================================
+STATS_FILE = "selector_stats.json"   # hit counts survive restarts for the alert and report
+REORDER_EVERY = 25                   # lookups per field between re-sorts
+WINDOW = 50                          # recent lookups used for the collapse alert
+COLLAPSE_RATIO = 0.3                 # alert when recent rate < this × long-run rate
+MIN_HISTORY = 200                    # long-run lookups needed before alerting
+MIN_SAMPLES = 20                     # tries before a selector's own hit rate counts
+COLD_RATE = 0.5                      # assumed hit rate until then
+
+# selenium By values, spelled out so this module does not need selenium
+XPATH = "xpath"
+CLASS = "class name"
+CSS = "css selector"
+
+# field → fallback chain of (by, selector, attribute) in priority order; attribute
+# None = .text. The registry re-sorts each chain by measured hit rate; this
+# order is the starting point and breaks ties.
+CHAINS = {
+    "name": [
+        (CLASS, "DUwDvf", None),
+        (XPATH, '//div[@role="main"]//h1', None),
+    ],
+    "card_link": [
+        (CSS, "a.hfpxzc", None),
+        (XPATH, './/a[contains(@href,"/maps/place/")]', None),
+    ],
+    "card_name": [
+        (XPATH, './/a[contains(@class,"hfpxzc")]', "aria-label"),
+        (XPATH, './/a[contains(@href,"/maps/place/")]', "aria-label"),
+        (XPATH, './/div[contains(@class,"fontHeadlineSmall")]', None),
+    ],
+    "phone": [
+        (XPATH, "//button[contains(@aria-label,'Phone')]", None),
+        (XPATH, '//button[starts-with(@data-item-id,"phone:")]', "aria-label"),
+        (XPATH, '//button[contains(@aria-label,"Call")]', "aria-label"),
+        (XPATH, '//div[contains(@data-tooltip,"Call")]', None),
+        (XPATH, '//span[contains(text(),"+91")]', None),
+    ],
+    "category": [
+        (XPATH, "//button[contains(@aria-label,'Category')]", None),
+        (XPATH, '//button[contains(@jsaction,"category")]', None),
+    ],
+    "address": [
+        (XPATH, "//button[contains(@aria-label,'Address')]", None),
+        (XPATH, '//button[@data-item-id="address"]', "aria-label"),
+    ],
+    "website": [
+        (XPATH, "//a[contains(@aria-label,'Website')]", "href"),
+        (XPATH, '//a[@data-item-id="authority"]', "href"),
+    ],
+    "rating": [
+        (XPATH, "//span[@aria-label[contains(.,'stars')]]", "aria-label"),
+        (XPATH, '//div[contains(@class,"F7nice")]/span/span', None),
+    ],
+    "reviews": [
+        (XPATH, "//button[contains(@aria-label,'reviews')]", None),
+        (XPATH, "//span[@aria-label[contains(.,'reviews')]]", "aria-label"),
+    ],
+}
+
+# =====================================================
+# REGISTRY
+# =====================================================
+class SelectorRegistry:
+    def __init__(self, chains=CHAINS, stats_file=STATS_FILE):
+        self.stats_file = stats_file
+        self.lock = threading.Lock()
+        self.chains = {f: list(chain) for f, chain in chains.items()}
+        self.priority = {(f, s[1]): i for f, chain in chains.items() for i, s in enumerate(chain)}
+        self.hits = {}       # (field, selector) → [hits, tries]
+        self.totals = {}     # field → [found, lookups]
+        self.recent = {f: deque(maxlen=WINDOW) for f in chains}
+        self.alerted = set()
+        self.load()
+        for field in self.chains:
+            self.reorder(field)
+
+    def load(self):
+        if not self.stats_file or not os.path.exists(self.stats_file):
+            return
+        try:
+            with open(self.stats_file, encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        for field, per_sel in saved.get("selectors", {}).items():
+            for sel, counts in per_sel.items():
+                self.hits[(field, sel)] = counts
+        self.totals.update(saved.get("fields", {}))
+
+    def save(self):
+        if not self.stats_file:
+            return
+        with self.lock:
+            per_sel = {}
+            for (field, sel), counts in self.hits.items():
+                per_sel.setdefault(field, {})[sel] = counts
+            data = {"selectors": per_sel, "fields": self.totals}
+        tmp = self.stats_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp, self.stats_file)
+
+    def rate(self, field, sel):
+        hits, tries = self.hits.get((field, sel), (0, 0))
+        # too few tries to judge: rank as COLD_RATE, so declared order decides
+        return hits / tries if tries >= MIN_SAMPLES else COLD_RATE
+
+    def reorder(self, field):
+        # best measured hit rate first; declared priority breaks ties and
+        # orders the selectors that have not been tried enough yet
+        self.chains[field].sort(key=lambda s: (-self.rate(field, s[1]), self.priority[(field, s[1])]))
+
+    def record(self, field, sel, ok):
+        counts = self.hits.setdefault((field, sel), [0, 0])
+        counts[0] += ok
+        counts[1] += 1
+
+    def finish(self, field, found):
+        totals = self.totals.setdefault(field, [0, 0])
+        totals[0] += found
+        totals[1] += 1
+        recent = self.recent.setdefault(field, deque(maxlen=WINDOW))
+        recent.append(found)
+        if totals[1] % REORDER_EVERY == 0:
+            self.reorder(field)
+        self.check(field)
+
+    def check(self, field):
+        found, lookups = self.totals[field]
+        recent = self.recent[field]
+        if lookups < MIN_HISTORY or len(recent) < WINDOW:
+            return
+        long_run = found / lookups
+        now = sum(recent) / len(recent)
+        if now < long_run * COLLAPSE_RATIO:
+            if field not in self.alerted:
+                self.alerted.add(field)
+                print(f"🚨 Selector collapse: '{field}' hit {now:.0%} of the last {WINDOW} "
+                      f"lookups vs {long_run:.0%} long-run, Maps markup probably changed")
+        elif field in self.alerted:
+            self.alerted.discard(field)
+            print(f"✅ Selector '{field}' recovered ({now:.0%})")
+
+    def value_of(self, el, attr):
+        return (el.get_attribute(attr) if attr else el.text) or ""
+
+    def find_all(self, ctx, field):
+        # every match of the first selector down the chain that matches;
+        # ctx is a driver or an element, find_elements never raises on a miss
+        with self.lock:
+            chain = list(self.chains[field])
+        for by, sel, _ in chain:
+            try:
+                els = ctx.find_elements(by, sel)
+            except Exception:
+                els = []
+            with self.lock:
+                self.record(field, sel, bool(els))
+                if els:
+                    self.finish(field, True)
+                    return els
+        with self.lock:
+            self.finish(field, False)
+        return []
+
+    def find_element(self, ctx, field):
+        els = self.find_all(ctx, field)
+        return els[0] if els else None
+
+    def find(self, ctx, field, validate=None):
+        # first non-empty value down the chain; validate(value) may reject it
+        # (returning a falsy value) and so move on to the next selector
+        with self.lock:
+            chain = list(self.chains[field])
+        for by, sel, attr in chain:
+            value = ""
+            try:
+                els = ctx.find_elements(by, sel)
+                if els:
+                    value = self.value_of(els[0], attr).strip()
+                    if validate and value:
+                        value = validate(value)
+            except Exception:
+                value = ""
+            with self.lock:
+                self.record(field, sel, bool(value))
+                if value:
+                    self.finish(field, True)
+                    return value
+        with self.lock:
+            self.finish(field, False)
+        return ""
+
+    def present(self, ctx, field):
+        # for WebDriverWait polling: no stats, a miss here is just "not yet"
+        for by, sel, _ in self.chains[field]:
+            try:
+                if ctx.find_elements(by, sel):
+                    return True
+            except Exception:
+                continue
+        return False
+
+    def report(self):
+        lines = []
+        for field, chain in self.chains.items():
+            found, lookups = self.totals.get(field, (0, 0))
+            if not lookups:
+                continue
+            lines.append(f"   {field:<10} {found / lookups:6.1%} of {lookups}")
+            for _, sel, _ in chain:
+                hits, tries = self.hits.get((field, sel), (0, 0))
+                if tries:
+                    lines.append(f"      {hits / tries:6.1%} {tries:>7}  {sel}")
+        return "\n".join(lines)
+
+
+# =====================================================
+# PLAYWRIGHT ADAPTER
+# =====================================================
+def pw_selector(by, sel):
+    if by == CLASS:
+        return "." + sel
+    if by == XPATH:
+        return "xpath=" + sel
+    return sel
+
+
+class PlaywrightElement:
+    # the slice of selenium's WebElement the registry uses, over a locator
+    def __init__(self, locator):
+        self.locator = locator
+
+    @property
+    def text(self):
+        return self.locator.inner_text()
+
+    def get_attribute(self, name):
+        return self.locator.get_attribute(name)
+
+    def find_elements(self, by, sel):
+        loc = self.locator.locator(pw_selector(by, sel))
+        return [PlaywrightElement(loc.nth(i)) for i in range(loc.count())]
+
+
+class PlaywrightPage(PlaywrightElement):
+    # lets the registry's find / find_all / present drive a Playwright page
+    def __init__(self, page):
+        super().__init__(page)
+
+    def wait_for(self, field, timeout_ms, registry=None):
+        # waits for any selector in the chain; raises Playwright's TimeoutError
+        chain = (registry or get_registry()).chains[field]
+        loc = None
+        for by, sel, _ in chain:
+            one = self.locator.locator(pw_selector(by, sel))
+            loc = one if loc is None else loc.or_(one)
+        loc.first.wait_for(timeout=timeout_ms)
+
+
+# =====================================================
+# LXML ADAPTER (REEXTRACT OVER ARCHIVED PANEL HTML)
+# =====================================================
+class LxmlElement:
+    # the same slice of WebElement, over an lxml.html node
+    def __init__(self, node):
+        self.node = node
+
+    @property
+    def text(self):
+        return self.node.text_content()
+
+    def get_attribute(self, name):
+        return self.node.get(name)
+
+    def find_elements(self, by, sel):
+        if by == CLASS:
+            sel = f".//*[contains(concat(' ', normalize-space(@class), ' '), ' {sel} ')]"
+        if by == CSS:
+            found = self.node.cssselect(sel)
+        else:
+            found = self.node.xpath(sel)
+        return [LxmlElement(n) for n in found if hasattr(n, "text_content")]
+
+# =====================================================
+# FIELD VALUES (LIVE SCRAPERS AND REEXTRACT ALIKE)
+# =====================================================
+def phone_value(raw):
+    return re.sub(r"[^\d+\-\s]", "", raw or "").strip()
+
+
+def rating_value(raw):
+    # "4.3 stars", or "4,3" in a comma-decimal locale
+    try:
+        return float(raw.replace(",", ".").split()[0])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def reviews_value(raw):
+    digits = re.sub(r"\D", "", raw or "")
+    return int(digits) if digits else None
+
+
+_default = None
+
+
+def get_registry():
+    global _default
+    if _default is None:
+        _default = SelectorRegistry()
+    return _default
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    usage = "usage: python selector_registry.py report | reset"
+    if len(sys.argv) < 2:
+        print(usage)
+        return
+
+    cmd = sys.argv[1]
+    if cmd == "report":
+        text = get_registry().report()
+        print(text or "no selector stats yet")
+    elif cmd == "reset":
+        if os.path.exists(STATS_FILE):
+            os.remove(STATS_FILE)
+        print("🧹 Selector stats cleared")
+    else:
+        print(usage)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import os
+import sys
+import json
+import heapq
+import socket
+import time
+import threading
+
+import pandas as pd
+
+from phone_norm import normalize_phone, normalize_frame
+
+# =====================================================
+# CONFIG
+# =====================================================
+SHARD_ROOT = "shards"
+COMPACT_EVERY = 60       # seconds between background compactions
+MASTER_NAME = "_master.jsonl"
+OFFSETS_NAME = "_offsets.json"
+LOCK_NAME = "_compact.lock"
+STALE_LOCK = 3600        # a lock older than this was left by a crashed compactor
+
+# =====================================================
+# DEDUPE KEYS
+# =====================================================
+def key_phone_or_name(row):
+    # Multi_trade_Scrap: phone, or the brand name when there is no phone
+    phone = normalize_phone(row.get("Phone")) or str(row.get("Phone") or "").strip()
+    return phone or "name:" + str(row.get("Brand_Name") or "").strip()
+
+
+def key_phone_and_name(row):
+    # vdfz: same phone under two names are two leads
+    phone = normalize_phone(row.get("Phone")) or str(row.get("Phone") or "").strip()
+    return phone + "|" + str(row.get("Brand_Name") or "").strip()
+
+
+def key_phone_and_website(row):
+    # trade_scraper: one row per phone + website pair
+    phone = normalize_phone(row.get("Phone")) or str(row.get("Phone") or "").strip()
+    return phone + "|" + str(row.get("Website") or "").strip()
+
+# =====================================================
+# WRITER (ONE PER WORKER PROCESS)
+# =====================================================
+def shard_dir(output_file):
+    stem = os.path.splitext(os.path.basename(output_file))[0]
+    return os.path.join(SHARD_ROOT, stem)
+
+
+class ShardWriter:
+    def __init__(self, output_file):
+        self.dir = shard_dir(output_file)
+        os.makedirs(self.dir, exist_ok=True)
+        name = f"{socket.gethostname()}-{os.getpid()}.jsonl"
+        self.path = os.path.join(self.dir, name)
+
+    def write(self, rows):
+        if not rows:
+            return 0
+        data = "".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in rows)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(rows)
+
+# =====================================================
+# COMPACTOR (MAIN PROCESS ONLY)
+# =====================================================
+def read_new_lines(path, offset):
+    # only whole lines: a worker may be halfway through a write
+    with open(path, "rb") as f:
+        f.seek(offset)
+        chunk = f.read()
+    end = chunk.rfind(b"\n") + 1
+    rows = [json.loads(line) for line in chunk[:end].splitlines() if line.strip()]
+    return rows, offset + end
+
+
+def iter_master(path):
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            item = json.loads(line)
+            yield item["k"], 0, item["r"]
+
+
+def seed_master(output_file, master, keyfn):
+    # first compaction picks up whatever the old xlsx already holds
+    if os.path.exists(master) or not os.path.exists(output_file):
+        return
+    rows = pd.read_excel(output_file).astype(object).where(lambda d: d.notna(), None).to_dict("records")
+    run = sorted(((keyfn(r), r) for r in rows), key=lambda x: x[0])
+    with open(master, "w", encoding="utf-8") as f:
+        last = None
+        for k, r in run:
+            if k != last:
+                f.write(json.dumps({"k": k, "r": r}, ensure_ascii=False, default=str) + "\n")
+                last = k
+
+
+def compact(output_file, keyfn):
+    d = shard_dir(output_file)
+    if not os.path.isdir(d):
+        return 0
+
+    lock = os.path.join(d, LOCK_NAME)
+    if os.path.exists(lock) and time.time() - os.path.getmtime(lock) > STALE_LOCK:
+        os.remove(lock)
+    try:
+        fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return 0   # another compactor is running
+
+    try:
+        master = os.path.join(d, MASTER_NAME)
+        offsets_path = os.path.join(d, OFFSETS_NAME)
+        offsets = {}
+        if os.path.exists(offsets_path):
+            with open(offsets_path, encoding="utf-8") as f:
+                offsets = json.load(f)
+
+        seed_master(output_file, master, keyfn)
+
+        # every shard's new rows become one sorted run
+        runs, new_offsets, fresh = [], dict(offsets), 0
+        for name in sorted(os.listdir(d)):
+            if not name.endswith(".jsonl") or name.startswith("_"):
+                continue
+            rows, end = read_new_lines(os.path.join(d, name), offsets.get(name, 0))
+            new_offsets[name] = end
+            if rows:
+                fresh += len(rows)
+                runs.append(sorted(((keyfn(r), 1, r) for r in rows), key=lambda x: x[0]))
+
+        if not runs:
+            return 0
+
+        # streaming k-way merge: master first on ties so existing rows win
+        tmp = master + ".tmp"
+        added = 0
+        with open(tmp, "w", encoding="utf-8") as out:
+            last = None
+            for k, src, r in heapq.merge(iter_master(master), *runs, key=lambda x: (x[0], x[1])):
+                if k == last:
+                    continue
+                last = k
+                added += src
+                out.write(json.dumps({"k": k, "r": r}, ensure_ascii=False, default=str) + "\n")
+        os.replace(tmp, master)
+
+        # offsets only move after the master is safely replaced
+        with open(offsets_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(new_offsets, f)
+        os.replace(offsets_path + ".tmp", offsets_path)
+
+        print(f"🗜️ Compacted {fresh} shard rows → {added} new unique")
+        return added
+    finally:
+        try:
+            os.close(fd)
+        finally:
+            os.remove(lock)
+
+
+def export(output_file):
+    master = os.path.join(shard_dir(output_file), MASTER_NAME)
+    rows = [r for _, _, r in iter_master(master)]
+    if not rows:
+        return 0
+    df = normalize_frame(pd.DataFrame(rows))
+    df.to_excel(output_file, index=False)
+    print(f"💾 Saved {len(df)} total records")
+    return len(df)
+
+
+class Compactor(threading.Thread):
+    # folds new shard rows into the master every `every` seconds until stop()
+    def __init__(self, output_file, keyfn, every=COMPACT_EVERY):
+        super().__init__(daemon=True)
+        self.output_file = output_file
+        self.keyfn = keyfn
+        self.every = every
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.every):
+            try:
+                compact(self.output_file, self.keyfn)
+            except Exception as e:
+                print(f"⚠️ Compaction failed: {e}")
+
+    def stop(self):
+        # waits out a compaction in progress so the caller's final one gets the lock
+        self.stopped.set()
+        self.join()
+
+
+def start_background(output_file, keyfn, every=COMPACT_EVERY):
+    compactor = Compactor(output_file, keyfn, every)
+    compactor.start()
+    return compactor
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    if len(sys.argv) < 2:
+        print("usage: python shards.py <output.xlsx> [phone_or_name|phone_and_name]")
+        return
+
+    output_file = sys.argv[1]
+    keyfn = key_phone_and_name if sys.argv[2:] == ["phone_and_name"] else key_phone_or_name
+    compact(output_file, keyfn)
+    export(output_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+import re
+import sys
+import json
+import time
+import sqlite3
+import asyncio
+from urllib.parse import urljoin, urlsplit
+
+import aiohttp
+
+from phone_norm import extract_phones
+from blocklist import is_blocked
+
+# =====================================================
+# CONFIG
+# =====================================================
+CONCURRENCY = 200          # open connections across all hosts
+PER_HOST = 2               # connections per host
+HOST_DELAY = 1.0           # seconds between requests to the same host
+DOMAIN_BUDGET = 20         # hard wall-clock cap per domain, all pages included
+PAGE_TIMEOUT = 10
+MAX_PAGES = 4              # homepage + contact/about pages
+MAX_BYTES = 1_500_000      # stop reading a page after this much
+READ_CHUNK = 64 * 1024
+CACHE_FILE = "site_cache.db"
+CACHE_DAYS = 30
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+# listing / social hosts: their pages say nothing about the business itself
+SKIP_DOMAINS = (
+    "justdial.com", "indiamart.com", "tradeindia.com", "facebook.com", "instagram.com",
+    "google.com", "google.co.in", "goo.gl", "linkedin.com", "twitter.com", "x.com",
+    "youtube.com", "wa.me",
+)
+
+CONTACT_WORDS = ("contact", "about", "reach", "enquiry", "support")
+GUESS_PATHS = ["/contact", "/contact-us", "/about", "/about-us"]
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}")
+GSTIN_RE = re.compile(r"\b\d{2}[A-Z]{5}\d{4}[A-Z][1-9A-Z]Z[0-9A-Z]\b")
+HREF_RE = re.compile(r"""<a\b[^>]*?href\s*=\s*["']([^"'#]+)["'][^>]*>(.*?)</a>""", re.I | re.S)
+TAG_RE = re.compile(r"<(script|style)\b.*?</\1>|<[^>]+>", re.I | re.S)
+SOCIAL_RE = re.compile(
+    r"https?://(?:www\.|m\.)?(facebook\.com|instagram\.com|linkedin\.com|twitter\.com|x\.com"
+    r"|youtube\.com|wa\.me|api\.whatsapp\.com)/[^\s\"'<>]+",
+    re.I,
+)
+ASSET_EXT = (".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".css", ".js")
+
+# =====================================================
+# EXTRACTION
+# =====================================================
+def domain_of(url):
+    if not url:
+        return ""
+    if "//" not in url:
+        url = "http://" + url
+    host = urlsplit(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def skipped(domain):
+    return any(domain == s or domain.endswith("." + s) for s in SKIP_DOMAINS)
+
+
+def extract(html):
+    text = TAG_RE.sub(" ", html)
+    emails = set()
+    for e in EMAIL_RE.findall(html):
+        e = e.lower().strip(".")
+        if not e.endswith(ASSET_EXT):     # retina assets look like logo@2x.png
+            emails.add(e)
+    return {
+        "emails": emails,
+        "phones": {p for p in extract_phones(text) if not is_blocked(p)},
+        "gstin": set(GSTIN_RE.findall(text.upper())),
+        "socials": {m.group(0).rstrip("/.,)") for m in SOCIAL_RE.finditer(html)},
+    }
+
+
+def contact_links(base_url, html):
+    host = urlsplit(base_url).netloc
+    links = []
+    for href, label in HREF_RE.findall(html):
+        url = urljoin(base_url, href.strip())
+        if urlsplit(url).netloc != host or url in links:
+            continue
+        hay = (href + " " + TAG_RE.sub(" ", label)).lower()
+        if any(w in hay for w in CONTACT_WORDS):
+            links.append(url)
+    return links
+
+# =====================================================
+# CACHE
+# =====================================================
+class Cache:
+    def __init__(self, path=CACHE_FILE):
+        self.con = sqlite3.connect(path)
+        self.con.execute("PRAGMA journal_mode=WAL")
+        self.con.execute(
+            "CREATE TABLE IF NOT EXISTS sites (domain TEXT PRIMARY KEY, result TEXT, fetched_at REAL)"
+        )
+
+    def get_many(self, domains):
+        cutoff = time.time() - CACHE_DAYS * 86400
+        out = {}
+        domains = list(domains)
+        for i in range(0, len(domains), 500):
+            chunk = domains[i:i + 500]
+            rows = self.con.execute(
+                f"SELECT domain, result FROM sites WHERE fetched_at > ? AND domain IN ({','.join('?' * len(chunk))})",
+                [cutoff, *chunk]
+            )
+            out.update((d, json.loads(r)) for d, r in rows)
+        return out
+
+    def put(self, domain, result):
+        self.con.execute(
+            "INSERT OR REPLACE INTO sites VALUES (?, ?, ?)",
+            (domain, json.dumps(result), time.time())
+        )
+
+    def close(self):
+        self.con.commit()
+        self.con.close()
+
+# =====================================================
+# CRAWLER
+# =====================================================
+class Crawler:
+    def __init__(self, session):
+        self.session = session
+        self.host_locks = {}
+        self.host_next = {}
+        self.stats = {"domains": 0, "pages": 0, "errors": 0, "timeouts": 0}
+
+    async def polite(self, host):
+        # one request at a time per host, HOST_DELAY apart
+        lock = self.host_locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            wait = self.host_next.get(host, 0) - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self.host_next[host] = time.monotonic() + HOST_DELAY
+
+    async def fetch(self, url):
+        await self.polite(urlsplit(url).netloc)
+        try:
+            async with self.session.get(url, allow_redirects=True) as resp:
+                self.stats["pages"] += 1
+                if resp.status != 200 or "html" not in resp.headers.get("Content-Type", "html"):
+                    return None, str(resp.url)
+                # read(n) only returns what is buffered so far, so keep
+                # reading until EOF or the cap
+                chunks, size = [], 0
+                async for chunk in resp.content.iter_chunked(READ_CHUNK):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= MAX_BYTES:
+                        break
+                body = b"".join(chunks)[:MAX_BYTES]
+                return body.decode(resp.charset or "utf-8", "ignore"), str(resp.url)
+        except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeError):
+            self.stats["errors"] += 1
+            return None, url
+
+    async def crawl_site(self, website, found):
+        # fills `found` as it goes, so a budget timeout keeps what was seen;
+        # False when even the homepage could not be fetched
+        start = website if "//" in website else "http://" + website
+        html, final = await self.fetch(start)
+        if html is None:
+            return False
+        pages = [final]
+        merge(found, extract(html))
+
+        queue = contact_links(final, html)
+        if not queue:
+            queue = [urljoin(final, p) for p in GUESS_PATHS]
+        for url in queue:
+            if len(pages) >= MAX_PAGES:
+                break
+            if url in pages:
+                continue
+            pages.append(url)
+            html, _ = await self.fetch(url)
+            if html:
+                merge(found, extract(html))
+        return True
+
+    async def crawl_domain(self, website):
+        # (result, ok); only ok results are worth caching, a failed, cut-short
+        # or empty crawl is tried again next run
+        found = {"emails": set(), "phones": set(), "gstin": set(), "socials": set()}
+        ok = False
+        try:
+            ok = await asyncio.wait_for(self.crawl_site(website, found), DOMAIN_BUDGET)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+        self.stats["domains"] += 1
+        result = {k: sorted(v) for k, v in found.items()}
+        return result, ok and any(result.values())
+
+
+def merge(found, new):
+    for k, v in new.items():
+        found[k] |= v
+
+
+async def crawl_async(websites):
+    # websites: {domain: url}; returns {domain: (result, ok)}
+    timeout = aiohttp.ClientTimeout(total=PAGE_TIMEOUT, sock_connect=5)
+    connector = aiohttp.TCPConnector(limit=CONCURRENCY, limit_per_host=PER_HOST, ttl_dns_cache=600)
+    headers = {"User-Agent": USER_AGENT, "Accept-Language": "en-IN,en;q=0.9"}
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector, headers=headers) as session:
+        crawler = Crawler(session)
+        sem = asyncio.Semaphore(CONCURRENCY)
+
+        async def one(domain, url):
+            async with sem:
+                return domain, await crawler.crawl_domain(url)
+
+        results = dict(await asyncio.gather(*(one(d, u) for d, u in websites.items())))
+    return results, crawler.stats
+
+
+def crawl(urls, cache_file=CACHE_FILE):
+    websites = {}
+    for url in urls:
+        d = domain_of(str(url).strip()) if url and str(url) != "nan" else ""
+        if d and not skipped(d):
+            websites.setdefault(d, str(url).strip())
+
+    cache = Cache(cache_file)
+    results = cache.get_many(websites)
+    todo = {d: u for d, u in websites.items() if d not in results}
+
+    if todo:
+        t0 = time.perf_counter()
+        fresh, stats = asyncio.run(crawl_async(todo))
+        cached = len(results)
+        for d, (r, ok) in fresh.items():
+            if ok:
+                cache.put(d, r)
+            results[d] = r
+        dt = time.perf_counter() - t0
+        print(f"🌐 Crawled {stats['domains']} sites / {stats['pages']} pages in {dt:.1f}s "
+              f"({stats['domains'] / dt * 3600:,.0f} sites/h), {stats['timeouts']} hit the budget, "
+              f"{cached} from cache")
+    cache.close()
+    return results
+
+# =====================================================
+# LEAD ENRICHMENT
+# =====================================================
+def enrich(leads, column="Website"):
+    # leads: list of dicts (updated in place) or a DataFrame (returned)
+    rows = leads.to_dict("records") if hasattr(leads, "to_dict") else leads
+    results = crawl(r.get(column) for r in rows)
+
+    for r in rows:
+        res = results.get(domain_of(str(r.get(column) or "")))
+        if not res:
+            continue
+        own = set(extract_phones(r.get("Phone")))
+        r["Emails"] = ", ".join(res["emails"])
+        r["Extra_Phones"] = ", ".join(p for p in res["phones"] if p not in own)
+        r["GSTIN"] = ", ".join(res["gstin"])
+        r["Socials"] = ", ".join(res["socials"])
+
+    if hasattr(leads, "to_dict"):
+        return type(leads)(rows)
+    return leads
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    import pandas as pd
+
+    if len(sys.argv) < 2:
+        print("usage: python site_crawl.py <leads.xlsx> [website column] | url ...")
+        return
+
+    if sys.argv[1].endswith(".xlsx"):
+        path = sys.argv[1]
+        column = sys.argv[2] if len(sys.argv) > 2 else "Website"
+        df = enrich(pd.read_excel(path), column)
+        out = path.replace(".xlsx", "_enriched.xlsx")
+        df.to_excel(out, index=False)
+        print(f"💾 Saved {out}")
+    else:
+        for domain, res in crawl(sys.argv[1:]).items():
+            print(domain, json.dumps(res, indent=1))
+
+
+if __name__ == "__main__":
+    main()
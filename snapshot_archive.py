@@ -0,0 +1,227 @@
+import re
+import sys
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+
+import zstandard as zstd
+
+# =====================================================
+# CONFIG
+# =====================================================
+ARCHIVE_FILE = "snapshots.db"
+LEVEL = 19                 # zstd level; compression runs off the browser thread
+DICT_SIZE = 112 * 1024     # trained dictionary size
+TRAIN_SAMPLES = 2000       # snapshots used to train it
+RECOMPRESS_BATCH = 500     # blobs read and rewritten per transaction
+
+# Maps place URLs carry the feature id as !1s0x...:0x...
+FEATURE_ID_RE = re.compile(r"!1s(0x[0-9a-f]+:0x[0-9a-f]+)")
+PLACE_ID_RE = re.compile(r"!19s(ChIJ[\w\-]+)")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    dict_id INTEGER NOT NULL DEFAULT 0,
+    raw_size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    place_id TEXT,
+    query TEXT,
+    kind TEXT NOT NULL,
+    hash TEXT NOT NULL REFERENCES blobs(hash),
+    captured_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_place ON snapshots(place_id);
+CREATE INDEX IF NOT EXISTS idx_snapshots_query ON snapshots(query);
+CREATE TABLE IF NOT EXISTS dicts (
+    id INTEGER PRIMARY KEY,
+    data BLOB NOT NULL,
+    created_at TEXT NOT NULL
+);
+"""
+
+# =====================================================
+# HELPERS
+# =====================================================
+def place_id_from_url(url):
+    if not url:
+        return None
+    m = PLACE_ID_RE.search(url) or FEATURE_ID_RE.search(url)
+    return m.group(1) if m else None
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+# =====================================================
+# ARCHIVE
+# =====================================================
+class Archive:
+    def __init__(self, path=ARCHIVE_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.con = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.con.execute("PRAGMA journal_mode=WAL")
+        self.con.executescript(SCHEMA)
+        self.dicts = {}
+        self.load_dict()
+
+    def load_dict(self):
+        row = self.con.execute("SELECT id, data FROM dicts ORDER BY id DESC LIMIT 1").fetchone()
+        self.dict_id = 0
+        self.cctx = zstd.ZstdCompressor(level=LEVEL)
+        if row:
+            self.dict_id = row[0]
+            d = self.get_dict(row[0])
+            self.cctx = zstd.ZstdCompressor(level=LEVEL, dict_data=d)
+
+    def get_dict(self, dict_id):
+        if dict_id not in self.dicts:
+            data = self.con.execute("SELECT data FROM dicts WHERE id = ?", (dict_id,)).fetchone()[0]
+            self.dicts[dict_id] = zstd.ZstdCompressionDict(data)
+        return self.dicts[dict_id]
+
+    def put(self, content, kind="panel", place_id=None, query=None):
+        if not content:
+            return None
+        raw = content.encode("utf-8") if isinstance(content, str) else content
+        h = content_hash(raw)
+
+        with self.lock:
+            exists = self.con.execute("SELECT 1 FROM blobs WHERE hash = ?", (h,)).fetchone()
+            if not exists:
+                self.con.execute(
+                    "INSERT INTO blobs (hash, dict_id, raw_size, data) VALUES (?,?,?,?)",
+                    (h, self.dict_id, len(raw), self.cctx.compress(raw))
+                )
+            self.con.execute(
+                "INSERT INTO snapshots (place_id, query, kind, hash, captured_at) VALUES (?,?,?,?,?)",
+                (place_id, query, kind, h, datetime.now().isoformat(timespec="seconds"))
+            )
+            self.con.commit()
+        return h
+
+    def decompress(self, dict_id, data):
+        if dict_id:
+            return zstd.ZstdDecompressor(dict_data=self.get_dict(dict_id)).decompress(data)
+        return zstd.ZstdDecompressor().decompress(data)
+
+    def get(self, h):
+        row = self.con.execute("SELECT dict_id, data FROM blobs WHERE hash = ?", (h,)).fetchone()
+        if not row:
+            return None
+        return self.decompress(row[0], row[1]).decode("utf-8")
+
+    def latest(self, place_id, kind="panel"):
+        row = self.con.execute(
+            "SELECT hash FROM snapshots WHERE place_id = ? AND kind = ? ORDER BY id DESC LIMIT 1",
+            (place_id, kind)
+        ).fetchone()
+        return self.get(row[0]) if row else None
+
+    def iter_snapshots(self, kind=None, query=None):
+        # latest snapshot per (place, kind); yields (place_id, query, kind, hash)
+        sql = """
+            SELECT place_id, query, kind, hash FROM snapshots
+            WHERE id IN (SELECT MAX(id) FROM snapshots GROUP BY COALESCE(place_id, hash), kind)
+        """
+        args = []
+        if kind:
+            sql += " AND kind = ?"
+            args.append(kind)
+        if query:
+            sql += " AND query = ?"
+            args.append(query)
+        yield from self.con.execute(sql, args)
+
+    def train(self):
+        # a dictionary trained on our own panels is what gets us to a few KB
+        rows = self.con.execute(
+            "SELECT dict_id, data FROM blobs ORDER BY RANDOM() LIMIT ?", (TRAIN_SAMPLES,)
+        ).fetchall()
+        samples = [self.decompress(d, b) for d, b in rows]
+        if len(samples) < 10:
+            print("⚠️ Not enough snapshots to train a dictionary yet")
+            return None
+        d = zstd.train_dictionary(DICT_SIZE, samples)
+        with self.lock:
+            cur = self.con.execute(
+                "INSERT INTO dicts (data, created_at) VALUES (?, ?)",
+                (d.as_bytes(), datetime.now().isoformat(timespec="seconds"))
+            )
+            self.con.commit()
+        self.load_dict()
+        return cur.lastrowid
+
+    def recompress(self):
+        # move older blobs onto the newest dictionary, one rowid page at a
+        # time so only RECOMPRESS_BATCH blobs are ever in memory
+        moved, last = 0, 0
+        while True:
+            with self.lock:
+                rows = self.con.execute(
+                    "SELECT rowid, dict_id, data FROM blobs WHERE rowid > ? AND dict_id != ? "
+                    "ORDER BY rowid LIMIT ?",
+                    (last, self.dict_id, RECOMPRESS_BATCH)
+                ).fetchall()
+                if not rows:
+                    break
+                for rowid, d, data in rows:
+                    raw = self.decompress(d, data)
+                    self.con.execute(
+                        "UPDATE blobs SET dict_id = ?, data = ? WHERE rowid = ?",
+                        (self.dict_id, self.cctx.compress(raw), rowid)
+                    )
+                self.con.commit()
+            moved += len(rows)
+            last = rows[-1][0]
+        return moved
+
+    def stats(self):
+        snaps, places = self.con.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT place_id) FROM snapshots"
+        ).fetchone()
+        blobs, raw, packed = self.con.execute(
+            "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+        ).fetchone()
+        return {
+            "snapshots": snaps,
+            "places": places,
+            "unique_blobs": blobs,
+            "raw_mb": round(raw / 1e6, 1),
+            "stored_mb": round(packed / 1e6, 1),
+            "kb_per_place": round(packed / 1e3 / places, 1) if places else 0.0,
+        }
+
+    def close(self):
+        self.con.close()
+
+# =====================================================
+# MAIN
+# =====================================================
+def main():
+    usage = "usage: python snapshot_archive.py stats | train | show <place_id>"
+    if len(sys.argv) < 2:
+        print(usage)
+        return
+
+    archive = Archive()
+    cmd = sys.argv[1]
+    if cmd == "stats":
+        print(archive.stats())
+    elif cmd == "train":
+        if archive.train():
+            print(f"🗜️ Recompressed {archive.recompress()} blobs → {archive.stats()}")
+    elif cmd == "show" and len(sys.argv) > 2:
+        print(archive.latest(sys.argv[2]) or "not found")
+    else:
+        print(usage)
+    archive.close()
+
+
+if __name__ == "__main__":
+    main()
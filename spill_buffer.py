@@ -0,0 +1,158 @@
+import os
+import json
+import threading
+
+# =====================================================
+# CONFIG
+# =====================================================
+FLUSH_EVERY = 20          # rows handed to the writer per flush, also the memory cap
+SPILL_DIR = "spill"       # one sub-folder per output file, see spill_dir_for()
+
+# =====================================================
+# PER-PID LOCKS
+# =====================================================
+# A process that spills holds <pid>.lock in the spill folder for as long as
+# it runs. replay_orphans only touches spill files whose lock it can take,
+# so a second script (or a second run) never replays rows that a live
+# process is still going to replay itself.
+_held = {}
+_held_lock = threading.Lock()
+
+
+def spill_dir_for(output_file):
+    stem = os.path.splitext(os.path.basename(output_file))[0]
+    return os.path.join(SPILL_DIR, stem)
+
+
+def try_lock(path):
+    # non-blocking exclusive lock; returns the open file, or None if held elsewhere
+    f = open(path, "a+")
+    try:
+        f.seek(0)
+        if os.name == "nt":
+            import msvcrt
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return None
+    return f
+
+
+def hold_pid_lock(spill_dir):
+    key = (os.getpid(), spill_dir)   # forked workers must take their own
+    with _held_lock:
+        if key not in _held:
+            os.makedirs(spill_dir, exist_ok=True)
+            _held[key] = try_lock(os.path.join(spill_dir, f"{os.getpid()}.lock"))
+
+# =====================================================
+# SPILL BUFFER
+# =====================================================
+class SpillBuffer:
+    # Holds at most flush_every records. Every flush_every rows the pending
+    # delta goes to flush_fn and is dropped from memory; if flush_fn fails
+    # the delta is appended to a per-process spill file instead and replayed
+    # on the next successful flush. Delivery is at least once, not exactly
+    # once: a flush_fn that fails part way gets the whole batch again, so its
+    # sinks must take repeats (shards dedupe on compaction, lead_db upserts by
+    # Place_Id / phone, lead_store reads back the newest row per Place_Id).
+    def __init__(self, flush_fn, flush_every=FLUSH_EVERY, spill_dir=SPILL_DIR):
+        self.flush_fn = flush_fn
+        self.flush_every = flush_every
+        self.spill_dir = spill_dir
+        self.rows = []
+        self.written = 0
+        self.spilled = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def spill_path(self):
+        # named after the process that spills, which may be a forked worker
+        return os.path.join(self.spill_dir, f"{os.getpid()}-{id(self):x}.jsonl")
+
+    def append(self, row):
+        with self.lock:
+            self.rows.append(row)
+            if len(self.rows) >= self.flush_every:
+                self._flush()
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        if os.path.exists(self.spill_path):
+            self._replay()
+
+        if not self.rows:
+            return
+        batch, self.rows = self.rows, []
+        try:
+            self.flush_fn(batch)
+            self.written += len(batch)
+        except Exception as e:
+            print(f"⚠️ Flush failed ({e}), spilling {len(batch)} rows to disk")
+            self._spill(batch)
+
+    def _spill(self, batch):
+        hold_pid_lock(self.spill_dir)
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            for row in batch:
+                f.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+        self.spilled += len(batch)
+
+    def _replay(self):
+        with open(self.spill_path, encoding="utf-8") as f:
+            batch = [json.loads(line) for line in f if line.strip()]
+        try:
+            self.flush_fn(batch)
+        except Exception:
+            return   # still failing; rows stay on disk, not in memory
+        os.remove(self.spill_path)
+        self.written += len(batch)
+        self.spilled -= len(batch)
+        print(f"♻️ Replayed {len(batch)} spilled rows")
+
+
+def replay_orphans(flush_fn, spill_dir=SPILL_DIR):
+    # spill files left behind by a crashed run; call before workers start
+    if not os.path.isdir(spill_dir):
+        return 0
+    names = sorted(os.listdir(spill_dir))
+    total = 0
+    for pid in sorted({n.split("-")[0] for n in names if n.endswith(".jsonl")}):
+        lock = try_lock(os.path.join(spill_dir, f"{pid}.lock"))
+        if lock is None:
+            continue   # that process is still running and replays its own rows
+        try:
+            for name in names:
+                if not name.startswith(pid + "-") or not name.endswith(".jsonl"):
+                    continue
+                path = os.path.join(spill_dir, name)
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        batch = [json.loads(line) for line in f if line.strip()]
+                    flush_fn(batch)
+                except Exception as e:
+                    # left on disk for the next run; the other files still go through
+                    print(f"⚠️ Could not replay {path}: {e}")
+                    continue
+                os.remove(path)
+                total += len(batch)
+        finally:
+            lock.close()
+        if not any(n.startswith(pid + "-") for n in os.listdir(spill_dir)):
+            os.remove(os.path.join(spill_dir, f"{pid}.lock"))
+    if total:
+        print(f"♻️ Recovered {total} rows from a previous run")
+    return total
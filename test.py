@@ -12,10 +12,17 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
+import consolidate
+import phone_norm
+import address_parser
+from blocklist import is_blocked
+from selector_registry import get_registry
+
 # =========================
 # CONFIG
 # =========================
 OUTPUT_FILE = "Auto_leads.xlsx"
+LEAD_DB = True               # also record every lead in leads.db (lead_db.py) for delta_export
 SAVE_EVERY = 50              # 🔥 SAVE AFTER EVERY 50 UNIQUE NUMBERS
 MAX_RESULTS_PER_KEYWORD = 30
 DELAY_RANGE = (3, 6)
@@ -63,7 +70,12 @@ def ensure_excel_exists():
             "Business Name",
             "Phone",
             "Keyword",
-            "Source"
+            "Source",
+            "Address",
+            "City",
+            "District",
+            "State",
+            "Pincode"
         ])
         df.to_excel(OUTPUT_FILE, index=False)
         print(f"📄 Created empty Excel file: {OUTPUT_FILE}")
@@ -76,7 +88,9 @@ def clean_phone(phone):
     if not phone:
         return None
     phone = re.sub(r"[^\d+]", "", phone)
-    return phone if len(phone) >= 10 else None
+    if len(phone) < 10 or is_blocked(phone):
+        return None
+    return phone
 
 # =========================
 # SAVE TO EXCEL (APPEND + DEDUPE)
@@ -87,8 +101,11 @@ def save_to_excel(new_rows):
 
     # Keep ONLY required fields
     new_df = pd.DataFrame(new_rows)[
-        ["Business Name", "Phone", "Keyword", "Source"]
+        ["Business Name", "Phone", "Keyword", "Source", "Address"]
     ]
+    address_parser.fill_frame(new_df)
+    if LEAD_DB:
+        consolidate.save_rows(new_df.to_dict("records"), "Google Maps")
 
     if os.path.exists(OUTPUT_FILE):
         existing_df = pd.read_excel(OUTPUT_FILE)
@@ -96,6 +113,8 @@ def save_to_excel(new_rows):
     else:
         combined = new_df
 
+    phone_norm.normalize_frame(combined)
+
     before = len(combined)
     combined.drop_duplicates(subset=["Phone"], inplace=True)
     after = len(combined)
@@ -109,6 +128,7 @@ def save_to_excel(new_rows):
 # =========================
 def scrape_keyword(driver, keyword):
     leads = []
+    selectors = get_registry()
 
     search_url = f"https://www.google.com/maps/search/{keyword.replace(' ', '+')}"
     driver.get(search_url)
@@ -128,12 +148,7 @@ def scrape_keyword(driver, keyword):
             # =========================
             # 1️⃣ BUSINESS NAME (FROM CARD)
             # =========================
-            try:
-                name = listing.find_element(
-                    By.XPATH, './/a[contains(@class,"hfpxzc")]'
-                ).get_attribute("aria-label")
-            except:
-                name = ""
+            name = selectors.find(listing, "card_name")
 
             if not name or name.lower() in ["results", "sponsored"]:
                 continue
@@ -147,6 +162,8 @@ def scrape_keyword(driver, keyword):
                 match = re.search(r'(\+91[\s\-]?)?\d{5}[\s\-]?\d{5}', card_text)
                 if match:
                     phone = clean_phone(match.group())
+                    if not phone:
+                        continue   # blocked number on the card, no click needed
             except:
                 pass
 
@@ -162,21 +179,7 @@ def scrape_keyword(driver, keyword):
             # 4️⃣ PHONE FROM DETAILS PANEL (FALLBACK)
             # =========================
             if not phone:
-                phone_xpaths = [
-                    '//button[contains(@aria-label,"Call")]',
-                    '//div[contains(@data-tooltip,"Call")]',
-                    '//span[contains(text(),"+91")]'
-                ]
-
-                for xp in phone_xpaths:
-                    try:
-                        elem = driver.find_element(By.XPATH, xp)
-                        raw = elem.get_attribute("aria-label") or elem.text
-                        phone = clean_phone(raw)
-                        if phone:
-                            break
-                    except:
-                        continue
+                phone = selectors.find(driver, "phone", validate=clean_phone)
 
             if not phone:
                 continue
@@ -184,22 +187,12 @@ def scrape_keyword(driver, keyword):
             # =========================
             # 5️⃣ CATEGORY
             # =========================
-            try:
-                category = driver.find_element(
-                    By.XPATH, '//button[contains(@aria-label,"Category")]'
-                ).text
-            except:
-                category = ""
+            category = selectors.find(driver, "category")
 
             # =========================
             # 6️⃣ ADDRESS
             # =========================
-            try:
-                address = driver.find_element(
-                    By.XPATH, '//button[contains(@aria-label,"Address")]'
-                ).text
-            except:
-                address = ""
+            address = selectors.find(driver, "address")
 
             leads.append({
                 "Business Name": name,
@@ -240,6 +233,7 @@ def main():
                 print(f"💾 Saved batch | New leads added: {added} | Total: {total_saved}")
                 buffer.clear()
 
+        get_registry().save()
         time.sleep(random.randint(*DELAY_RANGE))
 
     # Save remaining leads
@@ -12,10 +12,19 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
+import consolidate
+import entity_resolve
+import jd_fetch
+import phone_norm
+import address_parser
+from blocklist import is_blocked
+
 # =========================
 # CONFIG
 # =========================
 OUTPUT_FILE = "Master_Leads.xlsx"
+ENTITIES_FILE = "Master_Entities.xlsx"   # cross-source merged view
+LEAD_DB = True                           # also record every lead in leads.db (lead_db.py) for delta_export
 SAVE_EVERY = 50
 MAX_RESULTS = 30
 DELAY_RANGE = (3, 6)
@@ -60,12 +69,14 @@ def clean_phone(text):
     if not text:
         return None
     text = re.sub(r"[^\d+]", "", text)
-    return text if len(text) >= 10 else None
+    if len(text) < 10 or is_blocked(text):
+        return None
+    return text
 
 def ensure_excel():
     if not os.path.exists(OUTPUT_FILE):
         df = pd.DataFrame(columns=[
-            "Business Name", "Phone", "Keyword", "City", "Source"
+            "Business Name", "Phone", "Keyword", "City", "District", "State", "Source"
         ])
         df.to_excel(OUTPUT_FILE, index=False)
 
@@ -74,6 +85,11 @@ def save_rows(rows):
         return 0
 
     new_df = pd.DataFrame(rows)
+    # searched city → canonical city, district and state (no address here)
+    address_parser.fill_frame(new_df, "City")
+    new_df = new_df.drop(columns="Pincode")
+    if LEAD_DB:
+        consolidate.save_rows(new_df.to_dict("records"), "Google Maps")
 
     if os.path.exists(OUTPUT_FILE):
         old_df = pd.read_excel(OUTPUT_FILE)
@@ -81,6 +97,8 @@ def save_rows(rows):
     else:
         combined = new_df
 
+    phone_norm.normalize_frame(combined)
+
     before = len(combined)
     combined.drop_duplicates(subset=["Phone"], inplace=True)
     after = len(combined)
@@ -114,6 +132,8 @@ def scrape_google_maps(driver, keyword, city):
             match = re.search(r'(\+91[\s\-]?)?\d{5}[\s\-]?\d{5}', listing.text)
             if match:
                 phone = clean_phone(match.group())
+                if not phone:
+                    continue   # blocked number on the card, no click needed
 
             if not phone:
                 driver.execute_script("arguments[0].click();", listing)
@@ -147,31 +167,20 @@ def scrape_justdial(driver, keyword, city):
     city_slug = city.replace(" ", "-")
     keyword_slug = keyword.replace(" ", "-")
     url = f"https://www.justdial.com/{city_slug}/{keyword_slug}"
-    driver.get(url)
-    time.sleep(random.randint(5, 8))
 
-    try:
-        cards = driver.find_elements(By.CLASS_NAME, "resultbox_info")
-    except:
-        return leads
+    # plain HTTP first, Chrome only if the page is blocked or JS-only
+    cards = jd_fetch.fetch_listing(url, driver)
 
     for card in cards[:MAX_RESULTS]:
-        try:
-            name = card.find_element(By.CLASS_NAME, "resultbox_title_anchor").text
-            phone = card.find_element(By.CLASS_NAME, "callcontent").text
-            phone = clean_phone(phone)
-
-            if phone:
-                leads.append({
-                    "Business Name": name,
-                    "Phone": phone,
-                    "Keyword": keyword,
-                    "City": city,
-                    "Source": "Justdial"
-                })
-
-        except:
-            continue
+        phone = clean_phone(card["phone"])
+        if phone:
+            leads.append({
+                "Business Name": card["name"],
+                "Phone": phone,
+                "Keyword": keyword,
+                "City": city,
+                "Source": "Justdial"
+            })
 
     return leads
 
@@ -213,6 +222,12 @@ def main():
         total_added += added
 
     driver.quit()
+    print(f"📊 Justdial hit rate: {jd_fetch.hit_rate()}")
+
+    # Maps + Justdial rows for the same dealer → one entity with provenance
+    entities, compared = entity_resolve.resolve(pd.read_excel(OUTPUT_FILE))
+    entities.to_excel(ENTITIES_FILE, index=False)
+    print(f"🧩 Entities: {len(entities)} ({compared} name comparisons)")
     print(f"✅ DONE | Total Unique Leads: {total_added}")
 
 # =========================
@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("pandas")
+
+import address_parser
+from address_parser import PincodeIndex, parse_tail
+
+
+@pytest.fixture
+def index(tmp_path):
+    # bundled prefix table only, whatever pincodes.json sits in the cwd
+    return PincodeIndex(str(tmp_path / "none.json"))
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Ajmer Road, Bhankrota, Rajasthan 302026",
+     {"City": "Bhankrota", "District": "Jaipur", "State": "Rajasthan", "Pincode": "302026"}),
+    ("Sikar Road, Kishangarh, Rajasthan 305801",
+     {"City": "Kishangarh", "District": "Ajmer", "State": "Rajasthan", "Pincode": "305801"}),
+    ("Sonipat Rd, Rohtak, Haryana 124001",
+     {"City": "Rohtak", "District": None, "State": "Haryana", "Pincode": "124001"}),
+    ("Malviya Nagar, Jaipur, Rajasthan 302017",
+     {"City": "Jaipur", "District": "Jaipur", "State": "Rajasthan", "Pincode": "302017"}),
+    ("MI Road, Jaipur, Rajasthan",
+     {"City": "Jaipur", "District": "Jaipur", "State": "Rajasthan", "Pincode": None}),
+])
+def test_parse_tail(index, text, expected):
+    assert parse_tail(text, index) == expected
+
+
+def test_pincode_district_beats_the_city_name(index):
+    # Kota lies in another district than 302xxx: the city is not taken from it
+    got = parse_tail("Kota House, Bani Park, Rajasthan 302016", index)
+    assert got["District"] == "Jaipur"
+    assert got["City"] != "Kota"
+
+
+def test_parse_empty():
+    assert address_parser.parse(None) == dict.fromkeys(address_parser.OUTPUT_COLUMNS)
@@ -0,0 +1,61 @@
+import multiprocessing
+
+import pytest
+
+pytest.importorskip("psutil")
+
+import autosize
+
+
+def drain(worker_id, task_q, gate, out_q):
+    while True:
+        if not gate.allowed(worker_id):
+            continue
+        q = autosize.take(task_q, gate, timeout=0.05)
+        if q is autosize.DONE:
+            out_q.put(("done", worker_id))
+            return
+        out_q.put(("query", q))
+
+
+def test_every_query_taken_and_parked_workers_exit():
+    task_q, out_q = multiprocessing.Queue(), multiprocessing.Queue()
+    queries = [f"q{i}" for i in range(200)]
+    autosize.feed(task_q, queries, 4)
+
+    gate = autosize.Gate(2)    # workers 2 and 3 stay parked until the queue drains
+    procs = [multiprocessing.Process(target=drain, args=(i, task_q, gate, out_q)) for i in range(4)]
+    for p in procs:
+        p.start()
+    got = [out_q.get(timeout=30) for _ in range(len(queries) + 4)]
+    for p in procs:
+        p.join(30)
+        assert p.exitcode == 0
+
+    assert sorted(q for kind, q in got if kind == "query") == sorted(queries)
+    assert sorted(w for kind, w in got if kind == "done") == [0, 1, 2, 3]
+
+
+@pytest.fixture
+def calm(monkeypatch):
+    # no memory pressure on the test box
+    class Mem:
+        percent = 10
+    monkeypatch.setattr(autosize.psutil, "virtual_memory", lambda: Mem)
+
+
+def test_aimd_judges_seconds_per_card(calm):
+    c = autosize.AIMD(start=4, ceiling=8)
+    # one huge query and one tiny one: 2 s per card, sets the baseline
+    assert c.update([(240, 120), (6, 3)], 0, 2) == 5
+    # a single long query is not overload when the per-card time is unchanged
+    assert c.update([(300, 150)], 0, 1) == 6
+    # per-card time doubles: halve
+    assert c.update([(200, 50)], 0, 1) == 3
+    # too few cards to judge latency on, nothing else wrong
+    assert c.update([(90, 2)], 0, 1) == 4
+
+
+def test_aimd_backs_off_on_errors(calm):
+    c = autosize.AIMD(start=6, ceiling=8)
+    assert c.update([(60, 30)], 3, 4) == 3
@@ -0,0 +1,62 @@
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("psutil")
+
+import browser_recycler
+from browser_recycler import Recycler
+
+
+def fake_driver(pid=None):
+    process = SimpleNamespace(pid=pid or os.getpid())
+    return SimpleNamespace(service=SimpleNamespace(process=process))
+
+
+def test_tree_memory_is_measured():
+    mem = browser_recycler.tree_mem_mb(os.getpid())
+    assert 0 < mem < 10_000
+    assert browser_recycler.tree_mem_mb(None) == 0.0
+
+
+def test_samples_while_query_runs():
+    r = Recycler(fake_driver(), sample_every=0.01)
+    time.sleep(0.2)
+    assert len(r.samples) >= 3      # taken without any should_recycle call
+    assert r.peak > 0
+    r.close()
+    assert not r.thread.is_alive()
+
+
+def test_peak_since_last_check_triggers(monkeypatch):
+    monkeypatch.setattr(browser_recycler, "MIN_AGE", 0)
+    r = Recycler(fake_driver(), max_mem_mb=10_000, sample_every=0)
+    r.record(20_000)                # a spike in the middle of a query
+    assert r.should_recycle(fake_driver())
+    assert not r.should_recycle(fake_driver())
+
+
+def test_young_browser_is_kept():
+    r = Recycler(fake_driver(), max_mem_mb=0, sample_every=0)
+    assert not r.should_recycle(fake_driver())
+
+
+def test_profile_dir_is_per_process(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    root = tmp_path / browser_recycler.PROFILE_ROOT
+    dead = root / "worker-1-99999999"          # a run that died without cleaning up
+    dead.mkdir(parents=True)
+
+    path = browser_recycler.profile_dir(1)
+    assert path == browser_recycler.profile_dir(1)
+    assert os.listdir(root) == [f"worker-1-{os.getpid()}"]
+
+    r = Recycler(fake_driver(), sample_every=0)
+    quit_ = SimpleNamespace(current_url="", quit=lambda: None)
+    r.recycle(quit_, lambda: fake_driver())
+    assert os.listdir(root) == []
+    browser_recycler.profile_dir(1)
+    r.close()
+    assert os.listdir(root) == []
@@ -0,0 +1,126 @@
+import sqlite3
+import threading
+import multiprocessing
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import coordinator
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(coordinator, "STATE_FILE", str(tmp_path / "state.json"))
+    monkeypatch.setattr(coordinator, "STAGING_DIR", str(tmp_path / "staging"))
+    monkeypatch.setattr(coordinator, "LEAD_DB", str(tmp_path / "leads.db"))
+    monkeypatch.setattr(coordinator, "state", {"queries": {}, "leases": {}})
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), coordinator.Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def saved_leads():
+    con = sqlite3.connect(coordinator.LEAD_DB)
+    rows = con.execute("SELECT name, query FROM leads").fetchall()
+    con.close()
+    return rows
+
+
+def fake_worker(url, name, per_query):
+    # stands in for vdfz.leased_worker without Chrome
+    for lease_id, q in coordinator.iter_leases(url, name, idle_wait=0.05):
+        results = coordinator.LeaseUploader(url, lease_id, batch=3)
+        for i in range(per_query):
+            results.append({"Brand_Name": f"{q} #{i}", "Worker": name})
+        results.finish()
+
+
+def test_workers_share_queries(server):
+    pytest.importorskip("pandas")
+    queries = [f"MRF dealer {d}" for d in ("Ajmer", "Alwar", "Jaipur", "Kota", "Sikar", "Tonk")]
+    assert coordinator.call(server, "/queries", {"queries": queries})["added"] == len(queries)
+
+    procs = [
+        multiprocessing.Process(target=fake_worker, args=(server, f"w{i}", 7))
+        for i in range(3)
+    ]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+        assert p.exitcode == 0
+
+    progress = coordinator.call(server, "/progress")
+    assert progress["queries"]["done"] == len(queries)
+    assert progress["leads"] == 7 * len(queries)
+    assert progress["active_workers"] == []
+
+    leads = saved_leads()
+    assert sorted(name for name, _ in leads) == sorted(
+        f"{q} #{i}" for q in queries for i in range(7)
+    )
+    assert all(name.startswith(query) for name, query in leads)
+    assert coordinator.os.listdir(coordinator.STAGING_DIR) == []
+
+
+def test_lost_lease_is_reported(server):
+    coordinator.call(server, "/queries", {"queries": ["MRF dealer Bundi"]})
+    got = coordinator.lease(server, "w1")
+    results = coordinator.LeaseUploader(server, got["lease_id"], batch=2)
+    results.append({"Brand_Name": "a"})
+
+    # the lease expires and the query goes to another worker
+    with coordinator.state_lock:
+        coordinator.reclaim_expired(float("inf"))
+    with pytest.raises(coordinator.LeaseLost):
+        results.append({"Brand_Name": "b"})
+    with pytest.raises(coordinator.LeaseLost):
+        results.finish()
+
+
+def test_only_completed_leases_are_saved(server):
+    pytest.importorskip("pandas")
+    coordinator.call(server, "/queries", {"queries": ["MRF dealer Dausa"]})
+    first = coordinator.LeaseUploader(server, coordinator.lease(server, "w1")["lease_id"], batch=1)
+    first.append({"Brand_Name": "Dausa Tyres", "Phone": "9829011111"})
+    assert first.sent == 1
+    with coordinator.state_lock:
+        coordinator.reclaim_expired(float("inf"))
+    assert coordinator.staged(first.lease_id) == []
+
+    # the query goes out again and is scraped from the start
+    second = coordinator.LeaseUploader(server, coordinator.lease(server, "w2")["lease_id"], batch=1)
+    second.append({"Brand_Name": "Dausa Tyres", "Phone": "9829011111"})
+    second.append({"Brand_Name": "Bandikui Wheels", "Phone": "9829022222"})
+    assert len(coordinator.staged(second.lease_id)) == 2
+    assert not coordinator.os.path.exists(coordinator.LEAD_DB)
+    second.finish()
+    assert sorted(name for name, _ in saved_leads()) == ["Bandikui Wheels", "Dausa Tyres"]
+    assert coordinator.call(server, "/progress")["leads"] == 2
+
+
+def test_unreachable_coordinator(monkeypatch):
+    monkeypatch.setattr(coordinator, "RETRY_WAIT", 0)
+    results = coordinator.LeaseUploader("http://127.0.0.1:9", "lease", batch=1)
+    results.append({"Brand_Name": "a"})      # upload fails, lead is kept
+    assert results.pending == [{"Brand_Name": "a"}]
+    with pytest.raises(coordinator.CoordinatorError):
+        results.finish()
+
+
+def test_local_fields_stay_local_until_accepted(server):
+    pytest.importorskip("pandas")
+    coordinator.call(server, "/queries", {"queries": ["MRF dealer Churu"]})
+    got = coordinator.lease(server, "w1")
+    accepted = []
+    results = coordinator.LeaseUploader(server, got["lease_id"], batch=2, on_sent=accepted.extend)
+    results.append({"Brand_Name": "a", "_seen_keys": ["ph:+911"]})
+    assert accepted == []                    # nothing is marked before the upload
+    results.append({"Brand_Name": "b", "_seen_keys": ["ph:+912"]})
+    results.finish()
+    assert [r["_seen_keys"] for r in accepted] == [["ph:+911"], ["ph:+912"]]
+
+    assert coordinator.staged(got["lease_id"]) == []
+    assert sorted(name for name, _ in saved_leads()) == ["a", "b"]
@@ -0,0 +1,42 @@
+import pytest
+
+pytest.importorskip("pandas")
+openpyxl = pytest.importorskip("openpyxl")
+
+import consolidate
+import delta_export
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "leads.db")
+    rows = [
+        {"Brand_Name": "Shree Tyres", "Phone": "9829012345", "City": "Jaipur", "Query": "MRF Jaipur"},
+        {"Business Name": "Gupta Motors", "Phone": "9829054321", "Keyword": "MRF Kota"},
+        {"Brand_Name": "Jain Tyres & Co", "Phone": "9829000001", "Source": "Justdial"},
+    ]
+    assert consolidate.save_rows(rows, "Google Maps", path) == 3
+    return path
+
+
+def sheets(path):
+    wb = openpyxl.load_workbook(path, read_only=True)
+    out = {ws.title: [r for r in ws.iter_rows(values_only=True)] for ws in wb.worksheets}
+    wb.close()
+    return out
+
+
+def test_xlsx_delta_is_streamed_and_rolls_over(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(delta_export, "ROW_CAP", 2)
+    out = str(tmp_path / "delta.xlsx")
+    path, n = delta_export.export("crm", "xlsx", out, db=db)
+    assert (path, n) == (out, 3)
+
+    got = sheets(out)
+    assert list(got) == ["Delta", "Delta (2)"]
+    assert got["Delta"][0] == tuple(delta_export.COLUMNS)
+    names = [r[1] for rows in got.values() for r in rows[1:]]
+    assert sorted(names) == ["Gupta Motors", "Jain Tyres & Co", "Shree Tyres"]
+
+    # the cursor moved: nothing new on the next run
+    assert delta_export.export("crm", "xlsx", out, db=db) == (None, 0)
@@ -0,0 +1,61 @@
+import time
+
+import detail_tabs
+
+
+class FakeDriver:
+    # every tab "loads" its url after `delay` seconds; urls in `hang` never load
+    def __init__(self, delay=0.01, hang=()):
+        self.delay = delay
+        self.hang = set(hang)
+        self.tabs = {"t0": None}
+        self.current = "t0"
+        self.navigations = []
+        self.switch_to = self
+
+    @property
+    def current_window_handle(self):
+        return self.current
+
+    def new_window(self, kind):
+        self.current = f"t{len(self.tabs)}"
+        self.tabs[self.current] = None
+
+    def window(self, handle):
+        self.current = handle
+
+    def close(self):
+        del self.tabs[self.current]
+
+    def execute_script(self, js, *args):
+        if js == detail_tabs.NAVIGATE_JS:
+            self.navigations.append(args[0])
+            self.tabs[self.current] = (args[0], time.time())
+            return None
+        url, started = self.tabs[self.current]
+        loaded = url not in self.hang and time.time() - started >= self.delay
+        return not loaded
+
+
+def parse(driver, url):
+    return url.upper()
+
+
+def test_results_come_back_in_url_order(monkeypatch):
+    monkeypatch.setattr(detail_tabs, "POLL", 0.001)
+    driver = FakeDriver()
+    urls = [f"u{i}" for i in range(10)]
+    out = list(detail_tabs.fetch_details(driver, urls, parse, lambda d: True, tabs=3))
+    assert out == [u.upper() for u in urls]
+    assert list(driver.tabs) == ["t0"]          # extra tabs closed again
+
+
+def test_timed_out_place_is_retried_then_logged(monkeypatch, capsys):
+    monkeypatch.setattr(detail_tabs, "POLL", 0.001)
+    driver = FakeDriver(hang={"u1"})
+    out = list(detail_tabs.fetch_details(
+        driver, ["u0", "u1", "u2"], parse, lambda d: True, tabs=2, timeout=0.05, retries=1
+    ))
+    assert out == ["U0", None, "U2"]
+    assert driver.navigations.count("u1") == 2
+    assert "Gave up on u1" in capsys.readouterr().out
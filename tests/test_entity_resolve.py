@@ -0,0 +1,63 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+import entity_resolve
+
+
+def resolve(rows):
+    out, _ = entity_resolve.resolve(pd.DataFrame(rows))
+    return sorted(out["Brand_Name"]), out
+
+
+def lead(name, phone=None, city="Jaipur", source="maps"):
+    return {"Brand_Name": name, "Phone": phone, "City": city, "Source": source}
+
+
+def test_shared_surname_with_different_phones_stays_apart():
+    names, _ = resolve([lead("Sharma Traders", "9829011111"), lead("Sharma Agencies", "9829022222")])
+    assert names == ["Sharma Agencies", "Sharma Traders"]
+
+
+def test_shared_surname_without_phones_stays_apart():
+    names, _ = resolve([lead("Sharma Traders"), lead("Sharma Agencies")])
+    assert len(names) == 2
+
+
+def test_subset_name_is_not_the_same_business():
+    names, _ = resolve([lead("Jain Tyres"), lead("Jain Tyres and Batteries Wheels")])
+    assert len(names) == 2
+
+
+def test_legal_form_and_same_phone_merge():
+    names, out = resolve([
+        lead("Sharma Traders", "9829011111"),
+        lead("Sharma Traders Pvt Ltd", "+91 98290 11111", source="justdial"),
+        lead("Shree Ganpati Tyre House", None),
+        lead("Ganpati Tyre House Shree", None, source="justdial"),
+    ])
+    assert names == ["Sharma Traders Pvt Ltd", "Shree Ganpati Tyre House"]
+    assert out["Records"].tolist() == [2, 2]
+
+
+def test_no_merge_through_a_record_without_phone():
+    names, _ = resolve([
+        lead("Mahaveer Steel Traders", "9829011111"),
+        lead("Mahaveer Steel Traders"),
+        lead("Mahaveer Steel Traders Pvt Ltd", "9829022222"),
+    ])
+    assert len(names) == 2
+
+
+def test_same_name_in_another_city_stays_apart():
+    names, _ = resolve([lead("Sharma Traders"), lead("Sharma Traders", city="Kota")])
+    assert len(names) == 2
+
+
+def test_name_score():
+    score = entity_resolve.name_score
+    tok = lambda n: entity_resolve.distinctive(entity_resolve.name_tokens(n))
+    assert score(tok("Gupta Hari Om Auto"), tok("Hari Om Gupta Motors")) == 1.0
+    assert score(tok("Sharma Traders"), tok("Sharma Agencies")) == 0.0
+    assert score(tok("Jain Tyres"), tok("Jain Tyres and Batteries Wheels")) == 0.0
+    assert score(tok("Hari Om Gupta"), tok("Hari Om Gupta Kishangarh Bhilwara")) < entity_resolve.MATCH_SCORE
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+pytest.importorskip("pandas")
+openpyxl = pytest.importorskip("openpyxl")
+
+import lead_db
+import excel_export
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "leads.db")
+    con = lead_db.connect(path)
+    cities = ["Jaipur", "jaipur", None, "", "Kota"]
+    with con:
+        for i in range(23):
+            lead_db.save_lead(con, {"name": f"Shree Tyres {i:02d}", "phone": f"98290{i:05d}",
+                                    "city": cities[i % len(cities)], "state": "Rajasthan"})
+    con.close()
+    return path
+
+
+def read(path):
+    wb = openpyxl.load_workbook(path, read_only=True)
+    out = {ws.title: [r for r in ws.iter_rows(values_only=True)][1:] for ws in wb.worksheets}
+    wb.close()
+    return out
+
+
+def test_file_names_never_collide(db, tmp_path):
+    out = str(tmp_path / "files")
+    assert excel_export.export("City", "files", out, db=db, workers=2) == 23
+    files = sorted(os.listdir(out))
+    # NULL and '' are one "Unknown" file; Jaipur / jaipur get two files
+    assert len(files) == 4
+    assert "Unknown.xlsx" in files and "Kota.xlsx" in files
+    assert len({f.lower() for f in files}) == 4
+    rows = sum(len(rows) for f in files for rows in read(os.path.join(out, f)).values())
+    assert rows == 23
+
+
+def test_pieces_and_sheet_rollover_keep_order(db, tmp_path):
+    out = str(tmp_path / "all.xlsx")
+    assert excel_export.export(None, "sheets", out, db=db, cap=10, piece=3, workers=2) == 23
+    sheets = read(out)
+    assert list(sheets) == ["part_001", "part_002", "part_003"]
+    names = [r[0] for rows in sheets.values() for r in rows]
+    assert names == [f"Shree Tyres {i:02d}" for i in range(23)]
+    assert [len(rows) for rows in sheets.values()] == [10, 10, 3]
+
+
+def test_partition_bigger_than_a_sheet_rolls_over(db, tmp_path):
+    out = str(tmp_path / "state.xlsx")
+    excel_export.export("State", "sheets", out, db=db, cap=10, piece=4, workers=1)
+    sheets = read(out)
+    assert list(sheets) == ["Rajasthan", "Rajasthan (2)", "Rajasthan (3)"]
+    assert [len(rows) for rows in sheets.values()] == [10, 10, 3]
+
+
+def test_unique_names():
+    assert excel_export.unique_names(["Jaipur", "JAIPUR", None, "a/b", "a:b"], 80) == [
+        "Jaipur", "JAIPUR ~2", "None", "a_b", "a_b ~2"
+    ]
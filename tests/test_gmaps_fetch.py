@@ -0,0 +1,51 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+import blocklist
+import gmaps_fetch
+
+BLOCKED = "+91 99999 99776"      # in blocklist.ALWAYS_BLOCKED
+GOOD = "+91 98290 12345"
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    # empty blocklist files in a scratch dir; only ALWAYS_BLOCKED applies
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(blocklist, "_default", None)
+    monkeypatch.setattr(gmaps_fetch, "time", SimpleNamespace(sleep=lambda s: None))
+
+
+def place_page(phone, extra=""):
+    place = [None] * 179
+    place[11] = "Shree Tyres"
+    place[178] = [[phone]]
+    data = [None] * 7
+    data[6] = place
+    state = [[gmaps_fetch.XSSI_PREFIX + json.dumps(data)]]
+    return f"<script>window.APP_INITIALIZATION_STATE={json.dumps(state)};window.APP_FLAGS=[]</script>{extra}"
+
+
+def test_http_path_skips_blocked_numbers():
+    assert gmaps_fetch.parse_place(place_page(GOOD))["phone"] == "919829012345"
+    assert gmaps_fetch.parse_place(place_page(BLOCKED)) is None
+    page = place_page(BLOCKED, f'<a href="tel:{GOOD}">call</a>')
+    assert gmaps_fetch.parse_place(page)["phone"] == "919829012345"
+    assert gmaps_fetch.parse_place(f'<a href="tel:{BLOCKED}">call</a>') is None
+
+
+def test_browser_path_skips_blocked_numbers():
+    def driver(*texts):
+        els = [SimpleNamespace(text=t, get_attribute=lambda a: None) for t in texts]
+        return SimpleNamespace(get=lambda url: None, execute_script=lambda js: None,
+                               find_elements=lambda by, sel: els)
+
+    url = "https://www.google.com/maps/place/x"
+    assert gmaps_fetch.browser_place(driver(BLOCKED), url) is None
+    assert gmaps_fetch.browser_place(driver(BLOCKED, GOOD), url)["phone"] == "919829012345"
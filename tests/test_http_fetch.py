@@ -0,0 +1,51 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+import http_fetch
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    # counts how many requests are in flight at once
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(0.05)
+        with cls.lock:
+            cls.active -= 1
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+def test_pool_caps_concurrent_requests_per_host(monkeypatch):
+    monkeypatch.setattr(http_fetch, "POOL_SIZE", 2)
+    monkeypatch.setattr(http_fetch, "_session", None)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    try:
+        session = http_fetch.get_session()
+        with ThreadPoolExecutor(8) as pool:
+            codes = list(pool.map(lambda _: session.get(url, timeout=10).status_code, range(16)))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert codes == [200] * 16
+    assert SlowHandler.peak == 2
@@ -0,0 +1,80 @@
+import pytest
+
+pytest.importorskip("lxml")
+pytest.importorskip("requests")
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+import blocklist
+import jd_fetch
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    # empty blocklist files in a scratch dir; only ALWAYS_BLOCKED applies
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(blocklist, "_default", None)
+    monkeypatch.setattr(jd_fetch, "DELAY_RANGE", (0, 0))
+    for k in jd_fetch.stats:
+        monkeypatch.setitem(jd_fetch.stats, k, 0)
+
+
+def test_parse_listing_cards(fixture_text):
+    cards = jd_fetch.parse_listing(fixture_text("jd_listing.html"))
+    assert cards == [
+        {"name": "Shree Tyres", "phone": "09829012345"},
+        {"name": "MRF Tyre Shop", "phone": "919414012345"},
+        {"name": "Raj Auto Parts", "phone": None},
+    ]
+
+
+def test_blocked_first_number_does_not_hide_next(fixture_text):
+    assert jd_fetch.parse_phone(fixture_text("jd_detail.html")) == "01412371234"
+
+
+def test_parse_empty():
+    assert jd_fetch.parse_listing("") == []
+    assert jd_fetch.parse_phone(None) is None
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("jd_listing.html", False),
+    ("jd_blocked.html", True),
+    ("jd_shell.html", True),
+])
+def test_needs_browser(fixture_text, name, expected):
+    assert jd_fetch.needs_browser(200, fixture_text(name)) is expected
+
+
+def test_needs_browser_on_status():
+    assert jd_fetch.needs_browser(None, "")
+    assert jd_fetch.needs_browser(429, "resultbox_info")
+
+
+def test_fetch_over_http(fixture_server):
+    cards = jd_fetch.fetch_listing(f"{fixture_server}/jd_listing.html")
+    assert [c["name"] for c in cards] == ["Shree Tyres", "MRF Tyre Shop", "Raj Auto Parts"]
+    assert jd_fetch.fetch_phone(f"{fixture_server}/jd_detail.html") == "01412371234"
+    assert jd_fetch.stats["http"] == 2
+
+
+def test_fetch_falls_back_to_browser(fixture_server, fixture_text, monkeypatch):
+    class Driver:
+        page_source = fixture_text("jd_detail.html")
+
+        def get(self, url):
+            self.url = url
+
+        def execute_script(self, script):
+            pass
+
+    monkeypatch.setattr(jd_fetch.time, "sleep", lambda s: None)
+    phone = jd_fetch.fetch_phone(f"{fixture_server}/jd_shell.html", Driver())
+    assert phone == "01412371234"
+    assert jd_fetch.stats["browser"] == 1
+
+
+def test_fetch_miss(fixture_server):
+    assert jd_fetch.fetch_phone(f"{fixture_server}/jd_blocked.html") is None
+    assert jd_fetch.fetch_phone("not a url") is None
+    assert jd_fetch.stats["miss"] == 1
@@ -0,0 +1,56 @@
+import pytest
+
+pytest.importorskip("pandas")
+
+import lead_db
+
+
+@pytest.fixture
+def con(tmp_path):
+    c = lead_db.connect(str(tmp_path / "leads.db"))
+    yield c
+    c.close()
+
+
+def lead(name, phone=None, city="Jaipur"):
+    return {"name": name, "phone": phone, "city": city}
+
+
+def test_same_name_different_phone_stays_apart(con):
+    a = lead_db.save_lead(con, lead("Shree Tyres", "9829012345"))
+    b = lead_db.save_lead(con, lead("Shree Tyres", "9829054321"))
+    assert a != b
+
+
+def test_name_and_city_match_without_phone(con):
+    a = lead_db.save_lead(con, lead("Shree Tyres", "9829012345"))
+    assert lead_db.save_lead(con, lead("Shree Tyres")) == a
+    assert lead_db.save_lead(con, lead("Shree Tyres", "9829012345")) == a
+    assert lead_db.save_lead(con, lead("Shree Tyres", city="Kota")) != a
+
+
+def test_failed_migration_leaves_no_half_applied_step(tmp_path, monkeypatch):
+    path = str(tmp_path / "old.db")
+    monkeypatch.setattr(lead_db, "MIGRATIONS", lead_db.MIGRATIONS[:4])
+    c = lead_db.connect(path)
+    with c:
+        c.execute("INSERT INTO places (name, name_key, address, first_seen, last_seen) "
+                  "VALUES ('Shree Tyres', 'shree tyres', 'Jaipur, Rajasthan 302017', 'x', 'x')")
+    c.close()
+    monkeypatch.undo()
+
+    def broken(s):
+        raise RuntimeError("backfill failed")
+
+    monkeypatch.setattr(lead_db.address_parser, "parse_series", broken)
+    with pytest.raises(RuntimeError):
+        lead_db.connect(path)
+    c = lead_db.sqlite3.connect(path)
+    assert c.execute("PRAGMA user_version").fetchone()[0] == 4
+    assert "district" not in {r[1] for r in c.execute("PRAGMA table_info(places)")}
+    c.close()
+
+    monkeypatch.undo()
+    c = lead_db.connect(path)
+    assert c.execute("SELECT district, pincode FROM places").fetchone() == ("Jaipur", "302017")
+    c.close()
@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("pandas")
+
+import lead_scoring
+
+
+def lead(**kw):
+    base = {"Brand_Name": "", "Category": "", "Website": "", "Rating": None, "Reviews": None, "Address": ""}
+    base.update(kw)
+    return base
+
+
+def test_authorized_distributor_scores_high():
+    score, tier, status, signals = lead_scoring.evaluate_brand(
+        "Shree Tyres Pvt Ltd", "Authorized distributor", "https://shreetyres.in/", 4.5, 120
+    )
+    assert tier == "HIGH" and status == "APPROVED"
+    assert {"Legal Entity", "Official Website", "High Rating", "High Reviews"} <= set(signals)
+
+
+def test_reseller_on_aggregator_is_rejected():
+    score, tier, status, _ = lead_scoring.evaluate_brand(
+        "Tyre Shop", "Retailer", "https://www.justdial.com/x", 3.0, 4
+    )
+    assert score < 0 and tier == "LOW" and status == "REJECTED"
+
+
+def test_score_lead_fills_geo_and_keeps_address():
+    out = lead_scoring.score_lead(lead(Brand_Name="Shree Tyres", Address="Tonk Rd, Jaipur, Rajasthan 302015"))
+    assert out["Address"] == "Tonk Rd, Jaipur, Rajasthan 302015"
+    assert (out["City"], out["State"], out["Pincode"]) == ("Jaipur", "Rajasthan", "302015")
+    assert out["Confidence_Tier"] in ("HIGH", "MEDIUM", "LOW")
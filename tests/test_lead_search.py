@@ -0,0 +1,31 @@
+import pytest
+
+pytest.importorskip("pandas")
+
+import lead_db
+import lead_search
+
+
+@pytest.fixture
+def con(tmp_path):
+    c = lead_db.connect(str(tmp_path / "leads.db"))
+    with c:
+        lead_db.save_lead(c, {"name": "Sharma Tyre Agencies", "phone": "9829012345",
+                              "city": "Jaipur", "category": "Tyre shop"})
+        lead_db.save_lead(c, {"name": "Gupta Motors", "phone": "9829054321", "city": "Kota"})
+    yield c
+    c.close()
+
+
+def names(rows):
+    return [r["name"] for r in rows]
+
+
+def test_prefix_words(con):
+    assert names(lead_search.search(con, "tyre agen")) == ["Sharma Tyre Agencies"]
+
+
+def test_broken_fts_syntax_falls_back_to_quoted_words(con):
+    assert names(lead_search.search(con, 'sharma "')) == ["Sharma Tyre Agencies"]
+    assert names(lead_search.search(con, "gupta (")) == ["Gupta Motors"]
+    assert lead_search.search(con, '"') == []
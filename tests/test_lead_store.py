@@ -0,0 +1,91 @@
+import os
+
+import pytest
+
+pytest.importorskip("pyarrow")
+pytest.importorskip("pandas")
+
+import lead_store
+
+
+def leads(n, city="Jaipur"):
+    return [
+        {"Brand_Name": f"Shop {i}", "Phone": f"+9198290{i:05d}", "City": city,
+         "State": "Rajasthan", "Scraped_At": "2026-10-01 10:00:00"}
+        for i in range(n)
+    ]
+
+
+def parquet_files(store):
+    return [os.path.join(r, n) for r, _, names in os.walk(store) for n in names if n.endswith(".parquet")]
+
+
+def test_compact_folds_flush_files(tmp_path):
+    store = str(tmp_path / "store")
+    for _ in range(10):
+        lead_store.write_leads(leads(3), store)
+    lead_store.write_leads(leads(2, "Kota"), store)
+    assert len(parquet_files(store)) == 11
+
+    assert lead_store.compact(store, min_files=8) == (10, 1)
+    assert len(parquet_files(store)) == 2
+    assert lead_store.count_by("City", store) == {"Jaipur": 30, "Kota": 2}
+    df = lead_store.read_leads(store=store, city="Jaipur")
+    assert len(df) == 30 and df["Phone"].notna().all()
+
+
+def test_missing_store(tmp_path):
+    store = str(tmp_path / "nothing")
+    assert lead_store.count_by("City", store) == {}
+    assert lead_store.read_leads(store=store).empty
+    assert lead_store.compact(store) == (0, 0)
+
+
+def test_reextracted_rows_replace_older_ones_on_read(tmp_path):
+    store = str(tmp_path / "store")
+    first = leads(3)
+    for i, row in enumerate(first):
+        row.update(Place_Id=f"p{i}", Confidence_Tier="LOW")
+    lead_store.write_leads(first, store)
+    lead_store.write_leads([{"Brand_Name": "No id", "City": "Jaipur", "State": "Rajasthan"}] * 2, store)
+
+    # reextract writes a newer row for p1, in another partition
+    lead_store.write_leads([{
+        "Place_Id": "p1", "Brand_Name": "Shop 1 Pvt Ltd", "City": "Kota", "State": "Rajasthan",
+        "Confidence_Tier": "HIGH", "Source": "Re-extract", "Scraped_At": "2026-10-05 09:00:00",
+    }], store)
+
+    df = lead_store.read_leads(store=store)
+    assert len(df) == 5
+    assert df.loc[df["Place_Id"] == "p1", "Brand_Name"].tolist() == ["Shop 1 Pvt Ltd"]
+    assert lead_store.count_by("City", store) == {"Jaipur": 4, "Kota": 1}
+    # filters see only the newest row of each place
+    assert lead_store.read_leads(store=store, tier="LOW")["Place_Id"].tolist() == ["p0", "p2"]
+    assert len(lead_store.read_leads(store=store, latest=False)) == 6
+    # a city filter dedupes inside the Jaipur partitions only
+    assert len(lead_store.read_leads(["Brand_Name"], store=store, city="Jaipur")) == 5
+
+
+def test_partition_filters_prune_before_reading(tmp_path):
+    store = str(tmp_path / "store")
+    lead_store.write_leads(leads(3), store)
+    lead_store.write_leads(leads(2, "Kota"), store)
+    kota = next(os.path.dirname(f) for f in parquet_files(store) if "City=Kota" in f)
+    with open(os.path.join(kota, "part-broken-0.parquet"), "wb") as f:
+        f.write(b"not parquet")
+
+    assert len(lead_store.read_leads(store=store, city="Jaipur")) == 3
+    assert lead_store.count_by("City", store, city="Jaipur") == {"Jaipur": 3}
+    with pytest.raises(Exception):
+        lead_store.read_leads(store=store)
+
+
+def test_district_and_pincode_are_kept(tmp_path):
+    store = str(tmp_path / "store")
+    rows = leads(2)
+    rows[0].update(District="Jaipur", Pincode="302017")
+    lead_store.write_leads(rows, store)
+    df = lead_store.read_leads(store=store).sort_values("Brand_Name")
+    assert df["District"].tolist()[0] == "Jaipur"
+    assert df["Pincode"].tolist()[0] == "302017"
+    assert df["Pincode"].isna().tolist() == [False, True]
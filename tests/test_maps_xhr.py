@@ -0,0 +1,55 @@
+import os
+import json
+
+import maps_xhr
+
+PAYLOADS = os.path.join(os.path.dirname(__file__), "fixtures", "maps_payloads")
+
+
+def payload(name):
+    with open(os.path.join(PAYLOADS, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_search_response():
+    saved = payload("maps_search.json")
+    assert maps_xhr.is_listing_response(saved["url"])
+    records = maps_xhr.parse_payload(saved["body"])
+    assert [r["name"] for r in records] == ["Shree Tyres", "MRF Tyre Shop", "Raj Auto Parts"]
+
+    first = records[0]
+    assert first["phone"] == "098290 12345"
+    assert first["address"] == "Tonk Rd, Jaipur, Rajasthan 302015"
+    assert first["website"] == "https://shreetyres.in/"
+    assert first["category"] == "Tyre shop"
+    assert (first["rating"], first["reviews"]) == (4.4, 212)
+    assert first["place_id"] == "ChIJwbGy8va2bTkRIU0ajy9sHls"
+    assert first["feature_id"] == "0x396db3f6f2b1a9c1:0x5b1e6c2f8e1a4d21"
+    assert records[2]["phone"] is None
+
+
+def test_inline_first_page():
+    records = maps_xhr.parse_payload(payload("maps_search_page.json")["body"])
+    assert [r["name"] for r in records] == ["Shree Tyres"]
+
+
+def test_garbage_is_empty():
+    assert maps_xhr.parse_payload("") == []
+    assert maps_xhr.parse_payload("<html><body>consent</body></html>") == []
+    assert maps_xhr.parse_payload(")]}'\n[1, 2, 3]") == []
+
+
+def test_check_passes_on_fixtures():
+    assert maps_xhr.check(PAYLOADS)
+
+
+def test_check_flags_drift(tmp_path):
+    # the category moved: a layout change the parser no longer follows
+    saved = payload("maps_search.json")
+    data = maps_xhr.load_payload(saved["body"])
+    for place in maps_xhr.find_places(data):
+        place[13] = None
+    body = maps_xhr.XSSI_PREFIX + "\n" + json.dumps(data)
+    with open(tmp_path / "drift.json", "w", encoding="utf-8") as f:
+        json.dump({"url": saved["url"], "body": body}, f)
+    assert not maps_xhr.check(str(tmp_path))
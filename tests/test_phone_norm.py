@@ -0,0 +1,34 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+import phone_norm
+
+
+def test_normalize_frame_splits_extras():
+    df = pd.DataFrame({"Phone": ["98290 12345 / 0141-2371234, 9414012345", "12345", None]})
+    phone_norm.normalize_frame(df)
+    assert df["Phone"].tolist()[:2] == ["+919829012345", "12345"]
+    assert df["Phone_Type"].iloc[0] == "mobile"
+    assert df["Phone_Extra"].tolist() == ["+911412371234, +919414012345", "", ""]
+
+
+def test_normalize_frame_keeps_extras_across_saves():
+    df = pd.DataFrame({"Phone": ["98290 12345 / 0141-2371234"]})
+    phone_norm.normalize_frame(df)
+    # each save re-normalizes the combined frame
+    df = pd.concat([df, pd.DataFrame({"Phone": ["9414012345"]})], ignore_index=True)
+    phone_norm.normalize_frame(df)
+    phone_norm.normalize_frame(df)
+    assert df["Phone"].tolist() == ["+919829012345", "+919414012345"]
+    assert df["Phone_Extra"].tolist() == ["+911412371234", ""]
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("+91 98290 12345", "+919829012345"),
+    ("09829012345", "+919829012345"),
+    ("0141-2371234", "+911412371234"),
+    ("12345", None),
+])
+def test_normalize_phone(raw, expected):
+    assert phone_norm.normalize_phone(raw) == expected
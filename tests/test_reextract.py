@@ -0,0 +1,32 @@
+import pytest
+
+pytest.importorskip("lxml")
+pytest.importorskip("pyarrow")
+pytest.importorskip("pandas")
+
+import reextract
+
+PANEL = """
+<div role="main">
+  <h1>Shree Tyres</h1>
+  <button aria-label="Category: Tyre shop">Tyre shop</button>
+  <button data-item-id="address" aria-label="Address: Tonk Rd, Jaipur, Rajasthan 302015">Tonk Rd, Jaipur, Rajasthan 302015</button>
+  <button aria-label="Phone: 098290 12345">098290 12345</button>
+  <a aria-label="Website: shreetyres.in" href="https://shreetyres.in/">shreetyres.in</a>
+  <span aria-label="4,5 stars">4,5</span>
+  <button aria-label="128 reviews">(128)</button>
+</div>
+"""
+
+
+def test_extract_follows_the_live_fallback_chains():
+    fields = reextract.extract(PANEL, reextract.load_extractors(None))
+    assert fields == {
+        "Brand_Name": "Shree Tyres",           # h1 fallback, no DUwDvf class
+        "Phone": "098290 12345",
+        "Category": "Tyre shop",
+        "Address": "Tonk Rd, Jaipur, Rajasthan 302015",
+        "Website": "https://shreetyres.in/",
+        "Rating": 4.5,                         # comma decimal, as live
+        "Reviews": 128,
+    }
@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+import seen_index
+from seen_index import SeenIndex, KEYS_FIELD, keys_for, without_keys
+
+
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(seen_index, "BLOOM_SLOTS", 1 << 16)
+    return str(tmp_path / "seen.db"), str(tmp_path / "seen.bloom")
+
+
+def test_similar_names_do_not_collide():
+    a = keys_for(url="https://www.google.com/maps/place/MRF+Tyres/", phone="98290 12345")
+    b = keys_for(url="https://www.google.com/maps/place/MRF+Tyre+Shop/", phone="98290 54321")
+    assert not set(a) & set(b)
+
+
+def test_keys_count_only_after_save(paths):
+    mine, other = SeenIndex(*paths), SeenIndex(*paths)
+    keys = keys_for(phone="9829012345")
+    row = {"Brand_Name": "Shree Tyres", "Query": "MRF dealer Jaipur", KEYS_FIELD: keys}
+
+    mine.hold(keys)
+    assert mine.seen_any(keys)               # this worker will not scrape it twice
+    assert not other.seen_any(keys)          # but it is not saved anywhere yet
+
+    mine.add_saved([row])
+    assert other.seen_any(keys)
+    assert not mine.held
+    assert without_keys(row) == {"Brand_Name": "Shree Tyres", "Query": "MRF dealer Jaipur"}
+    mine.close()
+    other.close()
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import selector_registry
+from selector_registry import SelectorRegistry, CLASS, XPATH, CSS
+
+CHAINS = {
+    "name": [
+        (CLASS, "precise", None),
+        (XPATH, "//loose", None),
+    ],
+}
+
+
+class FakePage:
+    # only the selectors in `matches` find anything
+    def __init__(self, matches):
+        self.matches = matches
+
+    def find_elements(self, by, sel):
+        text = self.matches.get(sel)
+        return [SimpleNamespace(text=text, get_attribute=lambda a: None)] if text else []
+
+
+def registry():
+    return SelectorRegistry(CHAINS, stats_file=None)
+
+
+def order(reg):
+    return [s[1] for s in reg.chains["name"]]
+
+
+def test_better_hit_rate_moves_to_the_front():
+    reg = registry()
+    for _ in range(selector_registry.REORDER_EVERY * 2):
+        reg.find(FakePage({"//loose": "x"}), "name")
+    assert order(reg) == ["//loose", "precise"]
+    assert reg.find(FakePage({"precise": "Shop", "//loose": "Other"}), "name") == "Other"
+
+
+def test_declared_order_until_enough_samples():
+    reg = registry()
+    for _ in range(selector_registry.MIN_SAMPLES - 1):
+        reg.find(FakePage({"//loose": "x"}), "name")
+    reg.reorder("name")
+    assert order(reg) == ["precise", "//loose"]
+
+
+def test_declared_order_breaks_ties():
+    reg = registry()
+    for _ in range(selector_registry.MIN_SAMPLES):
+        reg.record("name", "//loose", True)
+        reg.record("name", "precise", True)
+    reg.reorder("name")
+    assert order(reg) == ["precise", "//loose"]
+
+
+def test_falls_back_down_the_chain():
+    reg = registry()
+    assert reg.find(FakePage({"//loose": "Shop"}), "name") == "Shop"
+    assert reg.find(FakePage({}), "name") == ""
+    assert reg.present(FakePage({"//loose": "Shop"}), "name")
+
+
+def test_playwright_selectors():
+    assert selector_registry.pw_selector(CLASS, "DUwDvf") == ".DUwDvf"
+    assert selector_registry.pw_selector(XPATH, "//h1") == "xpath=//h1"
+    assert selector_registry.pw_selector(CSS, "a.hfpxzc") == "a.hfpxzc"
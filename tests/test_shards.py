@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+pytest.importorskip("pandas")
+
+import shards
+
+
+@pytest.fixture(autouse=True)
+def scratch(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+def master_rows(output_file):
+    path = os.path.join(shards.shard_dir(output_file), shards.MASTER_NAME)
+    return [r for _, _, r in shards.iter_master(path)]
+
+
+def test_compact_dedupes_across_shards():
+    w = shards.ShardWriter("out.xlsx")
+    w.write([{"Brand_Name": "A", "Phone": "9829012345"}, {"Brand_Name": "B", "Phone": ""}])
+    w.path = w.path + ".other.jsonl"
+    w.write([{"Brand_Name": "A2", "Phone": "+91 98290 12345"}, {"Brand_Name": "B", "Phone": None}])
+
+    assert shards.compact("out.xlsx", shards.key_phone_or_name) == 2
+    assert sorted(r["Brand_Name"] for r in master_rows("out.xlsx")) == ["A", "B"]
+    # nothing new since the last run
+    assert shards.compact("out.xlsx", shards.key_phone_or_name) == 0
+
+
+def test_stop_joins_before_final_compact():
+    w = shards.ShardWriter("out.xlsx")
+    compactor = shards.start_background("out.xlsx", shards.key_phone_or_name, every=0.01)
+    for i in range(50):
+        w.write([{"Brand_Name": f"n{i}", "Phone": f"98290{i:05d}"}])
+    compactor.stop()
+    assert not compactor.is_alive()
+
+    # the background thread has released the lock, so this run is not skipped
+    shards.compact("out.xlsx", shards.key_phone_or_name)
+    assert len(master_rows("out.xlsx")) == 50
+    assert not os.path.exists(os.path.join(shards.shard_dir("out.xlsx"), shards.LOCK_NAME))
+
+
+def test_lock_released_on_error(monkeypatch):
+    shards.ShardWriter("out.xlsx").write([{"Brand_Name": "A", "Phone": "9829012345"}])
+
+    def boom(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(shards, "read_new_lines", boom)
+    with pytest.raises(OSError):
+        shards.compact("out.xlsx", shards.key_phone_or_name)
+    assert not os.path.exists(os.path.join(shards.shard_dir("out.xlsx"), shards.LOCK_NAME))
@@ -0,0 +1,41 @@
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("pandas")
+
+import site_crawl
+
+
+@pytest.fixture(autouse=True)
+def fast(monkeypatch):
+    monkeypatch.setattr(site_crawl, "HOST_DELAY", 0)
+
+
+def test_crawls_homepage_and_contact_page(fixture_server, tmp_path):
+    results = site_crawl.crawl([f"{fixture_server}/site/index.html"], str(tmp_path / "c.db"))
+    (res,) = results.values()
+    assert res["emails"] == ["sales@shreetyres.in"]
+    assert res["phones"] == ["+919829012345"]
+    assert res["gstin"] == ["08AABCS1234F1Z5"]
+    assert res["socials"] == ["https://www.facebook.com/shreetyres"]
+
+
+def test_reads_past_the_first_buffer(serve_dir, tmp_path):
+    site = tmp_path / "big"
+    site.mkdir()
+    padding = "<p>" + "x" * 200 + "</p>\n"
+    (site / "index.html").write_text(padding * 2000 + "<p>owner@bigpage.in</p>")
+    results = site_crawl.crawl([f"{serve_dir(str(site))}/index.html"], str(tmp_path / "c.db"))
+    assert list(results.values())[0]["emails"] == ["owner@bigpage.in"]
+
+
+def test_only_successful_crawls_are_cached(fixture_server, tmp_path):
+    db = str(tmp_path / "c.db")
+    good = f"{fixture_server}/site/index.html"
+    dead = "http://127.0.0.1:1/"
+    site_crawl.crawl([good, dead], db)
+
+    cache = site_crawl.Cache(db)
+    cached = cache.get_many([site_crawl.domain_of(good), site_crawl.domain_of(dead)])
+    cache.close()
+    assert list(cached) == [site_crawl.domain_of(good)]
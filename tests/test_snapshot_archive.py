@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("zstandard")
+
+import snapshot_archive
+from snapshot_archive import Archive
+
+
+def panel(i):
+    return (
+        f'<div class="m6QErb"><h1 class="DUwDvf">Shop {i}</h1>'
+        f'<button class="DkEaL">Tyre shop</button>'
+        f'<div class="Io6YTe">{i} Station Rd, Jaipur, Rajasthan 3020{i % 100:02d}</div>'
+        f'<button aria-label="Phone: 098290 {i:05d}"></button></div>' * 3
+    )
+
+
+def test_recompress_pages_through_blobs(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_archive, "RECOMPRESS_BATCH", 7)
+    monkeypatch.setattr(snapshot_archive, "DICT_SIZE", 4096)
+    archive = Archive(str(tmp_path / "snap.db"))
+    hashes = [archive.put(panel(i), place_id=f"p{i}") for i in range(60)]
+    assert archive.put(panel(0), place_id="p0") == hashes[0]   # content addressed
+
+    assert archive.train()
+    assert archive.recompress() == 60
+    assert archive.recompress() == 0
+    ids = {d for (d,) in archive.con.execute("SELECT DISTINCT dict_id FROM blobs")}
+    assert ids == {archive.dict_id}
+    assert [archive.get(h) for h in hashes] == [panel(i) for i in range(60)]
+    assert archive.latest("p5") == panel(5)
+    archive.close()
+
+
+def test_place_id_from_url():
+    url = "https://www.google.com/maps/place/Shop/data=!4m7!3m6!1s0x396db3f6f2b1a9c1:0x5b1e6c2f8e1a4d21!8m2"
+    assert snapshot_archive.place_id_from_url(url) == "0x396db3f6f2b1a9c1:0x5b1e6c2f8e1a4d21"
+    assert snapshot_archive.place_id_from_url(url + "!19sChIJwbGy8va2bTkRIU0ajy9sHls") == "ChIJwbGy8va2bTkRIU0ajy9sHls"
+    assert snapshot_archive.place_id_from_url(None) is None
@@ -0,0 +1,83 @@
+import os
+import multiprocessing
+
+import pytest
+
+from spill_buffer import SpillBuffer, replay_orphans, spill_dir_for
+
+
+@pytest.fixture(autouse=True)
+def scratch(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+class Sink:
+    def __init__(self):
+        self.rows = []
+        self.fail = False
+
+    def __call__(self, batch):
+        if self.fail:
+            raise OSError("file is open in Excel")
+        self.rows.extend(batch)
+
+
+def test_failed_flush_spills_and_replays_once():
+    sink = Sink()
+    buf = SpillBuffer(sink, 2, spill_dir_for("out.xlsx"))
+    sink.fail = True
+    buf.extend([{"n": 1}, {"n": 2}, {"n": 3}])
+    assert buf.spilled == 2 and len(buf) == 1 and sink.rows == []
+    assert os.path.exists(buf.spill_path)
+
+    sink.fail = False
+    buf.flush()
+    assert [r["n"] for r in sink.rows] == [1, 2, 3]
+    assert buf.written == 3 and buf.spilled == 0
+    assert not os.path.exists(buf.spill_path)
+
+
+def test_spill_dirs_are_per_output():
+    assert spill_dir_for("a/Trademark_Sellers_All.xlsx") != spill_dir_for("out.xlsx")
+
+
+def spill_and_wait(spill_dir, ready, release):
+    buf = SpillBuffer(Sink(), 1, spill_dir)
+    buf.flush_fn.fail = True
+    buf.append({"n": "live"})
+    ready.set()
+    release.wait(30)
+
+
+def test_orphans_of_live_process_are_left_alone():
+    d = spill_dir_for("out.xlsx")
+    ready, release = multiprocessing.Event(), multiprocessing.Event()
+    p = multiprocessing.Process(target=spill_and_wait, args=(d, ready, release))
+    p.start()
+    try:
+        assert ready.wait(30)
+        sink = Sink()
+        assert replay_orphans(sink, d) == 0
+        assert sink.rows == []
+    finally:
+        release.set()
+        p.join(30)
+
+    # the process is gone, so its rows are now orphans
+    assert replay_orphans(sink, d) == 1
+    assert sink.rows == [{"n": "live"}]
+    assert os.listdir(d) == []
+
+
+def test_replay_keeps_going_past_a_bad_file():
+    d = spill_dir_for("out.xlsx")
+    os.makedirs(d)
+    with open(os.path.join(d, "111-a.jsonl"), "w") as f:
+        f.write("{not json\n")
+    with open(os.path.join(d, "222-b.jsonl"), "w") as f:
+        f.write('{"n": 1}\n{"n": 2}\n')
+
+    sink = Sink()
+    assert replay_orphans(sink, d) == 2
+    assert sink.rows == [{"n": 1}, {"n": 2}]
+    assert sorted(os.listdir(d)) == ["111-a.jsonl", "111.lock"]
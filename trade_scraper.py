@@ -1,10 +1,7 @@
 import time
 import random
-import re
-import os
 from datetime import datetime
 
-import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -14,6 +11,19 @@ from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.common.exceptions import StaleElementReferenceException
 
+import consolidate
+import lead_store
+import shards
+import snapshot_archive
+import detail_tabs
+import site_crawl
+from blocklist import is_blocked
+from lead_scoring import score_lead
+from selector_registry import get_registry, phone_value, rating_value, reviews_value
+from pipeline import Pipeline, Stage
+from shards import ShardWriter
+from spill_buffer import SpillBuffer, replay_orphans, spill_dir_for
+
 # =====================================================
 # CONFIG
 # =====================================================
@@ -26,88 +36,15 @@ WAIT_MIN = 1.5
 WAIT_MAX = 3.0
 HEADLESS = False  # Set True for bulk runs
 
-# =====================================================
-# BRAND INTELLIGENCE
-# =====================================================
-BLACKLIST = {
-    "retailer", "shop", "store", "wholesaler", "trading",
-    "general trading", "import export", "broker", "resale"
-}
-
-WHITELIST = {
-    "authorized distributor", "official distributor",
-    "exclusive distributor", "sole distributor",
-    "channel partner", "distribution partner"
-}
-
-STRONG_SIGNALS = {
-    "iso", "iso 9001", "certified distributor",
-    "authorized partner", "registered company",
-    "since", "established"
-}
-
-AGGREGATOR_DOMAINS = ["justdial", "indiamart", "facebook", "tradeindia"]
-
-# =====================================================
-# SCORING ENGINE
-# =====================================================
-def evaluate_brand(name, category, website, rating, reviews):
-    text = f"{name} {category}".lower()
-    score = 0
-    signals = []
-
-    for word in BLACKLIST:
-        if word in text:
-            score -= 40
-            signals.append("Reseller keyword")
-
-    for word in WHITELIST:
-        if word in text:
-            score += 30
-            signals.append(word)
-
-    for word in STRONG_SIGNALS:
-        if word in text:
-            score += 20
-            signals.append(word)
-
-    if website:
-        if not any(x in website for x in AGGREGATOR_DOMAINS):
-            score += 25
-            signals.append("Official Website")
-        else:
-            score -= 10
-            signals.append("Aggregator Website")
-
-    if re.search(r"\b(pvt|private|ltd|limited)\b", text):
-        score += 20
-        signals.append("Legal Entity")
-
-    if rating:
-        if rating >= 4.0:
-            score += 20
-            signals.append("High Rating")
-        elif rating < 3.5:
-            score -= 10
-
-    if reviews and reviews >= 50:
-        score += 15
-        signals.append("High Reviews")
-
-    if score >= 50:
-        tier = "HIGH"
-    elif score >= 20:
-        tier = "MEDIUM"
-    else:
-        tier = "LOW"
-
-    status = (
-        "APPROVED" if score >= 20 else
-        "REVIEW_REQUIRED" if score >= 0 else
-        "REJECTED"
-    )
-
-    return score, tier, status, list(set(signals))
+ENRICH_WORKERS = 2   # scoring threads, off the browser thread
+QUEUE_SIZE = 200     # per pipeline stage, bounds memory when the writer lags
+LEAD_STORE = True    # also append to the partitioned parquet store (lead_store.py)
+LEAD_DB = True       # and record every lead in leads.db (lead_db.py) for delta_export
+SNAPSHOT_ARCHIVE = True  # keep each detail panel's HTML for offline re-parsing
+DETAIL_MODE = "click"    # "click" = click each card, "tabs" = open place URLs in parallel tabs
+DETAIL_TABS = 4
+CRAWL_WEBSITES = True    # emails / extra phones / GSTIN / socials from each lead's site
+CRAWL_BATCH = 50         # leads per site crawl; its own stage, so saving never waits on it
 
 # =====================================================
 # DRIVER SETUP
@@ -128,25 +65,69 @@ def setup_driver():
 # =====================================================
 # UTILITIES
 # =====================================================
-def save_progress(data):
-    df_new = pd.DataFrame(data)
+# each flush appends only its delta to a shard; the xlsx is rebuilt once,
+# at the end of the run, instead of being re-read and rewritten per flush
+shard = None
 
-    if os.path.exists(OUTPUT_FILE):
-        df_old = pd.read_excel(OUTPUT_FILE)
-        df = pd.concat([df_old, df_new], ignore_index=True)
-        df.drop_duplicates(subset=["Phone", "Website"], inplace=True)
-    else:
-        df = df_new
+def save_progress(data):
+    global shard
+    if not data:
+        return
 
-    df.to_excel(OUTPUT_FILE, index=False)
-    print(f"💾 Saved {len(df)} total records")
+    if shard is None:
+        shard = ShardWriter(OUTPUT_FILE)
+    shard.write(data)
+    print(f"💾 +{len(data)} records to shard")
 
 # =====================================================
 # GOOGLE MAPS SCRAPER
 # =====================================================
+def read_place(driver, query, selectors):
+    # fields of the place page / panel currently shown in this tab
+    name = selectors.find(driver, "name")
+    if not name:
+        return None
+
+    category = selectors.find(driver, "category")
+    address = selectors.find(driver, "address")
+    phone = phone_value(selectors.find(driver, "phone"))
+    if phone and is_blocked(phone):
+        return None
+
+    website = selectors.find(driver, "website")
+    rating = rating_value(selectors.find(driver, "rating"))
+    reviews = reviews_value(selectors.find(driver, "reviews"))
+
+    panel_html = ""
+    if SNAPSHOT_ARCHIVE:
+        try:
+            panel_html = driver.find_element(
+                By.XPATH, '//div[@role="main"]'
+            ).get_attribute("outerHTML")
+        except:
+            pass
+
+    return {
+        "Place_Id": snapshot_archive.place_id_from_url(driver.current_url),
+        "Brand_Name": name,
+        "Phone": phone,
+        "Website": website,
+        "Category": category,
+        "Address": address,
+        "Rating": rating,
+        "Reviews": reviews,
+        "Source": "Google Maps",
+        "Scraped_At": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "_query": query,
+        "_panel": panel_html
+    }
+
+
 def scrape_google_maps(driver, query):
-    collected = []
+    # browser work only: yields raw detail records, scoring and saving
+    # happen in the pipeline stages behind it
     seen_names = set()
+    selectors = get_registry()
 
     driver.get(f"https://www.google.com/maps/search/{query.replace(' ', '+')}")
     WebDriverWait(driver, 20).until(
@@ -182,87 +163,14 @@ def scrape_google_maps(driver, query):
                 item.click()
 
                 WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "DUwDvf"))
+                    lambda d: selectors.present(d, "name")
                 )
 
-                name = driver.find_element(By.CLASS_NAME, "DUwDvf").text
-                if name in seen_names:
+                lead = read_place(driver, query, selectors)
+                if not lead or lead["Brand_Name"] in seen_names:
                     continue
-                seen_names.add(name)
-
-                def safe(xpath):
-                    try:
-                        return driver.find_element(By.XPATH, xpath).text
-                    except:
-                        return ""
-
-                category = safe("//button[contains(@aria-label,'Category')]")
-                address = safe("//button[contains(@aria-label,'Address')]")
-                phone_raw = safe("//button[contains(@aria-label,'Phone')]")
-                phone = re.sub(r"[^\d+\-\s]", "", phone_raw).strip()
-
-                website = ""
-                try:
-                    website = driver.find_element(
-                        By.XPATH, "//a[contains(@aria-label,'Website')]"
-                    ).get_attribute("href")
-                except:
-                    pass
-
-                rating = None
-                reviews = None
-                try:
-                    rating = float(
-                        driver.find_element(
-                            By.XPATH,
-                            "//span[@aria-label[contains(.,'stars')]]"
-                        ).get_attribute("aria-label").split()[0]
-                    )
-                except:
-                    pass
-
-                try:
-                    reviews = int(
-                        re.sub(r"\D", "",
-                            driver.find_element(
-                                By.XPATH,
-                                "//button[contains(@aria-label,'reviews')]"
-                            ).text
-                        )
-                    )
-                except:
-                    pass
-
-                city, state = "", ""
-                if address:
-                    parts = address.split(",")
-                    if len(parts) >= 2:
-                        city, state = parts[-2].strip(), parts[-1].strip()
-
-                score, tier, status, signals = evaluate_brand(
-                    name, category, website, rating, reviews
-                )
-
-                collected.append({
-                    "Brand_Name": name,
-                    "Phone": phone,
-                    "Website": website,
-                    "Category": category,
-                    "Rating": rating,
-                    "Reviews": reviews,
-                    "City": city,
-                    "State": state,
-                    "Confidence_Score": score,
-                    "Confidence_Tier": tier,
-                    "Status": status,
-                    "Ownership_Signals": ", ".join(signals),
-                    "Source": "Google Maps",
-                    "Scraped_At": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                })
-
-                if len(collected) % SAVE_EVERY == 0:
-                    save_progress(collected)
-                    collected.clear()
+                seen_names.add(lead["Brand_Name"])
+                yield lead
 
                 time.sleep(random.uniform(WAIT_MIN, WAIT_MAX))
 
@@ -278,25 +186,123 @@ def scrape_google_maps(driver, query):
         """)
         time.sleep(2)
 
-    return collected
+
+def scrape_google_maps_tabs(driver, query):
+    # same records as scrape_google_maps, but the card URLs are collected
+    # first and the detail pages load DETAIL_TABS at a time
+    seen_names = set()
+    selectors = get_registry()
+
+    driver.get(f"https://www.google.com/maps/search/{query.replace(' ', '+')}")
+    WebDriverWait(driver, 20).until(
+        EC.presence_of_element_located((By.XPATH, '//div[@role="feed"]'))
+    )
+
+    urls = detail_tabs.collect_place_urls(driver, selectors, MAX_RESULTS_PER_QUERY)
+    print(f"🔗 {len(urls)} places for {query}, loading {DETAIL_TABS} at a time")
+
+    for lead in detail_tabs.fetch_details(
+        driver, urls,
+        parse_fn=lambda d, url: read_place(d, query, selectors),
+        ready_fn=lambda d: selectors.present(d, "name"),
+        tabs=DETAIL_TABS,
+    ):
+        if not lead or lead["Brand_Name"] in seen_names:
+            continue
+        seen_names.add(lead["Brand_Name"])
+        yield lead
+
+
+# =====================================================
+# PIPELINE STAGES
+# =====================================================
+archive = None
+
+
+def enrich_lead(lead):
+    # compressing the snapshot here keeps it off the browser thread
+    query, panel = lead.pop("_query"), lead.pop("_panel")
+    if archive and panel:
+        archive.put(panel, "panel", lead["Place_Id"], query)
+
+    return score_lead(lead)
+
+
+crawl_batch = []
+
+
+def flush_crawl():
+    batch = crawl_batch[:]
+    crawl_batch.clear()
+    if not batch:
+        return None
+    try:
+        site_crawl.enrich(batch)
+    except Exception as e:
+        # the leads matter more than their websites: save them without
+        print(f"⚠️ Site crawl failed for {len(batch)} leads: {e}")
+    return batch
+
+
+def crawl_sites(lead):
+    # one worker: batches leads so the async crawler has many sites at once
+    crawl_batch.append(lead)
+    if len(crawl_batch) < CRAWL_BATCH:
+        return None
+    return flush_crawl()
+
+
+def write_batch(batch):
+    # a failure in a later sink replays the whole batch into all three;
+    # each of them takes repeats (see SpillBuffer)
+    save_progress(batch)
+    if LEAD_STORE:
+        lead_store.write_leads(batch)
+    if LEAD_DB:
+        consolidate.save_rows(batch, "Google Maps")
+
+
+# only the unsaved delta is held; a failed save spills to disk, not RAM
+pending = SpillBuffer(write_batch, SAVE_EVERY, spill_dir_for(OUTPUT_FILE))
 
 
 # =====================================================
 # MAIN
 # =====================================================
 def main():
+    global archive
+    if SNAPSHOT_ARCHIVE:
+        archive = snapshot_archive.Archive()
+
+    replay_orphans(write_batch, spill_dir_for(OUTPUT_FILE))
     driver = setup_driver()
-    buffer = []
+    stages = [Stage("enrich", enrich_lead, workers=ENRICH_WORKERS, maxsize=QUEUE_SIZE)]
+    if CRAWL_WEBSITES:
+        stages.append(Stage("crawl", crawl_sites, workers=1, maxsize=QUEUE_SIZE, on_close=flush_crawl))
+    stages.append(Stage("persist", pending.append, workers=1, maxsize=QUEUE_SIZE, on_close=pending.flush))
+    pipe = Pipeline(stages).start()
+
+    compactor = shards.start_background(OUTPUT_FILE, shards.key_phone_and_website)
 
+    scrape = scrape_google_maps_tabs if DETAIL_MODE == "tabs" else scrape_google_maps
     try:
         for query in SEARCH_QUERIES:
             print("🔍 Searching:", query)
-            buffer.extend(scrape_google_maps(driver, query))
+            for lead in scrape(driver, query):
+                pipe.put(lead)
+            get_registry().save()
     finally:
         driver.quit()
-
-    if buffer:
-        save_progress(buffer)
+        pipe.close()
+        compactor.stop()
+        shards.compact(OUTPUT_FILE, shards.key_phone_and_website)
+        shards.export(OUTPUT_FILE)
+        if LEAD_STORE:
+            before, after = lead_store.compact()
+            if before:
+                print(f"🗜️ Lead store: {before} flush files → {after}")
+
+    print("🎯 Selector hit rates:\n" + get_registry().report())
 
     print("✅ Scraping complete")
 
@@ -1,11 +1,12 @@
+import os
 import time
 import random
 import re
-import os
+import socket
+import threading
 from datetime import datetime
 from multiprocessing import Process
 
-import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -19,6 +20,16 @@ from selenium.common.exceptions import (
 )
 from webdriver_manager.chrome import ChromeDriverManager
 
+import consolidate
+import coordinator
+import shards
+from blocklist import is_blocked
+from browser_recycler import Recycler, profile_dir
+from selector_registry import get_registry
+from seen_index import SeenIndex, KEYS_FIELD, card_keys, keys_for, without_keys
+from shards import ShardWriter
+from spill_buffer import SpillBuffer, replay_orphans, spill_dir_for
+
 # =====================================================
 # CONFIG
 # =====================================================
@@ -33,6 +44,11 @@ QUERY_COOLDOWN = (5, 10)
 CRASH_COOLDOWN = (15, 25)
 
 FINAL_OUTPUT = "Trademark_Sellers_All.xlsx"
+LEAD_DB = True       # also record every lead in leads.db (lead_db.py) for delta_export
+
+# set to the coordinator address (python coordinator.py serve) to share the
+# query list between machines instead of slicing it per box
+COORDINATOR_URL = None   # e.g. "http://192.168.1.10:8765"
 
 # =====================================================
 # RAJASTHAN DISTRICTS
@@ -65,6 +81,7 @@ def setup_driver(worker_id):
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("--disable-gpu")
     options.add_argument("--remote-debugging-port=0")
+    options.add_argument(f"--user-data-dir={profile_dir(worker_id)}")
 
     if HEADLESS:
         options.add_argument("--headless=new")
@@ -104,6 +121,8 @@ def scrape_query(driver, query, results):
 
     seen = set()
     stall = 0
+    index = get_seen_index()
+    selectors = get_registry()
 
     while True:
         if reached_end_of_list(driver):
@@ -120,12 +139,14 @@ def scrape_query(driver, query, results):
 
         for card in cards:
             try:
+                # known from another worker or an earlier run: no click at all
+                if index.seen_any(card_keys(card)):
+                    continue
+
                 driver.execute_script("arguments[0].click();", card)
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "DUwDvf"))
-                )
+                WebDriverWait(driver, 10).until(lambda d: selectors.present(d, "name"))
 
-                name = driver.find_element(By.CLASS_NAME, "DUwDvf").text.strip()
+                name = selectors.find(driver, "name")
                 if not name or name in seen:
                     continue
                 seen.add(name)
@@ -143,20 +164,24 @@ def scrape_query(driver, query, results):
                 except:
                     pass
 
-                if len(phone) < 10:
+                if len(phone) < 10 or is_blocked(phone):
+                    continue
+
+                keys = keys_for(url=driver.current_url, phone=phone)
+                if index.seen_any(keys):
                     continue
+                # the keys reach the index only once the row is saved/uploaded
+                index.hold(keys)
 
                 results.append({
                     "Brand_Name": name,
                     "Phone": phone,
                     "Query": query,
                     "Source": "Google Maps",
-                    "Scraped_At": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    "Scraped_At": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    KEYS_FIELD: keys
                 })
 
-                if len(results) % SAVE_EVERY == 0:
-                    save_partial(results)
-
                 time.sleep(random.uniform(WAIT_MIN, WAIT_MAX))
 
             except StaleElementReferenceException:
@@ -171,23 +196,39 @@ def scrape_query(driver, query, results):
         time.sleep(1.5)
 
 # =====================================================
-# SAVE PARTIAL (DEDUP SAFE)
+# SHARED SEEN-INDEX (ALL WORKERS, ALL RUNS)
 # =====================================================
-def save_partial(data):
-    df_new = pd.DataFrame(data)
+# one per process: replay_orphans in the parent opens one before the
+# workers fork, and a forked sqlite connection must not be reused
+seen_index = {}
 
-    if os.path.exists(FINAL_OUTPUT):
-        df_old = pd.read_excel(FINAL_OUTPUT)
-        df = pd.concat([df_old, df_new], ignore_index=True)
-    else:
-        df = df_new
+def get_seen_index():
+    pid = os.getpid()
+    if pid not in seen_index:
+        seen_index[pid] = SeenIndex()
+    return seen_index[pid]
 
-    df["dedupe"] = df["Phone"] + "|" + df["Brand_Name"]
-    df.drop_duplicates("dedupe", inplace=True)
-    df.drop(columns=["dedupe"], inplace=True)
+# =====================================================
+# SAVE PARTIAL (PER-WORKER SHARD)
+# =====================================================
+# each process appends to its own shard; the main process compacts them
+# into FINAL_OUTPUT, so workers never read-modify-write the same xlsx
+shard = None
+
+def save_partial(data):
+    global shard
+    if not data:
+        return
 
-    df.to_excel(FINAL_OUTPUT, index=False)
-    print(f"💾 Saved {len(df)} total records")
+    if shard is None:
+        shard = ShardWriter(FINAL_OUTPUT)
+    rows = [without_keys(r) for r in data]
+    shard.write(rows)
+    if LEAD_DB:
+        consolidate.save_rows(rows, "Google Maps")
+    print(f"💾 +{len(data)} records to shard")
+    # only now, with the rows on disk, do their keys count as seen
+    get_seen_index().add_saved(data)
 
 # =====================================================
 # WORKER PROCESS
@@ -195,12 +236,16 @@ def save_partial(data):
 def worker(worker_id, queries):
     time.sleep(worker_id * 5)
     driver = setup_driver(worker_id)
-    results = []
+    # flushes every SAVE_EVERY rows, so memory stays flat however long the run
+    results = SpillBuffer(save_partial, SAVE_EVERY, spill_dir_for(FINAL_OUTPUT))
+    recycler = Recycler(driver)
 
     for q in queries:
         try:
             scrape_query(driver, q, results)
             time.sleep(random.uniform(*QUERY_COOLDOWN))
+            if recycler.should_recycle(driver):
+                driver = recycler.recycle(driver, setup_driver, worker_id, restore_url=False)
         except WebDriverException:
             print(f"⚠️ Chrome crash detected. Restarting...")
             try:
@@ -209,15 +254,82 @@ def worker(worker_id, queries):
                 pass
             time.sleep(random.uniform(*CRASH_COOLDOWN))
             driver = setup_driver(worker_id)
+            recycler.reset(driver)
 
     driver.quit()
-    save_partial(results)
+    recycler.close()
+    results.flush()
+    print(get_seen_index().summary())
+
+# =====================================================
+# LEASED WORKER (MULTI-HOST)
+# =====================================================
+def leased_worker(worker_id):
+    time.sleep(worker_id * 5)
+    driver = setup_driver(worker_id)
+    name = f"{socket.gethostname()}-{worker_id}"
+    recycler = Recycler(driver)
+
+    for lease_id, q in coordinator.iter_leases(COORDINATOR_URL, name):
+        # ships leads to the coordinator in batches while the query runs
+        results = coordinator.LeaseUploader(COORDINATOR_URL, lease_id, on_sent=get_seen_index().add_saved)
+        stop = threading.Event()
+        threading.Thread(
+            target=coordinator.heartbeat,
+            args=(COORDINATOR_URL, lease_id, stop),
+            daemon=True
+        ).start()
+
+        try:
+            scrape_query(driver, q, results)
+            results.finish()
+            print(f"📤 [{name}] {q}: {len(results)} leads")
+            time.sleep(random.uniform(*QUERY_COOLDOWN))
+            if recycler.should_recycle(driver):
+                driver = recycler.recycle(driver, setup_driver, worker_id, restore_url=False)
+        except coordinator.LeaseLost:
+            # expired and re-leased; the other worker's copy of the query wins
+            print(f"⚠️ [{name}] lease on {q} was lost, moving on")
+        except coordinator.CoordinatorError as e:
+            # unreachable coordinator: the lease expires and the query is handed out again
+            print(f"⚠️ [{name}] {e}")
+            time.sleep(random.uniform(*CRASH_COOLDOWN))
+        except WebDriverException:
+            # lease is left to expire and gets handed to another worker
+            print("⚠️ Chrome crash detected. Restarting...")
+            try:
+                driver.quit()
+            except:
+                pass
+            time.sleep(random.uniform(*CRASH_COOLDOWN))
+            driver = setup_driver(worker_id)
+            recycler.reset(driver)
+        finally:
+            stop.set()
+
+    driver.quit()
+    recycler.close()
 
 # =====================================================
 # MAIN
 # =====================================================
 def main():
     all_queries = [f"{k} {d}" for d in RAJASTHAN_DISTRICTS for k in KEYWORDS]
+    SeenIndex().close()   # create the bloom file once, before workers map it
+
+    if COORDINATOR_URL:
+        added = coordinator.call(COORDINATOR_URL, "/queries", {"queries": all_queries})["added"]
+        print(f"🛰️ Coordinator mode | {added} new queries registered")
+        procs = [Process(target=leased_worker, args=(i,)) for i in range(1, NUM_BROWSERS + 1)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        print(f"🏁 SCRAPING COMPLETE | {coordinator.call(COORDINATOR_URL, '/progress')}")
+        return
+
+    replay_orphans(save_partial, spill_dir_for(FINAL_OUTPUT))
+
     chunk = len(all_queries) // NUM_BROWSERS + 1
     chunks = [all_queries[i:i + chunk] for i in range(0, len(all_queries), chunk)]
 
@@ -227,9 +339,15 @@ def main():
         p.start()
         procs.append(p)
 
+    compactor = shards.start_background(FINAL_OUTPUT, shards.key_phone_and_name)
+
     for p in procs:
         p.join()
 
+    compactor.stop()
+    shards.compact(FINAL_OUTPUT, shards.key_phone_and_name)
+    shards.export(FINAL_OUTPUT)
+
     print("🏁 SCRAPING COMPLETE")
 
 # =====================================================